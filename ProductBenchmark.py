@@ -0,0 +1,108 @@
+"""
+ProductDatabase CRUD 벤치마크
+
+테이블 크기별(기본 10k/100k/1M/10M행)로 샘플 DB를 만들고
+insert, insert_many, select_by_id, select_by_name, select_by_price_range,
+update, delete, get_total_count 의 지연시간(p50/p95/p99)과 처리량을 측정합니다.
+결과는 JSON으로 저장해 이전 실행과 비교(--compare)할 수 있습니다.
+
+사용 예:
+    python ProductBenchmark.py --sizes 10000 100000 --json bench.json
+    python ProductBenchmark.py --sizes 10000 100000 --compare bench.json
+"""
+
+from typing import Dict, List, Optional
+from itertools import chain
+import argparse
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import tempfile
+
+from ProductDatabase import ProductDatabase, generate_sample_chunks
+from benchutil import add_report_args, finish_report, report_meta, summarize, time_calls
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+# 결과 표/비교에서 항목을 구분하는 열
+LABELS = [("size", ">10,"), ("op", "<22")]
+
+
+def bench_size(db_path: str, size: int, ops: int, scan_ops: int, batch: int, seed: int) -> List[Dict]:
+    """size행짜리 DB를 만들고 각 연산을 측정"""
+    rng = random.Random(seed)
+    # ProductDatabase의 진행 메시지는 측정 출력과 섞이지 않게 숨긴다
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = ProductDatabase(db_path)
+        db.delete_all()
+        db.bulk_load(chain.from_iterable(generate_sample_chunks(size, seed=seed)), verbose=False)
+
+    results = []
+    try:
+        # 중복 없이 뽑아야 delete 단계에서 이미 지운 행을 다시 지우는 호출이 섞이지 않는다
+        ids = rng.sample(range(1, size + 1), min(ops, size))
+        names = [rng.choice(["삼성", "LG 모니터", "애플", "노트북", "ASUS"]) for _ in range(scan_ops)]
+        ranges = []
+        for _ in range(scan_ops):
+            low = rng.randint(10_000, 2_900_000)
+            ranges.append((low, low + 100_000))
+        sample_rows = next(generate_sample_chunks(batch, seed=seed + 1))
+
+        results.append(summarize("insert", time_calls(
+            lambda i: db.insert(f"벤치 제품 {i}", 10_000 + i), ops), size=size))
+        results.append(summarize("insert_many", time_calls(
+            lambda i: db.insert_many(sample_rows), max(1, scan_ops)), rows_per_call=batch, size=size))
+        results.append(summarize("select_by_id", time_calls(
+            lambda i: db.select_by_id(ids[i]), len(ids)), size=size))
+        results.append(summarize("select_by_name", time_calls(
+            lambda i: db.select_by_name(names[i]), scan_ops), size=size))
+        results.append(summarize("select_by_price_range", time_calls(
+            lambda i: db.select_by_price_range(*ranges[i]), scan_ops), size=size))
+        results.append(summarize("update", time_calls(
+            lambda i: db.update(ids[i], product_price=20_000 + i), len(ids)), size=size))
+        results.append(summarize("delete", time_calls(
+            lambda i: db.delete(ids[i]), len(ids)), size=size))
+        results.append(summarize("get_total_count", time_calls(
+            lambda i: db.get_total_count(), scan_ops), size=size))
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.close()
+    return results
+
+
+def run(sizes: List[int], ops: int, scan_ops: int, batch: int, seed: int,
+        workdir: Optional[str] = None) -> Dict:
+    """모든 크기에 대해 벤치마크를 실행하고 JSON으로 저장할 보고서 반환"""
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            print(f"[{size:,}행] 측정 중...")
+            db_path = os.path.join(tmp, f"bench_{size}.db")
+            results.extend(bench_size(db_path, size, ops, scan_ops, batch, seed))
+    return {
+        "meta": report_meta(sqlite=sqlite3.sqlite_version, ops=ops, scan_ops=scan_ops, batch=batch, seed=seed),
+        "results": results,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="ProductDatabase CRUD 벤치마크")
+    p.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                   help="테이블 크기 목록 (기본: 10000 100000 1000000 10000000)")
+    p.add_argument("--ops", type=int, default=500, help="점 조회/수정/삭제 호출 횟수 (기본 500)")
+    p.add_argument("--scan-ops", type=int, default=20,
+                   help="이름/가격범위 조회 등 무거운 연산 호출 횟수 (기본 20)")
+    p.add_argument("--batch", type=int, default=1000, help="insert_many 한 번의 행 수 (기본 1000)")
+    p.add_argument("--seed", type=int, default=42, help="난수 시드 (기본 42)")
+    p.add_argument("--workdir", help="임시 DB를 만들 디렉터리 (기본: 시스템 임시 디렉터리)")
+    add_report_args(p)
+    args = p.parse_args()
+
+    report = run(args.sizes, args.ops, args.scan_ops, args.batch, args.seed, args.workdir)
+    finish_report(args, report, LABELS)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,50 @@
 import sqlite3
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from itertools import chain, islice
+import argparse
 import random
 import string
+import time
+
+from ProductRepository import (PRODUCTS, LRUCache, ProductConnectionPool, ProductRepository,
+                               build_match_query)
+
+# Products 행 단위 가격 요약 테이블 동기화 트리거
+# (전문검색 인덱스 트리거는 ProductRepository의 PRODUCTS.fts_trigger_sql)
+_SUMMARY_TRIGGERS = {
+    "ProductSummary_ai": """
+    CREATE TRIGGER IF NOT EXISTS ProductSummary_ai AFTER INSERT ON Products BEGIN
+        UPDATE ProductSummary
+        SET productCount = productCount + 1, priceSum = priceSum + new.productPrice
+        WHERE id = 1;
+    END
+    """,
+    "ProductSummary_ad": """
+    CREATE TRIGGER IF NOT EXISTS ProductSummary_ad AFTER DELETE ON Products BEGIN
+        UPDATE ProductSummary
+        SET productCount = productCount - 1, priceSum = priceSum - old.productPrice
+        WHERE id = 1;
+    END
+    """,
+    "ProductSummary_au": """
+    CREATE TRIGGER IF NOT EXISTS ProductSummary_au AFTER UPDATE OF productPrice ON Products BEGIN
+        UPDATE ProductSummary
+        SET priceSum = priceSum - old.productPrice + new.productPrice
+        WHERE id = 1;
+    END
+    """,
+}
+
 
 class ProductDatabase:
-    """SQLite를 사용한 전자제품 데이터베이스 관리 클래스"""
+    """
+    SQLite를 사용한 전자제품 데이터베이스 관리 클래스
+    
+    읽기와 쓰기는 모두 공용 데이터 접근 계층(ProductRepository)을 거칩니다.
+    읽기는 연결 풀의 읽기 연결에서, 쓰기는 쓰기 스레드에서 트랜잭션 단위로 커밋되고,
+    ID 조회와 전체 개수는 ProductRepository의 캐시를 함께 씁니다.
+    실패하면 예외 대신 ✗ 메시지를 출력하고 빈 결과(또는 False/0)를 돌려줍니다.
+    """
     
     def __init__(self, db_name: str = "MyProduct.db"):
         """
@@ -14,36 +54,68 @@ class ProductDatabase:
             db_name: 데이터베이스 파일명 (기본값: MyProduct.db)
         """
         self.db_name = db_name
-        self.conn = None
-        self.cursor = None
+        self.repo = None
+        self.fts_enabled = False
+        self.summary_enabled = False
         self.connect()
         self.create_table()
+        self.create_search_index()
+        self._detect_summary_table()
     
     def connect(self):
-        """데이터베이스 연결"""
+        """데이터베이스 연결 (연결 풀/쓰기 스레드 시작)"""
         try:
-            self.conn = sqlite3.connect(self.db_name)
-            self.cursor = self.conn.cursor()
+            # 준비된 문장 캐시/PRAGMA/WAL 설정은 ProductRepository 공용 설정을 따름
+            self.repo = ProductRepository(self.db_name, PRODUCTS)
             print(f"✓ 데이터베이스 '{self.db_name}' 연결 성공")
         except sqlite3.Error as e:
             print(f"✗ 데이터베이스 연결 실패: {e}")
+            raise
+    
+    def _write(self, work):
+        """쓰기 작업을 쓰기 스레드에서 실행하고 커밋될 때까지 기다림 (실패하면 그 작업만 롤백)"""
+        return self.repo.submit(work).result()
     
     def create_table(self):
         """Products 테이블 생성"""
         try:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS Products (
-                productID INTEGER PRIMARY KEY AUTOINCREMENT,
-                productName TEXT NOT NULL,
-                productPrice INTEGER NOT NULL
-            )
-            """
-            self.cursor.execute(create_table_sql)
-            self.conn.commit()
+            # 테이블과 인덱스(가격 범위/가격순 페이지 조회용) 정의는 ProductRepository.PRODUCTS
+            self.repo.ensure_schema()
             print("✓ Products 테이블 생성/확인 완료")
         except sqlite3.Error as e:
             print(f"✗ 테이블 생성 실패: {e}")
     
+    def create_search_index(self):
+        """
+        제품명 전문검색(FTS5) 인덱스 생성
+        
+        Products를 외부 콘텐츠로 쓰는 ProductsFTS 가상 테이블과
+        INSERT/UPDATE/DELETE 동기화 트리거를 만듭니다.
+        인덱스를 처음 만들 때는 기존 데이터로 한 번 재구축합니다.
+        FTS5를 지원하지 않는 SQLite라면 LIKE 검색으로 대체합니다.
+        """
+        try:
+            # 가상 테이블/트리거 SQL은 ProductRepository의 PRODUCTS 스키마가 만든다
+            self._write(PRODUCTS.create_fts)
+            self.fts_enabled = True
+        except sqlite3.Error as e:
+            self.fts_enabled = False
+            print(f"✗ 전문검색 인덱스 생성 실패 (LIKE 검색 사용): {e}")
+    
+    def rebuild_search_index(self) -> bool:
+        """
+        전문검색 인덱스를 Products 테이블 기준으로 다시 만듭니다.
+        
+        Returns:
+            성공 여부
+        """
+        try:
+            self._write(lambda conn: conn.execute("INSERT INTO ProductsFTS(ProductsFTS) VALUES ('rebuild')"))
+            return True
+        except sqlite3.Error as e:
+            print(f"✗ 전문검색 인덱스 재구축 실패: {e}")
+            return False
+    
     def insert(self, product_name: str, product_price: int) -> bool:
         """
         단일 제품 데이터 삽입
@@ -51,17 +123,12 @@ class ProductDatabase:
         Args:
             product_name: 제품명
             product_price: 제품가격
-            
+        
         Returns:
             성공 여부
         """
         try:
-            insert_sql = """
-            INSERT INTO Products (productName, productPrice)
-            VALUES (?, ?)
-            """
-            self.cursor.execute(insert_sql, (product_name, product_price))
-            self.conn.commit()
+            self.repo.insert(product_name, product_price)
             return True
         except sqlite3.Error as e:
             print(f"✗ 데이터 삽입 실패: {e}")
@@ -73,22 +140,73 @@ class ProductDatabase:
         
         Args:
             products: [(제품명, 가격), ...] 형태의 리스트
-            
+        
         Returns:
             삽입된 행의 개수
         """
         try:
-            insert_sql = """
-            INSERT INTO Products (productName, productPrice)
-            VALUES (?, ?)
-            """
-            self.cursor.executemany(insert_sql, products)
-            self.conn.commit()
-            return self.cursor.rowcount
+            return self.repo.insert_many(products)
         except sqlite3.Error as e:
             print(f"✗ 대량 데이터 삽입 실패: {e}")
             return 0
     
+    def bulk_load(self, products: Iterable[Tuple[str, int]], chunk_size: int = 50000,
+                  cache_size_kb: int = 65536, verbose: bool = True) -> int:
+        """
+        대량 적재 전용 삽입 (야간 재적재용)
+        
+        입력을 chunk_size 단위로 나눠 청크마다 쓰기 작업 하나(한 트랜잭션)로 커밋하고,
+        적재하는 동안 쓰기 연결의 페이지 캐시를 cache_size_kb로 늘렸다가 끝나면 되돌립니다.
+        쓰기 연결은 WAL 모드(synchronous=NORMAL)이므로 적재 중에도 읽기가 막히지 않습니다.
+        
+        Args:
+            products: (제품명, 가격) 튜플을 내놓는 임의의 iterable (제너레이터 가능)
+            chunk_size: 트랜잭션 하나에 넣을 행 수 (기본값: 50000)
+            cache_size_kb: 적재 중 사용할 페이지 캐시 크기(KB) (기본값: 65536)
+            verbose: 청크마다 진행 상황과 rows/sec 출력 여부
+        
+        Returns:
+            삽입된 행의 개수
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size는 1 이상이어야 합니다.")
+
+        insert_sql = PRODUCTS.insert_sql
+        
+        def set_cache_size(kb):
+            def work(conn):
+                old = conn.execute("PRAGMA cache_size").fetchone()[0]
+                conn.execute(f"PRAGMA cache_size = {int(kb)}")
+                return old
+            return self._write(work)
+
+        total = 0
+        start = time.perf_counter()
+        old_cache = set_cache_size(-int(cache_size_kb))
+        try:
+            rows = iter(products)
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self._write(lambda conn: conn.executemany(insert_sql, chunk))
+                total += len(chunk)
+                if verbose:
+                    elapsed = time.perf_counter() - start
+                    rate = total / elapsed if elapsed > 0 else 0.0
+                    print(f"  ... {total:,}행 적재 ({rate:,.0f} rows/sec)")
+        except sqlite3.Error as e:
+            print(f"✗ 대량 적재 실패 ({total:,}행까지 커밋됨): {e}")
+        finally:
+            self.repo.clear_cache()
+            set_cache_size(old_cache)
+
+        elapsed = time.perf_counter() - start
+        if verbose:
+            rate = total / elapsed if elapsed > 0 else 0.0
+            print(f"✓ 대량 적재 완료: {total:,}행, {elapsed:.2f}초 ({rate:,.0f} rows/sec)")
+        return total
+    
     def select_all(self) -> List[Tuple]:
         """
         모든 제품 데이터 조회
@@ -97,29 +215,23 @@ class ProductDatabase:
             모든 제품 데이터의 리스트
         """
         try:
-            select_sql = "SELECT * FROM Products"
-            self.cursor.execute(select_sql)
-            results = self.cursor.fetchall()
-            return results
+            return self.repo.query(PRODUCTS.select_sql)
         except sqlite3.Error as e:
             print(f"✗ 데이터 조회 실패: {e}")
             return []
     
     def select_by_id(self, product_id: int) -> Tuple:
         """
-        ID로 제품 조회
+        ID로 제품 조회 (ProductRepository 캐시 우선)
         
         Args:
             product_id: 제품 ID
-            
+        
         Returns:
             조회된 제품 데이터
         """
         try:
-            select_sql = "SELECT * FROM Products WHERE productID = ?"
-            self.cursor.execute(select_sql, (product_id,))
-            result = self.cursor.fetchone()
-            return result
+            return self.repo.get(product_id)
         except sqlite3.Error as e:
             print(f"✗ ID별 데이터 조회 실패: {e}")
             return None
@@ -130,15 +242,73 @@ class ProductDatabase:
         
         Args:
             product_name: 제품명
-            
+        
         Returns:
             조회된 제품 데이터 리스트
         """
         try:
             select_sql = "SELECT * FROM Products WHERE productName LIKE ?"
-            self.cursor.execute(select_sql, (f"%{product_name}%",))
-            results = self.cursor.fetchall()
-            return results
+            return self.repo.query(select_sql, (f"%{product_name}%",))
+        except sqlite3.Error as e:
+            print(f"✗ 제품명별 데이터 조회 실패: {e}")
+            return []
+    
+    def search(self, query: str, limit: int = 100, prefix: bool = True) -> List[Tuple]:
+        """
+        전문검색 인덱스로 제품 검색 (관련도 순)
+        
+        공백으로 나눈 각 단어를 모두 포함하는 제품을 찾습니다.
+        예: "삼성 노트북" -> '삼성'과 '노트북'을 모두 포함하는 제품
+        
+        Args:
+            query: 검색어 (여러 단어 가능)
+            limit: 최대 결과 개수 (기본값: 100)
+            prefix: True면 각 단어를 접두어로 검색 ("노트" -> "노트북")
+        
+        Returns:
+            (productID, productName, productPrice) 리스트, bm25 관련도 순
+        """
+        match = build_match_query(query, prefix)
+        if not match:
+            return []
+        if not self.fts_enabled:
+            return self._search_like(query, limit)
+        try:
+            return self.repo.query(PRODUCTS.fts_search_sql, (match, limit))
+        except sqlite3.Error as e:
+            print(f"✗ 전문검색 실패: {e}")
+            return []
+    
+    def search_count(self, query: str, prefix: bool = True) -> int:
+        """
+        전문검색 결과 개수 조회
+        
+        Args:
+            query: 검색어 (여러 단어 가능)
+            prefix: True면 각 단어를 접두어로 검색
+        
+        Returns:
+            일치하는 제품 개수
+        """
+        match = build_match_query(query, prefix)
+        if not match:
+            return 0
+        try:
+            if self.fts_enabled:
+                row = self.repo.query_one(PRODUCTS.fts_count_sql, (match,))
+            else:
+                where, params = _like_clause(query)
+                row = self.repo.query_one(f"SELECT COUNT(*) FROM Products WHERE {where}", params)
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"✗ 전문검색 개수 조회 실패: {e}")
+            return 0
+    
+    def _search_like(self, query: str, limit: int) -> List[Tuple]:
+        """FTS5를 쓸 수 없을 때 단어별 LIKE 조건으로 검색"""
+        try:
+            where, params = _like_clause(query)
+            return self.repo.query(f"SELECT * FROM Products WHERE {where} LIMIT ?", params + [limit])
         except sqlite3.Error as e:
             print(f"✗ 제품명별 데이터 조회 실패: {e}")
             return []
@@ -150,19 +320,116 @@ class ProductDatabase:
         Args:
             min_price: 최소 가격
             max_price: 최대 가격
-            
+        
         Returns:
             조회된 제품 데이터 리스트
         """
         try:
             select_sql = "SELECT * FROM Products WHERE productPrice BETWEEN ? AND ?"
-            self.cursor.execute(select_sql, (min_price, max_price))
-            results = self.cursor.fetchall()
-            return results
+            return self.repo.query(select_sql, (min_price, max_price))
         except sqlite3.Error as e:
             print(f"✗ 가격범위 데이터 조회 실패: {e}")
             return []
     
+    def select_page(self, after_id: int = 0, page_size: int = 1000) -> List[Tuple]:
+        """
+        productID 순 키셋(seek) 페이지 조회
+        
+        OFFSET 대신 직전 페이지의 마지막 ID 다음부터 읽으므로
+        뒤쪽 페이지도 앞쪽 페이지와 같은 비용으로 조회됩니다.
+        
+        Args:
+            after_id: 직전 페이지 마지막 행의 productID (첫 페이지는 0)
+            page_size: 페이지 크기 (기본값: 1000)
+        
+        Returns:
+            조회된 제품 데이터 리스트 (마지막 페이지 이후에는 빈 리스트)
+        """
+        try:
+            return self.repo.page(after_id, page_size)
+        except sqlite3.Error as e:
+            print(f"✗ 페이지 조회 실패: {e}")
+            return []
+    
+    def select_by_price_range_page(self, min_price: int, max_price: int, page_size: int = 1000,
+                                   after: Optional[Tuple[int, int]] = None) -> List[Tuple]:
+        """
+        가격 범위 키셋(seek) 페이지 조회, (가격, ID) 순 정렬
+        
+        Args:
+            min_price: 최소 가격
+            max_price: 최대 가격
+            page_size: 페이지 크기 (기본값: 1000)
+            after: 직전 페이지 마지막 행의 (가격, productID) (첫 페이지는 None)
+        
+        Returns:
+            조회된 제품 데이터 리스트 (마지막 페이지 이후에는 빈 리스트)
+        """
+        try:
+            if after is None:
+                select_sql = """
+                SELECT * FROM Products
+                WHERE productPrice BETWEEN ? AND ?
+                ORDER BY productPrice, productID
+                LIMIT ?
+                """
+                params = (min_price, max_price, page_size)
+            else:
+                select_sql = """
+                SELECT * FROM Products
+                WHERE productPrice BETWEEN ? AND ?
+                  AND (productPrice, productID) > (?, ?)
+                ORDER BY productPrice, productID
+                LIMIT ?
+                """
+                params = (min_price, max_price, after[0], after[1], page_size)
+            return self.repo.query(select_sql, params)
+        except sqlite3.Error as e:
+            print(f"✗ 가격범위 페이지 조회 실패: {e}")
+            return []
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        모든 제품 데이터를 productID 순 키셋 페이지로 나눠 읽는 제너레이터
+        
+        페이지마다 읽기 연결을 빌렸다가 바로 돌려주므로, 순회가 길어지거나
+        중간에 멈춰도 연결 풀의 읽기 연결을 붙잡고 있지 않습니다.
+        
+        Args:
+            batch_size: 한 번에 가져올 행 수 (기본값: 1000)
+        
+        Yields:
+            제품 데이터 튜플
+        """
+        after_id = 0
+        while True:
+            rows = self.select_page(after_id, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+    
+    def iter_by_price_range(self, min_price: int, max_price: int,
+                            batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        가격 범위 제품을 (가격, ID) 순 키셋 페이지로 나눠 읽는 제너레이터
+        
+        Args:
+            min_price: 최소 가격
+            max_price: 최대 가격
+            batch_size: 한 번에 가져올 행 수 (기본값: 1000)
+        
+        Yields:
+            제품 데이터 튜플
+        """
+        after = None
+        while True:
+            rows = self.select_by_price_range_page(min_price, max_price, batch_size, after)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][2], rows[-1][0])
+    
     def update(self, product_id: int, product_name: str = None, product_price: int = None) -> bool:
         """
         제품 정보 수정
@@ -171,44 +438,110 @@ class ProductDatabase:
             product_id: 제품 ID
             product_name: 수정할 제품명 (None이면 수정 안함)
             product_price: 수정할 가격 (None이면 수정 안함)
-            
+        
         Returns:
             성공 여부
         """
+        fields = _update_fields(product_name, product_price)
+        if not fields:
+            return True
         try:
-            if product_name is not None:
-                update_sql = "UPDATE Products SET productName = ? WHERE productID = ?"
-                self.cursor.execute(update_sql, (product_name, product_id))
-            
-            if product_price is not None:
-                update_sql = "UPDATE Products SET productPrice = ? WHERE productID = ?"
-                self.cursor.execute(update_sql, (product_price, product_id))
-            
-            self.conn.commit()
+            self.repo.update(product_id, **fields)
             return True
         except sqlite3.Error as e:
             print(f"✗ 데이터 수정 실패: {e}")
             return False
     
+    def update_many(self, changes: Iterable[Tuple[int, Optional[str], Optional[int]]]) -> int:
+        """
+        여러 제품 정보를 한 트랜잭션으로 수정
+        
+        변경 내용을 수정할 컬럼 조합(이름/가격/둘 다)별로 모아
+        조합마다 UPDATE 문 하나를 executemany로 실행하고 한 번에 커밋합니다.
+        하나라도 실패하면 전체를 롤백합니다.
+        
+        Args:
+            changes: [(제품 ID, 제품명 또는 None, 가격 또는 None), ...]
+        
+        Returns:
+            수정된 행의 개수 (실패 시 0)
+        """
+        groups: Dict[str, list] = {}
+        for product_id, product_name, product_price in changes:
+            fields = _update_fields(product_name, product_price)
+            if fields:
+                update_sql = PRODUCTS.update_sql_for(fields)
+                groups.setdefault(update_sql, []).append(list(fields.values()) + [product_id])
+        
+        def work(conn):
+            return sum(conn.executemany(sql, rows).rowcount for sql, rows in groups.items())
+        try:
+            return self._write(work)
+        except sqlite3.Error as e:
+            print(f"✗ 일괄 수정 실패: {e}")
+            return 0
+        finally:
+            self.repo.clear_cache()
+    
+    def upsert_many(self, products: Iterable[Tuple[int, str, int]]) -> int:
+        """
+        여러 제품을 한 트랜잭션으로 삽입하거나 수정 (productID 기준)
+        
+        Args:
+            products: [(제품 ID, 제품명, 가격), ...] - ID가 있으면 수정, 없으면 삽입
+        
+        Returns:
+            삽입/수정된 행의 개수 (실패 시 0)
+        """
+        upsert_sql = """
+        INSERT INTO Products (productID, productName, productPrice)
+        VALUES (?, ?, ?)
+        ON CONFLICT (productID) DO UPDATE SET
+            productName = excluded.productName,
+            productPrice = excluded.productPrice
+        """
+        products = list(products)
+        try:
+            return self._write(lambda conn: conn.executemany(upsert_sql, products).rowcount)
+        except sqlite3.Error as e:
+            print(f"✗ 일괄 삽입/수정 실패: {e}")
+            return 0
+        finally:
+            self.repo.clear_cache()
+    
     def delete(self, product_id: int) -> bool:
         """
         제품 데이터 삭제
         
         Args:
             product_id: 제품 ID
-            
+        
         Returns:
             성공 여부
         """
         try:
-            delete_sql = "DELETE FROM Products WHERE productID = ?"
-            self.cursor.execute(delete_sql, (product_id,))
-            self.conn.commit()
+            self.repo.delete(product_id)
             return True
         except sqlite3.Error as e:
             print(f"✗ 데이터 삭제 실패: {e}")
             return False
     
+    def delete_many(self, product_ids: Iterable[int]) -> int:
+        """
+        여러 제품을 한 트랜잭션으로 삭제
+        
+        Args:
+            product_ids: 삭제할 제품 ID들
+        
+        Returns:
+            삭제된 행의 개수 (실패 시 0)
+        """
+        try:
+            return self.repo.delete_many(product_ids)
+        except sqlite3.Error as e:
+            print(f"✗ 일괄 삭제 실패: {e}")
+            return 0
+    
     def delete_all(self) -> bool:
         """
         모든 제품 데이터 삭제
@@ -217,38 +550,438 @@ class ProductDatabase:
             성공 여부
         """
         try:
-            delete_sql = "DELETE FROM Products"
-            self.cursor.execute(delete_sql)
-            self.conn.commit()
+            self._write(lambda conn: conn.execute("DELETE FROM Products"))
             print(f"✓ 모든 데이터 삭제 완료")
             return True
         except sqlite3.Error as e:
             print(f"✗ 전체 데이터 삭제 실패: {e}")
             return False
+        finally:
+            self.repo.clear_cache()
     
     def get_total_count(self) -> int:
         """
-        전체 제품 개수 조회
+        전체 제품 개수 조회 (ProductRepository 캐시 우선)
         
         Returns:
             제품 개수
         """
         try:
-            count_sql = "SELECT COUNT(*) FROM Products"
-            self.cursor.execute(count_sql)
-            count = self.cursor.fetchone()[0]
-            return count
+            return self.repo.count()
         except sqlite3.Error as e:
             print(f"✗ 데이터 개수 조회 실패: {e}")
             return 0
     
+    def create_summary_table(self) -> bool:
+        """
+        가격 요약 테이블(ProductSummary) 생성
+        
+        전체 개수와 가격 합계를 한 행에 저장하고 INSERT/UPDATE/DELETE 트리거로
+        증분 갱신합니다. 요약 테이블이 있으면 get_price_statistics()가
+        COUNT/AVG를 전체 스캔 없이 이 행에서 읽습니다.
+        
+        Returns:
+            성공 여부
+        """
+        def work(conn):
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS ProductSummary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                productCount INTEGER NOT NULL,
+                priceSum INTEGER NOT NULL
+            )
+            """)
+            conn.execute("""
+            INSERT OR REPLACE INTO ProductSummary (id, productCount, priceSum)
+            SELECT 1, COUNT(*), COALESCE(SUM(productPrice), 0) FROM Products
+            """)
+            for name in ("ProductSummary_ai", "ProductSummary_ad", "ProductSummary_au"):
+                conn.execute(_SUMMARY_TRIGGERS[name])
+        try:
+            self._write(work)
+            self.summary_enabled = True
+            return True
+        except sqlite3.Error as e:
+            print(f"✗ 요약 테이블 생성 실패: {e}")
+            return False
+    
+    def _detect_summary_table(self):
+        """이미 만들어진 요약 테이블이 있으면 사용하도록 설정"""
+        try:
+            self.summary_enabled = self.repo.query_one(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ProductSummary'"
+            ) is not None
+        except sqlite3.Error:
+            self.summary_enabled = False
+    
+    def get_price_statistics(self) -> Dict[str, float]:
+        """
+        가격 통계 조회 (SQLite에서 집계)
+        
+        MIN/MAX는 가격 인덱스로, COUNT/AVG는 요약 테이블이 있으면 요약 행에서,
+        없으면 한 번의 집계 쿼리로 계산합니다.
+        
+        Returns:
+            {"count", "avg", "min", "max"} 딕셔너리 (데이터가 없으면 count=0, 나머지 None)
+        """
+        empty = {"count": 0, "avg": None, "min": None, "max": None}
+        try:
+            with self.repo.reader() as conn:
+                if self.summary_enabled:
+                    row = conn.execute(
+                        "SELECT productCount, priceSum FROM ProductSummary WHERE id = 1"
+                    ).fetchone()
+                    count, total = row if row else (0, 0)
+                    min_price = conn.execute("SELECT MIN(productPrice) FROM Products").fetchone()[0]
+                    max_price = conn.execute("SELECT MAX(productPrice) FROM Products").fetchone()[0]
+                    avg_price = total / count if count else None
+                else:
+                    count, avg_price, min_price, max_price = conn.execute(
+                        "SELECT COUNT(*), AVG(productPrice), MIN(productPrice), MAX(productPrice) FROM Products"
+                    ).fetchone()
+            if not count:
+                return empty
+            return {"count": count, "avg": avg_price, "min": min_price, "max": max_price}
+        except sqlite3.Error as e:
+            print(f"✗ 가격 통계 조회 실패: {e}")
+            return empty
+    
+    def get_price_percentiles(self, percents: Sequence[float] = (50, 90, 95, 99)) -> Dict[float, int]:
+        """
+        가격 백분위수 조회 (nearest-rank 방식)
+        
+        가격 인덱스 순서로 한 번만 훑으면서 ROW_NUMBER() 윈도 함수로 순위를 매겨
+        필요한 순위의 가격들만 한 쿼리로 읽습니다 (백분위마다 OFFSET으로 다시 훑지 않음).
+        
+        Args:
+            percents: 구할 백분위 목록 (0~100)
+            
+        Returns:
+            {백분위: 가격} 딕셔너리 (데이터가 없으면 빈 딕셔너리)
+        """
+        for p in percents:
+            if not 0 <= p <= 100:
+                raise ValueError(f"백분위는 0~100 사이여야 합니다: {p}")
+        try:
+            with self.repo.reader() as conn:
+                count = conn.execute(PRODUCTS.count_sql).fetchone()[0]
+                if count == 0:
+                    return {}
+                # ceil(count * p / 100), 최소 1
+                ranks = {p: int(max(1, -(-count * p // 100))) for p in percents}
+                wanted = sorted(set(ranks.values()))
+                select_sql = f"""
+                SELECT rn, productPrice FROM (
+                    SELECT productPrice, ROW_NUMBER() OVER (ORDER BY productPrice) AS rn
+                    FROM Products
+                )
+                WHERE rn IN ({", ".join("?" for _ in wanted)})
+                """
+                prices = dict(conn.execute(select_sql, wanted).fetchall())
+            return {p: prices[rank] for p, rank in ranks.items()}
+        except sqlite3.Error as e:
+            print(f"✗ 가격 백분위 조회 실패: {e}")
+            return {}
+    
+    def get_price_histogram(self, bucket_size: int = 100000) -> List[Tuple[int, int, int]]:
+        """
+        가격 히스토그램 조회
+        
+        Args:
+            bucket_size: 구간 폭(원) (기본값: 100000)
+        
+        Returns:
+            [(구간 시작가, 구간 끝가(미포함), 개수), ...] 가격 오름차순
+        """
+        if bucket_size <= 0:
+            raise ValueError("bucket_size는 1 이상이어야 합니다.")
+        try:
+            select_sql = """
+            SELECT productPrice / ? AS bucket, COUNT(*)
+            FROM Products
+            GROUP BY bucket
+            ORDER BY bucket
+            """
+            rows = self.repo.query(select_sql, (bucket_size,))
+            return [(b * bucket_size, (b + 1) * bucket_size, n) for b, n in rows]
+        except sqlite3.Error as e:
+            print(f"✗ 가격 히스토그램 조회 실패: {e}")
+            return []
+    
+    def get_group_statistics(self, group_by: str = "brand") -> List[Tuple[str, int, float, int, int]]:
+        """
+        브랜드별/카테고리별 가격 통계 조회
+        
+        제품명이 "브랜드 카테고리 모델" 형식이라고 보고 SQL에서 공백으로 잘라
+        그룹을 만듭니다.
+        
+        Args:
+            group_by: "brand" (첫 단어) 또는 "category" (두 번째 단어)
+        
+        Returns:
+            [(그룹명, 개수, 평균가, 최저가, 최고가), ...] 개수 내림차순
+        """
+        rest = "substr(productName, instr(productName, ' ') + 1) || ' '"
+        keys = {
+            "brand": "substr(productName || ' ', 1, instr(productName || ' ', ' ') - 1)",
+            "category": f"substr({rest}, 1, instr({rest}, ' ') - 1)",
+        }
+        if group_by not in keys:
+            raise ValueError(f"group_by는 'brand' 또는 'category'여야 합니다: {group_by}")
+        try:
+            select_sql = f"""
+            SELECT {keys[group_by]} AS grp, COUNT(*), AVG(productPrice),
+                   MIN(productPrice), MAX(productPrice)
+            FROM Products
+            GROUP BY grp
+            ORDER BY COUNT(*) DESC, grp
+            """
+            return self.repo.query(select_sql)
+        except sqlite3.Error as e:
+            print(f"✗ 그룹별 통계 조회 실패: {e}")
+            return []
+    
     def close(self):
-        """데이터베이스 연결 종료"""
-        if self.conn:
-            self.conn.close()
+        """데이터베이스 연결 종료 (쓰기 큐를 모두 처리한 뒤 연결 풀 종료)"""
+        if self.repo:
+            self.repo.close()
+            self.repo = None
             print("✓ 데이터베이스 연결 종료")
 
 
+class CachedProductDatabase(ProductDatabase):
+    """
+    자주 조회하는 select_by_id / select_by_name / search 결과를
+    메모리(LRUCache)에 두는 ProductDatabase
+    
+    이 클래스의 insert/update/delete 계열 메서드가 호출되면 관련 캐시를 비웁니다.
+    다른 프로세스나 연결이 같은 DB를 수정한 경우는 ttl이 지나야 반영됩니다.
+    """
+    
+    def __init__(self, db_name: str = "MyProduct.db", maxsize: int = 4096,
+                 ttl: Optional[float] = 60.0):
+        """
+        Args:
+            db_name: 데이터베이스 파일명 (기본값: MyProduct.db)
+            maxsize: 캐시별 최대 항목 수 (기본값: 4096)
+            ttl: 캐시 항목 유효시간(초), None이면 만료 없음 (기본값: 60)
+        """
+        self.id_cache = LRUCache(maxsize, ttl)
+        self.query_cache = LRUCache(maxsize, ttl)
+        super().__init__(db_name)
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """캐시별 적중/실패 횟수와 크기"""
+        return {"id": self.id_cache.stats(), "query": self.query_cache.stats()}
+    
+    def clear_cache(self):
+        """모든 캐시 비우기"""
+        self.id_cache.clear()
+        self.query_cache.clear()
+    
+    # ---- 읽기: 캐시 우선 ----
+    
+    def select_by_id(self, product_id: int) -> Tuple:
+        result = self.id_cache.get(product_id)
+        if result is None:
+            result = super().select_by_id(product_id)
+            # 없는 ID는 캐시하지 않음 (이후 삽입된 행을 가리지 않도록)
+            if result is not None:
+                self.id_cache.put(product_id, result)
+        return result
+    
+    def select_by_name(self, product_name: str) -> List[Tuple]:
+        key = ("name", product_name)
+        result = self.query_cache.get(key)
+        if result is None:
+            result = super().select_by_name(product_name)
+            self.query_cache.put(key, result)
+        return list(result)
+    
+    def search(self, query: str, limit: int = 100, prefix: bool = True) -> List[Tuple]:
+        key = ("search", query, limit, prefix)
+        result = self.query_cache.get(key)
+        if result is None:
+            result = super().search(query, limit, prefix)
+            self.query_cache.put(key, result)
+        return list(result)
+    
+    # ---- 쓰기: 관련 캐시 무효화 ----
+    
+    def insert(self, product_name: str, product_price: int) -> bool:
+        self.query_cache.clear()
+        return super().insert(product_name, product_price)
+    
+    def insert_many(self, products: List[Tuple[str, int]]) -> int:
+        self.query_cache.clear()
+        return super().insert_many(products)
+    
+    def bulk_load(self, products: Iterable[Tuple[str, int]], *args, **kwargs) -> int:
+        self.query_cache.clear()
+        return super().bulk_load(products, *args, **kwargs)
+    
+    def update(self, product_id: int, product_name: str = None, product_price: int = None) -> bool:
+        self.id_cache.invalidate(product_id)
+        self.query_cache.clear()
+        return super().update(product_id, product_name, product_price)
+    
+    def update_many(self, changes: Iterable[Tuple[int, Optional[str], Optional[int]]]) -> int:
+        changes = list(changes)
+        for product_id, _, _ in changes:
+            self.id_cache.invalidate(product_id)
+        self.query_cache.clear()
+        return super().update_many(changes)
+    
+    def upsert_many(self, products: Iterable[Tuple[int, str, int]]) -> int:
+        products = list(products)
+        for product_id, _, _ in products:
+            self.id_cache.invalidate(product_id)
+        self.query_cache.clear()
+        return super().upsert_many(products)
+    
+    def delete(self, product_id: int) -> bool:
+        self.id_cache.invalidate(product_id)
+        self.query_cache.clear()
+        return super().delete(product_id)
+    
+    def delete_many(self, product_ids: Iterable[int]) -> int:
+        product_ids = list(product_ids)
+        for product_id in product_ids:
+            self.id_cache.invalidate(product_id)
+        self.query_cache.clear()
+        return super().delete_many(product_ids)
+    
+    def delete_all(self) -> bool:
+        self.clear_cache()
+        return super().delete_all()
+
+
+class PooledProductDatabase:
+    """
+    ProductRepository(연결 풀 + 캐시) 위에서 동작하는 스레드 안전 제품 조회/수정 클래스
+    
+    여러 워커 스레드가 하나의 인스턴스를 함께 사용할 수 있습니다.
+    읽기 메서드는 빌린 연결에서 바로 실행되고, 쓰기 메서드는 쓰기 큐를 거쳐
+    커밋된 뒤 결과를 돌려줍니다. ID 조회와 전체 개수는 캐시에서 먼저 찾습니다.
+    """
+    
+    def __init__(self, db_name: str = "MyProduct.db", max_readers: int = 4):
+        """
+        Args:
+            db_name: 데이터베이스 파일명 (기본값: MyProduct.db)
+            max_readers: 읽기 연결 최대 개수 (기본값: 4)
+        """
+        # 테이블/인덱스/전문검색 트리거는 ProductDatabase로 한 번 만들어 둔다
+        ProductDatabase(db_name).close()
+        self.repo = ProductRepository(db_name, PRODUCTS, max_readers=max_readers)
+        self.pool = self.repo.pool
+    
+    def select_by_id(self, product_id: int) -> Optional[Tuple]:
+        """ID로 제품 조회"""
+        return self.repo.get(product_id)
+    
+    def select_by_name(self, product_name: str) -> List[Tuple]:
+        """제품명으로 제품 조회 (LIKE 부분 일치)"""
+        return self.repo.query(
+            "SELECT * FROM Products WHERE productName LIKE ?", (f"%{product_name}%",)
+        )
+    
+    def search(self, query: str, limit: int = 100, prefix: bool = True) -> List[Tuple]:
+        """전문검색 인덱스로 제품 검색 (관련도 순)"""
+        match = build_match_query(query, prefix)
+        if not match:
+            return []
+        return self.repo.query(PRODUCTS.fts_search_sql, (match, limit))
+    
+    def select_by_price_range_page(self, min_price: int, max_price: int, page_size: int = 1000,
+                                   after: Optional[Tuple[int, int]] = None) -> List[Tuple]:
+        """가격 범위 키셋 페이지 조회, (가격, ID) 순 정렬"""
+        last_price, last_id = after if after is not None else (min_price - 1, 0)
+        return self.repo.query(
+            """
+            SELECT * FROM Products
+            WHERE productPrice BETWEEN ? AND ?
+              AND (productPrice, productID) > (?, ?)
+            ORDER BY productPrice, productID
+            LIMIT ?
+            """,
+            (min_price, max_price, last_price, last_id, page_size),
+        )
+    
+    def get_total_count(self) -> int:
+        """전체 제품 개수 조회"""
+        return self.repo.count()
+    
+    def insert(self, product_name: str, product_price: int) -> int:
+        """
+        제품 삽입
+        
+        Returns:
+            새 제품의 productID
+        """
+        return self.repo.insert(product_name, product_price)
+    
+    def insert_many(self, products: List[Tuple[str, int]]) -> int:
+        """
+        여러 제품을 한 트랜잭션으로 삽입
+        
+        Returns:
+            삽입된 제품 수
+        """
+        return self.repo.insert_many(products)
+    
+    def update(self, product_id: int, product_name: str = None, product_price: int = None) -> bool:
+        """
+        제품 정보 수정 (None이 아닌 이름/가격만 한 문장으로 수정)
+        
+        Returns:
+            수정된 행이 있으면 True
+        """
+        return self.repo.update(product_id, **_update_fields(product_name, product_price))
+    
+    def delete(self, product_id: int) -> bool:
+        """
+        제품 삭제
+        
+        Returns:
+            삭제된 행이 있으면 True
+        """
+        return self.repo.delete(product_id)
+    
+    def close(self):
+        """연결 풀 종료"""
+        self.repo.close()
+
+
+def _update_fields(product_name: Optional[str], product_price: Optional[int]) -> Dict[str, object]:
+    """None이 아닌 제품명/가격만 담은 {열 이름: 값} (ProductRepository.update에 넘길 수정 내용)"""
+    return {c: v for c, v in (("productName", product_name), ("productPrice", product_price))
+            if v is not None}
+
+
+def _like_clause(text: str) -> Tuple[str, list]:
+    """검색어의 각 단어를 모두 포함하는 LIKE 조건과 파라미터 생성"""
+    tokens = (text or "").split() or [""]
+    where = " AND ".join("productName LIKE ?" for _ in tokens)
+    return where, [f"%{t}%" for t in tokens]
+
+
+SAMPLE_CATEGORIES = [
+    "노트북", "데스크탑", "모니터", "마우스", "키보드",
+    "헤드폰", "스피커", "웹캠", "프린터", "라우터",
+    "태블릿", "스마트폰", "이어폰", "충전기", "케이블"
+]
+
+SAMPLE_BRANDS = [
+    "삼성", "LG", "애플", "소니", "델",
+    "에이수스", "레노버", "HP", "MSI", "ASUS"
+]
+
+# 가격 범위: 10,000원 ~ 3,000,000원
+SAMPLE_MIN_PRICE = 10000
+SAMPLE_MAX_PRICE = 3000000
+
+
 def generate_sample_products(count: int = 100000) -> List[Tuple[str, int]]:
     """
     샘플 제품 데이터 생성
@@ -259,35 +992,100 @@ def generate_sample_products(count: int = 100000) -> List[Tuple[str, int]]:
     Returns:
         [(제품명, 가격), ...] 형태의 제품 리스트
     """
-    categories = [
-        "노트북", "데스크탑", "모니터", "마우스", "키보드",
-        "헤드폰", "스피커", "웹캠", "프린터", "라우터",
-        "태블릿", "스마트폰", "이어폰", "충전기", "케이블"
-    ]
-    
-    brands = [
-        "삼성", "LG", "애플", "소니", "델",
-        "에이수스", "레노버", "HP", "MSI", "ASUS"
-    ]
-    
     products = []
     for i in range(count):
-        category = random.choice(categories)
-        brand = random.choice(brands)
+        category = random.choice(SAMPLE_CATEGORIES)
+        brand = random.choice(SAMPLE_BRANDS)
         model = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
         product_name = f"{brand} {category} {model}"
         
-        # 가격 범위: 10,000원 ~ 3,000,000원
-        product_price = random.randint(10000, 3000000)
+        product_price = random.randint(SAMPLE_MIN_PRICE, SAMPLE_MAX_PRICE)
         
         products.append((product_name, product_price))
     
     return products
 
 
-if __name__ == "__main__":
+def generate_sample_chunks(count: int = 100000, chunk_size: int = 100000,
+                           seed: Optional[int] = None) -> Iterator[List[Tuple[str, int]]]:
+    """
+    샘플 제품 데이터를 청크 단위로 생성 (NumPy 벡터화)
+    
+    브랜드/카테고리/모델명/가격을 청크마다 NumPy 배열 연산으로 한 번에 만들기 때문에
+    천만 건 단위도 빠르게 생성할 수 있습니다. 같은 seed면 항상 같은 데이터가 나옵니다.
+    NumPy가 없으면 random.Random(seed)로 같은 형식의 데이터를 만듭니다.
+    
+    사용 예:
+        db.bulk_load(chain.from_iterable(generate_sample_chunks(10_000_000, seed=42)))
+    
+    Args:
+        count: 생성할 제품 개수 (기본값: 100000)
+        chunk_size: 청크 하나의 행 수 (기본값: 100000)
+        seed: 난수 시드 (None이면 매번 다름)
+        
+    Yields:
+        [(제품명, 가격), ...] 형태의 청크
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size는 1 이상이어야 합니다.")
+    alphabet = string.ascii_uppercase + string.digits
+    prefixes = [f"{b} {c} " for b in SAMPLE_BRANDS for c in SAMPLE_CATEGORIES]
+
+    try:
+        import numpy as np
+    except ImportError:
+        rng = random.Random(seed)
+        remaining = count
+        while remaining > 0:
+            n = min(chunk_size, remaining)
+            yield [(rng.choice(prefixes) + ''.join(rng.choices(alphabet, k=4)),
+                    rng.randint(SAMPLE_MIN_PRICE, SAMPLE_MAX_PRICE)) for _ in range(n)]
+            remaining -= n
+        return
+
+    rng = np.random.default_rng(seed)
+    prefix_arr = np.array(prefixes)
+    # 문자 코드(UTF-32) 4개를 이어 붙여 '<U4' 문자열로 보기 위한 코드표
+    codes = np.array([ord(ch) for ch in alphabet], dtype="<u4")
+    remaining = count
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        models = codes[rng.integers(0, len(alphabet), size=(n, 4))].view("<U4").ravel()
+        names = np.char.add(prefix_arr[rng.integers(0, len(prefixes), size=n)], models)
+        prices = rng.integers(SAMPLE_MIN_PRICE, SAMPLE_MAX_PRICE + 1, size=n)
+        yield list(zip(names.tolist(), prices.tolist()))
+        remaining -= n
+
+
+def seed_database(db_name: str, rows: int, chunk_size: int = 100000,
+                  seed: Optional[int] = None, append: bool = False) -> int:
+    """
+    벤치마크/부하 테스트용 DB를 샘플 데이터로 채웁니다.
+    
+    Args:
+        db_name: 데이터베이스 파일명
+        rows: 넣을 행 수
+        chunk_size: 생성/커밋 단위 행 수 (기본값: 100000)
+        seed: 난수 시드
+        append: True면 기존 데이터에 추가, False면 비우고 새로 채움
+        
+    Returns:
+        삽입된 행의 개수
+    """
+    db = ProductDatabase(db_name)
+    try:
+        if not append and db.get_total_count() > 0:
+            db.delete_all()
+        chunks = generate_sample_chunks(rows, chunk_size, seed)
+        return db.bulk_load(chain.from_iterable(chunks), chunk_size=chunk_size)
+    finally:
+        db.close()
+
+
+def run_demo(db_name: str = "MyProduct.db"):
+    """CRUD 동작을 출력으로 확인하는 데모"""
     # 데이터베이스 초기화
-    db = ProductDatabase("MyProduct.db")
+    db = ProductDatabase(db_name)
     
     # 기존 데이터 확인
     print(f"\n[현재 데이터 개수] {db.get_total_count()}")
@@ -302,7 +1100,7 @@ if __name__ == "__main__":
     sample_products = generate_sample_products(100000)
     
     print("데이터베이스에 삽입 중입니다...")
-    inserted_count = db.insert_many(sample_products)
+    inserted_count = db.bulk_load(sample_products)
     print(f"✓ {inserted_count}개의 데이터가 삽입되었습니다.\n")
     
     # INSERT 테스트 - 단일 삽입
@@ -335,16 +1133,26 @@ if __name__ == "__main__":
     else:
         print()
     
+    # SELECT 테스트 - 전문검색
+    print("▶ 전문검색 (검색: '삼성 노트북'):")
+    results = db.search("삼성 노트북", limit=3)
+    print(f"  검색 결과: {db.search_count('삼성 노트북')}개")
+    for i, result in enumerate(results):
+        print(f"  {i+1}. ID: {result[0]}, 제품명: {result[1]}, 가격: {result[2]:,}원")
+    print()
+    
     # SELECT 테스트 - 가격 범위로 조회
     print("▶ 가격 범위로 조회 (50만원~100만원):")
-    results = db.select_by_price_range(500000, 1000000)
-    print(f"  검색 결과: {len(results)}개")
-    for i, result in enumerate(results[:3]):  # 처음 3개만 출력
+    results = db.select_by_price_range_page(500000, 1000000, page_size=3)
+    for i, result in enumerate(results):  # 첫 페이지 3개만 출력
         print(f"  {i+1}. ID: {result[0]}, 제품명: {result[1]}, 가격: {result[2]:,}원")
-    if len(results) > 3:
-        print(f"  ... 외 {len(results)-3}개\n")
-    else:
-        print()
+    if results:
+        last = results[-1]
+        next_page = db.select_by_price_range_page(500000, 1000000, page_size=3,
+                                                  after=(last[2], last[0]))
+        print(f"  다음 페이지 첫 항목: {next_page[0] if next_page else '없음'}")
+    total = sum(1 for _ in db.iter_by_price_range(500000, 1000000))
+    print(f"  검색 결과: {total}개\n")
     
     # UPDATE 테스트
     print("=" * 60)
@@ -377,17 +1185,37 @@ if __name__ == "__main__":
     print("=" * 60)
     print("[통계 정보]")
     print("=" * 60)
-    all_products = db.select_all()
-    if all_products:
-        prices = [p[2] for p in all_products]
-        avg_price = sum(prices) / len(prices)
-        min_price = min(prices)
-        max_price = max(prices)
-        
-        print(f"총 제품 개수: {len(all_products):,}개")
-        print(f"평균 가격: {avg_price:,.0f}원")
-        print(f"최저 가격: {min_price:,}원")
-        print(f"최고 가격: {max_price:,}원\n")
+    stats = db.get_price_statistics()
+    if stats["count"]:
+        print(f"총 제품 개수: {stats['count']:,}개")
+        print(f"평균 가격: {stats['avg']:,.0f}원")
+        print(f"최저 가격: {stats['min']:,}원")
+        print(f"최고 가격: {stats['max']:,}원")
+        percentiles = db.get_price_percentiles((50, 90, 99))
+        print("백분위 가격: " + ", ".join(f"p{p}={v:,}원" for p, v in percentiles.items()))
+        print("브랜드별 상위 3개:")
+        for brand, n, avg, _, _ in db.get_group_statistics("brand")[:3]:
+            print(f"  {brand}: {n:,}개, 평균 {avg:,.0f}원")
+        print()
     
     # 데이터베이스 연결 종료
     db.close()
+
+
+def main():
+    p = argparse.ArgumentParser(description="전자제품 DB 데모 / 샘플 데이터 적재")
+    p.add_argument("--db", default="MyProduct.db", help="데이터베이스 파일 (기본: MyProduct.db)")
+    p.add_argument("--rows", type=int, help="지정하면 데모 대신 이 개수만큼 샘플 데이터를 적재")
+    p.add_argument("--chunk-size", type=int, default=100000, help="생성/커밋 단위 행 수 (기본 100000)")
+    p.add_argument("--seed", type=int, help="난수 시드 (같은 시드면 같은 데이터)")
+    p.add_argument("--append", action="store_true", help="기존 데이터를 지우지 않고 추가")
+    args = p.parse_args()
+
+    if args.rows is None:
+        run_demo(args.db)
+        return
+    seed_database(args.db, args.rows, chunk_size=args.chunk_size, seed=args.seed, append=args.append)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,84 @@
 import sys
 from PyQt5.QtWidgets import *
-from PyQt5.QtCore import pyqtSlot, Qt
+from PyQt5.QtCore import pyqtSlot, pyqtSignal, Qt, QThread, QTimer
+from PyQt5.QtGui import QKeySequence
 from PyQt5 import uic 
-import sqlite3
-import os.path 
-
-#DB파일이 없으면 만들고 있다면 접속한다. 
-if os.path.exists("ProductList.db"):
-    con = sqlite3.connect("ProductList.db")
-    cur = con.cursor()
-else: 
-    con = sqlite3.connect("ProductList.db")
-    cur = con.cursor()
-    cur.execute(
-        "create table Products (id integer primary key autoincrement, Name text, Price integer);")
+from ProductRepository import PRODUCT_LIST, ProductRepository
+
+#제품 DB 파일 (연결 풀/캐시는 ProductRepository 공용 계층)
+DB_NAME = "ProductList.db"
+#한 번에 읽어서 테이블에 붙이는 행 수 
+PAGE_SIZE = 500
+#마지막 편집 후 이 시간(ms) 동안 입력이 없으면 모아 둔 변경을 한 트랜잭션으로 저장 
+SAVE_DELAY_MS = 2000
 
 #디자인 파일을 로딩
 form_class = uic.loadUiType("ProductList3.ui")[0]
 
+
+class ProductLoader(QThread):
+    """Products를 id 순서로 PAGE_SIZE행씩(키셋) 읽어 page 시그널로 보내는 작업 스레드"""
+    page = pyqtSignal(int, list)     # 조회 세대 번호, 행 목록
+    done = pyqtSignal(int, int)      # 조회 세대 번호, 읽은 전체 행 수
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, repo, generation, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.generation = generation
+        self.page_size = page_size
+
+    def run(self):
+        after_id = 0
+        total = 0
+        try:
+            while not self.isInterruptionRequested():
+                rows = self.repo.page(after_id, self.page_size)
+                if rows:
+                    self.page.emit(self.generation, rows)
+                    total += len(rows)
+                if len(rows) < self.page_size:
+                    break
+                after_id = rows[-1][0]
+        except Exception as e:
+            self.failed.emit(self.generation, str(e))
+            return
+        self.done.emit(self.generation, total)
+
+
 class Window(QMainWindow, form_class):
+    #쓰기 스레드에서 저장이 끝나면 (새 행 ID 셀 목록, Future)를 GUI 스레드로 넘긴다 
+    saved = pyqtSignal(object, object)
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
+        #DB파일이 없으면 만들고 있다면 접속한다. 
+        self.repo = ProductRepository(DB_NAME, PRODUCT_LIST)
+        self.repo.ensure_schema()
         
         #초기값 셋팅 
         self.id = 0 
         self.name = ""
         self.price = 0 
+        #백그라운드 조회 상태 (세대 번호로 이전 조회의 늦은 결과를 버린다)
+        self.loader = None
+        self.loaders = set()
+        self.generation = 0
+        #저장 대기 중인 변경 (작업 단위: 입력/수정/삭제를 모아서 한 번에 커밋)
+        self.pendingInserts = []     # (ID 셀, 제품명, 가격)
+        self.pendingUpdates = {}     # id -> (제품명, 가격)
+        self.pendingDeletes = set()
+        self.rowItems = {}           # id -> ID 셀 (행 위치 찾기용)
+        self.saving = None
+        self.reloadAfterSave = False
+        self.saveTimer = QTimer(self)
+        self.saveTimer.setSingleShot(True)
+        self.saveTimer.setInterval(SAVE_DELAY_MS)
+        self.saveTimer.timeout.connect(self.saveChanges)
+        self.saved.connect(self.onSaved)
+        #Ctrl+S로 바로 저장 
+        QShortcut(QKeySequence.Save, self, self.saveChanges)
 
         #QTableWidget의 컬럼폭 셋팅하기 
         self.tableWidget.setColumnWidth(0, 100)
@@ -51,71 +103,201 @@ class Window(QMainWindow, form_class):
         #더블클릭 시그널 처리
         self.tableWidget.doubleClicked.connect(self.doubleClick)
 
-    def addProduct(self):
-        #입력 파라메터 처리 
+    def readInputs(self):
+        #입력 파라메터 처리 (가격은 정수만 허용)
         self.name = self.prodName.text()
-        self.price = self.prodPrice.text()
-        cur.execute("insert into Products (Name, Price) values(?,?);", 
-            (self.name, self.price))
-        #리프레시
-        self.getProduct() 
-        #입력,수정,삭제 작업후에는 커밋을 한다. 
-        con.commit() 
+        try:
+            self.price = int(self.prodPrice.text())
+        except ValueError:
+            QMessageBox.warning(self, "입력 오류", "가격은 정수여야 합니다.")
+            return False
+        return True
+
+    def selectedID(self):
+        #수정/삭제 대상 ID (아직 저장되지 않은 새 행은 ID가 없다)
+        try:
+            self.id = int(self.prodID.text())
+        except ValueError:
+            QMessageBox.information(self, "선택 필요", 
+                "ID가 있는 항목을 더블클릭해서 선택하세요. (새 항목은 저장된 뒤 ID가 생깁니다)")
+            return None
+        return self.id
+
+    def addProduct(self):
+        if not self.readInputs():
+            return
+        #DB에는 나중에 한 번에 넣고, 화면에는 바로 ID 없는 행으로 붙인다 
+        row = self.tableWidget.rowCount()
+        self.tableWidget.setRowCount(row + 1)
+        itemID = self.setRow(row, ("", self.name, self.price))
+        self.tableWidget.scrollToItem(itemID)
+        self.pendingInserts.append((itemID, self.name, self.price))
+        self.markDirty()
 
     def updateProduct(self):
         #업데이트 작업시 파라메터 처리 
-        self.id  = self.prodID.text()
-        self.name = self.prodName.text()
-        self.price = self.prodPrice.text()
-        cur.execute("update Products set name=?, price=? where id=?;", 
-            (self.name, self.price, self.id))
-        #리프레시
-        self.getProduct() 
-        #입력,수정,삭제 작업후에는 커밋을 한다. 
-        con.commit()  
+        if self.selectedID() is None or not self.readInputs():
+            return
+        if self.id in self.pendingDeletes:
+            return
+        self.pendingUpdates[self.id] = (self.name, self.price)
+        #해당 행만 그 자리에서 고친다 
+        itemID = self.rowItems.get(self.id)
+        if itemID is not None:
+            self.setRow(itemID.row(), (self.id, self.name, self.price))
+        self.markDirty()
 
     def removeProduct(self):
         #삭제 파라메터 처리 
-        self.id  = self.prodID.text() 
-        strSQL = "delete from Products where id=" + str(self.id)
-        cur.execute(strSQL)
-        #리프레시
-        self.getProduct() 
-        #입력,수정,삭제 작업후에는 커밋을 한다. 
-        con.commit()  
+        if self.selectedID() is None:
+            return
+        self.pendingUpdates.pop(self.id, None)
+        self.pendingDeletes.add(self.id)
+        itemID = self.rowItems.pop(self.id, None)
+        if itemID is not None:
+            self.tableWidget.removeRow(itemID.row())
+        self.markDirty()
+
+    def pendingCount(self):
+        return len(self.pendingInserts) + len(self.pendingUpdates) + len(self.pendingDeletes)
+
+    def markDirty(self):
+        #편집할 때마다 타이머를 다시 시작해서, 입력이 멈추면 저장한다 
+        self.saveTimer.start()
+        self.statusbar.showMessage("저장 안 된 변경 {}건 (Ctrl+S: 바로 저장)".format(self.pendingCount()))
+
+    def saveChanges(self):
+        self.saveTimer.stop()
+        #저장 중이면 끝난 뒤 onSaved에서 나머지를 이어서 저장한다 
+        if self.saving is not None or not self.pendingCount():
+            return
+        items = [itemID for itemID, _, _ in self.pendingInserts]
+        self.saving = self.repo.submit_changes(
+            inserts=[(name, price) for _, name, price in self.pendingInserts],
+            updates=[(key, name, price) for key, (name, price) in self.pendingUpdates.items()],
+            deletes=self.pendingDeletes)
+        self.pendingInserts = []
+        self.pendingUpdates = {}
+        self.pendingDeletes = set()
+        self.statusbar.showMessage("저장 중...")
+        self.saving.add_done_callback(lambda future: self.saved.emit(items, future))
+
+    def onSaved(self, items, future):
+        self.saving = None
+        error = future.exception()
+        if error is not None:
+            QMessageBox.warning(self, "저장 오류", 
+                "변경 내용을 저장하지 못했습니다. DB 내용으로 다시 불러옵니다.\n{}".format(error))
+            self.reloadAfterSave = True
+        else:
+            #새 행에 DB가 정한 ID를 채운다 
+            for itemID, key in zip(items, future.result()):
+                itemID.setText("{:10}".format(key))
+                self.rowItems[key] = itemID
+        if self.pendingCount():
+            self.markDirty()
+        else:
+            self.statusbar.showMessage("저장됨")
+        if self.reloadAfterSave and self.saving is None and not self.pendingCount():
+            self.reloadAfterSave = False
+            self.getProduct()
 
     def getProduct(self):
+        #저장 안 된 변경이 있으면 먼저 저장하고, 저장이 끝난 뒤 다시 불러온다 
+        if self.saving is not None or self.pendingCount():
+            self.reloadAfterSave = True
+            self.saveChanges()
+            return
+        #이전 조회가 돌고 있으면 멈춘다 
+        if self.loader is not None:
+            self.loader.requestInterruption()
+        self.generation += 1
+
         #검색 결과를 보여주기전에 기존 컨텐트를 삭제(헤더는 제외)
         self.tableWidget.clearContents()
+        self.tableWidget.setRowCount(0)
+        self.rowItems.clear()
+        self.statusbar.showMessage("불러오는 중...")
 
-        cur.execute("select * from Products;") 
-        #행숫자 카운트 
-        row = 0 
-        for item in cur: 
-            int_as_strID = "{:10}".format(item[0])
-            int_as_strPrice = "{:10}".format(item[2])
-            
-            #각 열을 Item으로 생성해서 숫자를 오른쪽으로 정렬해서 출력한다. 
-            itemID = QTableWidgetItem(int_as_strID) 
-            itemID.setTextAlignment(Qt.AlignRight) 
-            self.tableWidget.setItem(row, 0, itemID)
-            
-            #제품명은 그대로 출력한다. 
-            self.tableWidget.setItem(row, 1, QTableWidgetItem(item[1]))
-            
-            #각 열을 Item으로 생성해서 숫자를 오른쪽으로 정렬해서 출력한다. 
-            itemPrice = QTableWidgetItem(int_as_strPrice) 
-            itemPrice.setTextAlignment(Qt.AlignRight) 
-            self.tableWidget.setItem(row, 2, itemPrice)
-            
+        #작업 스레드가 페이지 단위로 읽어 보내면 addPage에서 행을 늘려가며 붙인다 
+        loader = ProductLoader(self.repo, self.generation, parent=self)
+        loader.page.connect(self.addPage)
+        loader.done.connect(self.loadDone)
+        loader.failed.connect(self.loadFailed)
+        #멈춘 이전 스레드도 끝날 때까지 참조를 잡아 둔다 
+        loader.finished.connect(lambda: self.loaders.discard(loader))
+        loader.finished.connect(loader.deleteLater)
+        self.loaders.add(loader)
+        self.loader = loader
+        loader.start()
+
+    def addPage(self, generation, rows):
+        if generation != self.generation:
+            return
+        #행 수를 페이지만큼 늘리고 한 번에 그린다 
+        row = self.tableWidget.rowCount()
+        self.tableWidget.setUpdatesEnabled(False)
+        self.tableWidget.setRowCount(row + len(rows))
+        for item in rows:
+            self.setRow(row, item)
             row += 1
-            print("row: ", row)  
+        self.tableWidget.setUpdatesEnabled(True)
+        self.statusbar.showMessage("불러오는 중... {:,}건".format(row))
+
+    def loadDone(self, generation, total):
+        if generation != self.generation:
+            return
+        self.loader = None
+        self.statusbar.showMessage("{:,}건".format(total))
+
+    def loadFailed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.loader = None
+        self.statusbar.showMessage("")
+        QMessageBox.warning(self, "조회 오류", message)
+
+    def setRow(self, row, item):
+        int_as_strID = "{:10}".format(item[0])
+        int_as_strPrice = "{:10}".format(item[2])
+
+        #각 열을 Item으로 생성해서 숫자를 오른쪽으로 정렬해서 출력한다. 
+        itemID = QTableWidgetItem(int_as_strID) 
+        itemID.setTextAlignment(Qt.AlignRight) 
+        self.tableWidget.setItem(row, 0, itemID)
+
+        #제품명은 그대로 출력한다. 
+        self.tableWidget.setItem(row, 1, QTableWidgetItem(item[1]))
+
+        #각 열을 Item으로 생성해서 숫자를 오른쪽으로 정렬해서 출력한다. 
+        itemPrice = QTableWidgetItem(int_as_strPrice) 
+        itemPrice.setTextAlignment(Qt.AlignRight) 
+        self.tableWidget.setItem(row, 2, itemPrice)
+
+        if item[0] != "":
+            self.rowItems[item[0]] = itemID
+        return itemID
 
     def doubleClick(self):
         self.prodID.setText(self.tableWidget.item(self.tableWidget.currentRow(), 0).text())
         self.prodName.setText(self.tableWidget.item(self.tableWidget.currentRow(), 1).text())
         self.prodPrice.setText(self.tableWidget.item(self.tableWidget.currentRow(), 2).text())
 
+    def closeEvent(self, event):
+        #모아 둔 변경을 마저 저장한다 
+        if self.saving is not None:
+            self.saving.exception()
+            self.saving = None
+        self.saveChanges()
+        if self.saving is not None:
+            self.saving.exception()
+        #조회 스레드가 모두 끝난 뒤에 연결 풀을 닫는다 
+        for loader in list(self.loaders):
+            loader.requestInterruption()
+            loader.wait()
+        self.repo.close()
+        event.accept()
+
 
 #인스턴스를 생성한다. 
 app = QApplication(sys.argv)
@@ -0,0 +1,740 @@
+"""
+제품 테이블 공용 데이터 접근 계층
+
+ProductDatabase.py(MyProduct.db의 Products), myprod_app.py(myprod.db의 MyProd),
+ProductList3.py(ProductList.db의 Products)가 이 모듈을 통해 SQLite를 사용합니다.
+연결 설정(PRAGMA), 인덱스, 연결 풀, 준비된 문장, 배치 쓰기, 캐시를 한 곳에서 관리하므로
+여기서 한 성능 개선은 세 프로그램에 모두 적용됩니다.
+
+사용 예:
+    repo = ProductRepository("myprod.db", MYPROD)
+    repo.ensure_schema()
+    new_id = repo.insert("마스크", 1500, 10)
+    repo.update(new_id, price=1800)          # 넘긴 열만 수정 (None을 넘기면 NULL로 저장)
+    rows = repo.page(after_id=0, page_size=200)
+    repo.close()
+"""
+
+import sqlite3
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+import queue
+import threading
+import time
+
+
+# sqlite3 연결마다 보관할 준비된(prepared) 문장 수
+STATEMENT_CACHE_SIZE = 256
+# 연결별 페이지 캐시 크기 (KiB)
+CACHE_SIZE_KB = 16384
+
+
+def open_connection(db_name: str, timeout: float = 30.0, **kwargs) -> sqlite3.Connection:
+    """
+    공용 설정으로 SQLite 연결 열기
+    
+    Args:
+        db_name: 데이터베이스 파일명
+        timeout: 잠금을 기다리는 최대 시간(초) (기본값: 30)
+        **kwargs: sqlite3.connect에 그대로 넘길 인자 (isolation_level, check_same_thread 등)
+        
+    Returns:
+        준비된 문장 캐시와 PRAGMA가 적용된 연결
+    """
+    conn = sqlite3.connect(db_name, timeout=timeout, cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
+    configure_connection(conn)
+    return conn
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """연결마다 적용하는 PRAGMA (DB 파일에 저장되지 않으므로 연결할 때마다 설정)"""
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+class TableSchema:
+    """
+    제품 테이블 하나의 구조와, 그 테이블에 쓰는 고정 SQL 문장
+    
+    SQL 문자열을 미리 만들어 두고 매번 같은 문장을 쓰므로
+    sqlite3의 준비된 문장 캐시에서 그대로 재사용됩니다.
+    """
+    
+    def __init__(self, table: str, key: str, columns: Sequence[Tuple[str, str]],
+                 indexes: Sequence[Tuple[str, str]] = ()):
+        """
+        Args:
+            table: 테이블명
+            key: INTEGER PRIMARY KEY AUTOINCREMENT 열 이름
+            columns: 키를 뺀 (열 이름, 타입 정의) 목록, 첫 열이 제품명
+            indexes: 만들 인덱스의 (인덱스 이름, 열 이름) 목록
+        """
+        self.table = table
+        self.key = key
+        self.columns = [name for name, _ in columns]
+        self.name_column = self.columns[0]
+        self.indexes = list(indexes)
+        
+        cols = ", ".join(self.columns)
+        marks = ", ".join("?" for _ in self.columns)
+        definitions = ",\n    ".join(f"{name} {decl}" for name, decl in columns)
+        self.create_sql = (
+            f"CREATE TABLE IF NOT EXISTS {table} (\n"
+            f"    {key} INTEGER PRIMARY KEY AUTOINCREMENT,\n    {definitions}\n)"
+        )
+        self.index_sql = [
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({col})" for name, col in self.indexes
+        ]
+        self.select_sql = f"SELECT {key}, {cols} FROM {table}"
+        self.get_sql = f"{self.select_sql} WHERE {key} = ?"
+        self.page_sql = f"{self.select_sql} WHERE {key} > ? ORDER BY {key} LIMIT ?"
+        self.name_sql = f"{self.select_sql} WHERE {self.name_column} LIKE ? ORDER BY {key} LIMIT ?"
+        self.count_sql = f"SELECT COUNT(*) FROM {table}"
+        self.insert_sql = f"INSERT INTO {table} ({cols}) VALUES ({marks})"
+        self.delete_sql = f"DELETE FROM {table} WHERE {key} = ?"
+        # 수정할 열 조합별 UPDATE 문 (조합마다 한 번 만들어 같은 문자열을 재사용)
+        self._update_sqls = {}
+        self.update_sql = self.update_sql_for(self.columns)
+        
+        # 제품명 전문검색(FTS5): 테이블을 외부 콘텐츠로 쓰는 "<테이블>FTS"와 동기화 트리거
+        name = self.name_column
+        self.fts_table = f"{table}FTS"
+        self.fts_create_sql = (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} USING fts5(\n"
+            f"    {name}, content = '{table}', content_rowid = '{key}',\n"
+            f"    tokenize = 'unicode61', prefix = '1 2 3'\n)"
+        )
+        fts_delete = (f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {name}) "
+                      f"VALUES ('delete', old.{key}, old.{name});")
+        fts_insert = f"INSERT INTO {self.fts_table}(rowid, {name}) VALUES (new.{key}, new.{name});"
+        self.fts_trigger_sql = {
+            f"{table}_ai": f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {table} BEGIN\n"
+                           f"    {fts_insert}\nEND",
+            f"{table}_ad": f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {table} BEGIN\n"
+                           f"    {fts_delete}\nEND",
+            f"{table}_au": f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {name} ON {table} BEGIN\n"
+                           f"    {fts_delete}\n    {fts_insert}\nEND",
+        }
+        self.fts_search_sql = (
+            f"SELECT t.{key}, " + ", ".join(f"t.{c}" for c in self.columns)
+            + f" FROM {self.fts_table} f JOIN {table} t ON t.{key} = f.rowid"
+            + f" WHERE {self.fts_table} MATCH ? ORDER BY f.rank LIMIT ?"
+        )
+        self.fts_count_sql = f"SELECT COUNT(*) FROM {self.fts_table} WHERE {self.fts_table} MATCH ?"
+        # 다른 조건과 AND로 묶어 쓰는 WHERE 조건 (파라미터: MATCH 식)
+        self.fts_condition = f"{key} IN (SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH ?)"
+    
+    def update_sql_for(self, columns: Sequence[str]) -> str:
+        """columns 열만 SET에 넣은 UPDATE 문 (파라미터: 열 값들, 마지막에 키)"""
+        columns = tuple(columns)
+        sql = self._update_sqls.get(columns)
+        if sql is None:
+            unknown = [c for c in columns if c not in self.columns]
+            if unknown or not columns:
+                raise ValueError(f"{self.table}에서 수정할 수 없는 열: {unknown or '(없음)'}")
+            sets = ", ".join(f"{c} = ?" for c in columns)
+            sql = f"UPDATE {self.table} SET {sets} WHERE {self.key} = ?"
+            self._update_sqls[columns] = sql
+        return sql
+    
+    def create(self, conn):
+        """테이블과 인덱스 생성 (이미 있으면 그대로 둠, 커밋은 호출한 쪽에서)"""
+        conn.execute(self.create_sql)
+        for sql in self.index_sql:
+            conn.execute(sql)
+    
+    def create_fts(self, conn):
+        """
+        제품명 전문검색 인덱스와 동기화 트리거 생성 (커밋은 호출한 쪽에서)
+        
+        인덱스를 처음 만들 때는 기존 데이터로 한 번 재구축합니다.
+        FTS5를 지원하지 않는 SQLite라면 sqlite3.Error가 납니다 (호출한 쪽에서 LIKE 검색으로 대체).
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.fts_table,)
+        ).fetchone() is not None
+        conn.execute(self.fts_create_sql)
+        for sql in self.fts_trigger_sql.values():
+            conn.execute(sql)
+        if not exists:
+            conn.execute(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+
+
+def build_match_query(text: str, prefix: bool = True) -> str:
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 변환 (모든 단어 포함)
+    
+    각 단어를 큰따옴표로 감싸 FTS 연산자(AND, OR, -, * 등)로 해석되지 않게 하고,
+    prefix가 True면 단어 뒤에 *를 붙여 접두어 검색을 합니다.
+    
+    Args:
+        text: 검색어
+        prefix: 접두어 검색 여부
+        
+    Returns:
+        MATCH 식 (검색어가 비어 있으면 빈 문자열)
+    """
+    tokens = (text or "").split()
+    suffix = "*" if prefix else ""
+    return " ".join('"' + t.replace('"', '""') + '"' + suffix for t in tokens)
+
+
+# ProductDatabase.py: 가격 범위 조회/가격순 페이지 조회용 인덱스
+PRODUCTS = TableSchema(
+    "Products", "productID",
+    [("productName", "TEXT NOT NULL"), ("productPrice", "INTEGER NOT NULL")],
+    indexes=[("idx_products_price", "productPrice")],
+)
+
+# myprod_app.py: 정렬/범위 필터용 인덱스 (rowid인 id가 함께 정렬되므로 (열, id) 키셋 조회에도 쓰임)
+MYPROD = TableSchema(
+    "MyProd", "id",
+    [("name", "TEXT"), ("price", "INTEGER"), ("qty", "INTEGER")],
+    indexes=[("idx_myprod_name", "name"), ("idx_myprod_price", "price"), ("idx_myprod_qty", "qty")],
+)
+
+# ProductList3.py
+PRODUCT_LIST = TableSchema(
+    "Products", "id",
+    [("Name", "TEXT"), ("Price", "INTEGER")],
+)
+
+
+class LRUCache:
+    """
+    크기(maxsize)와 유효시간(ttl) 제한이 있는 LRU 캐시
+    
+    가장 오래 사용하지 않은 항목부터 밀어내고, ttl초가 지난 항목은
+    조회할 때 만료 처리합니다. hits/misses로 적중률을 확인할 수 있습니다.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        """
+        Args:
+            maxsize: 최대 항목 수 (기본값: 1024)
+            ttl: 항목 유효시간(초), None이면 만료 없음 (기본값: 60)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """캐시 조회 (없거나 만료되었으면 default)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        """캐시 저장 (가득 차면 가장 오래 쓰지 않은 항목 제거)"""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key):
+        """항목 하나 제거"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """모든 항목 제거 (통계는 유지)"""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """적중/실패 횟수와 현재 크기"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+    
+    def __len__(self):
+        return len(self._data)
+
+
+class ProductConnectionPool:
+    """
+    스레드에서 함께 쓰는 SQLite 연결 풀
+    
+    - 읽기: 최대 max_readers개의 읽기 전용 연결을 만들어 두고
+      reader() 컨텍스트 매니저로 빌려 씁니다. 한 연결은 한 번에 한 스레드만 사용합니다.
+    - 쓰기: 전용 쓰기 스레드 하나가 단일 연결로 쓰기 큐를 처리합니다.
+      큐에 쌓인 작업은 한 트랜잭션으로 묶어 커밋하고(작업마다 SAVEPOINT),
+      submit()은 결과를 담은 Future를 돌려줍니다.
+    
+    데이터베이스는 WAL 모드로 열리므로 쓰기 중에도 읽기가 막히지 않습니다.
+    """
+    
+    def __init__(self, db_name: str = "MyProduct.db", max_readers: int = 4,
+                 timeout: float = 30.0, max_batch: int = 1000):
+        """
+        연결 풀 초기화
+        
+        Args:
+            db_name: 데이터베이스 파일명 (기본값: MyProduct.db)
+            max_readers: 읽기 연결 최대 개수 (기본값: 4)
+            timeout: 연결을 빌리거나 잠금을 기다리는 최대 시간(초) (기본값: 30)
+            max_batch: 쓰기 트랜잭션 하나로 묶을 최대 작업 수 (기본값: 1000)
+        """
+        if max_readers <= 0:
+            raise ValueError("max_readers는 1 이상이어야 합니다.")
+        self.db_name = db_name
+        self.max_readers = max_readers
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._all_readers = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._write_queue = queue.Queue()
+        self._writer_ready = threading.Event()
+        self._writer_error = None
+        self._writer = threading.Thread(target=self._writer_loop, name="ProductDBWriter", daemon=True)
+        self._writer.start()
+        self._writer_ready.wait()
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """읽기 전용 연결 생성 (빌려 간 스레드에서 쓰도록 check_same_thread 해제)"""
+        conn = open_connection(self.db_name, self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        읽기 연결을 빌려 주는 컨텍스트 매니저
+        
+        사용 예:
+            with pool.reader() as conn:
+                conn.execute("SELECT ...").fetchall()
+        """
+        if self._closed:
+            raise RuntimeError("연결 풀이 이미 종료되었습니다.")
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.max_readers:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = self._open_reader()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._all_readers.append(conn)
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError("사용 가능한 읽기 연결이 없습니다.") from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def submit(self, work: Callable[[sqlite3.Connection], object]) -> Future:
+        """
+        쓰기 작업을 쓰기 큐에 넣습니다.
+        
+        Args:
+            work: 쓰기 연결을 인자로 받아 실행할 함수 (트랜잭션 안에서 실행됨)
+            
+        Returns:
+            work의 반환값(또는 예외)을 담을 Future
+        """
+        future = Future()
+        # close()와 겹쳐도 종료 표시(None) 뒤에 작업이 들어가지 않도록 잠금 안에서 넣는다
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("연결 풀이 이미 종료되었습니다.")
+            self._write_queue.put((work, future))
+        return future
+
+    def execute_write(self, sql: str, params: Sequence = ()) -> Future:
+        """
+        SQL 한 문장을 쓰기 큐에 넣습니다.
+        
+        Returns:
+            (rowcount, lastrowid)를 담을 Future
+        """
+        def work(conn):
+            cur = conn.execute(sql, params)
+            return cur.rowcount, cur.lastrowid
+        return self.submit(work)
+
+    def _writer_loop(self):
+        """쓰기 스레드: 큐의 작업을 모아 한 트랜잭션으로 처리"""
+        try:
+            conn = open_connection(self.db_name, self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL").fetchone()
+            conn.execute("PRAGMA synchronous = NORMAL")
+        except sqlite3.Error as e:
+            self._writer_error = e
+            self._writer_ready.set()
+            return
+        self._writer_ready.set()
+
+        stop = False
+        while not stop:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = [item for item in batch if item is not None]
+                stop = True
+
+            results = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for work, future in batch:
+                    conn.execute("SAVEPOINT pool_write")
+                    try:
+                        results.append((future, work(conn), None))
+                        conn.execute("RELEASE pool_write")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO pool_write")
+                        conn.execute("RELEASE pool_write")
+                        results.append((future, None, e))
+                conn.execute("COMMIT")
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                results = [(future, None, e) for _, future in batch]
+            for future, value, error in results:
+                if error is None:
+                    future.set_result(value)
+                else:
+                    future.set_exception(error)
+        conn.close()
+        # 종료 뒤에 남은 작업은 기다리는 쪽이 멈추지 않도록 실패로 끝낸다
+        while True:
+            try:
+                item = self._write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("연결 풀이 이미 종료되었습니다."))
+
+    def close(self):
+        """쓰기 큐를 모두 처리한 뒤 모든 연결 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._write_queue.put(None)
+        self._writer.join()
+        with self._lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ProductRepository:
+    """
+    TableSchema 하나에 대한 스레드 안전 조회/수정 클래스
+    
+    - 읽기: ProductConnectionPool의 읽기 연결에서 실행 (여러 스레드가 동시에 조회 가능)
+    - 쓰기: 쓰기 스레드 한 곳으로 모여 트랜잭션 단위로 커밋 (insert_many 등은 한 작업으로 처리)
+    - 캐시: ID 조회와 전체 개수를 LRUCache에 두고, 이 인스턴스로 쓰면 관련 항목을 비웁니다.
+      다른 프로세스나 연결이 같은 DB를 수정한 경우는 ttl이 지나야 반영됩니다.
+    """
+    
+    def __init__(self, db_name: str, schema: TableSchema, max_readers: int = 4,
+                 cache_size: int = 4096, cache_ttl: Optional[float] = 60.0):
+        """
+        Args:
+            db_name: 데이터베이스 파일명
+            schema: 사용할 테이블 구조 (PRODUCTS, MYPROD, PRODUCT_LIST 등)
+            max_readers: 읽기 연결 최대 개수 (기본값: 4)
+            cache_size: 캐시 최대 항목 수 (기본값: 4096)
+            cache_ttl: 캐시 항목 유효시간(초), None이면 만료 없음 (기본값: 60)
+        """
+        self.db_name = db_name
+        self.schema = schema
+        self.pool = ProductConnectionPool(db_name, max_readers=max_readers)
+        self.cache = LRUCache(cache_size, cache_ttl)
+    
+    def ensure_schema(self):
+        """테이블과 인덱스 생성/확인"""
+        self.pool.submit(self.schema.create).result()
+    
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """읽기 연결 빌리기 (스키마 전용 SQL이 필요할 때)"""
+        with self.pool.reader() as conn:
+            yield conn
+    
+    def submit(self, work: Callable[[sqlite3.Connection], object]) -> Future:
+        """
+        쓰기 작업을 쓰기 큐에 넣습니다 (트랜잭션 안에서 실행되며 예외가 나면 그 작업만 롤백).
+        work 안에서는 commit()/rollback()을 부르지 않습니다.
+        이 작업으로 바뀐 행은 캐시에서 비워지지 않으므로 필요하면 clear_cache()를 부릅니다.
+        """
+        return self.pool.submit(work)
+    
+    # ---- 읽기 ----
+    
+    def query(self, sql: str, params: Sequence = ()) -> List[Tuple]:
+        """임의의 SELECT 실행 (캐시 없음)"""
+        with self.pool.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+    
+    def query_one(self, sql: str, params: Sequence = ()) -> Optional[Tuple]:
+        """임의의 SELECT 첫 행 (없으면 None)"""
+        with self.pool.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+    
+    def get(self, key: int) -> Optional[Tuple]:
+        """키로 한 행 조회 (캐시 우선)"""
+        row = self.cache.get(("id", key))
+        if row is None:
+            row = self.query_one(self.schema.get_sql, (key,))
+            # 없는 키는 캐시하지 않음 (이후 삽입된 행을 가리지 않도록)
+            if row is not None:
+                self.cache.put(("id", key), row)
+        return row
+    
+    def count(self) -> int:
+        """전체 행 수 (캐시 우선)"""
+        total = self.cache.get("count")
+        if total is None:
+            total = self.query_one(self.schema.count_sql)[0]
+            self.cache.put("count", total)
+        return total
+    
+    def page(self, after_id: int = 0, page_size: int = 1000) -> List[Tuple]:
+        """키 순서 키셋 페이지 조회 (after_id 다음 행부터 page_size개)"""
+        return self.query(self.schema.page_sql, (after_id, page_size))
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """전체 행을 키 순서로 batch_size개씩 읽어 하나씩 돌려줍니다 (메모리 일정)"""
+        after_id = 0
+        while True:
+            rows = self.page(after_id, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+    
+    def find_by_name(self, text: str, limit: int = 100) -> List[Tuple]:
+        """제품명 부분 일치(LIKE) 조회"""
+        return self.query(self.schema.name_sql, (f"%{text}%", limit))
+    
+    # ---- 쓰기 ----
+    
+    def _write(self, sql: str, params: Sequence) -> Tuple[int, int]:
+        return self.pool.execute_write(sql, params).result()
+    
+    def insert(self, *values) -> int:
+        """
+        한 행 삽입
+        
+        Args:
+            *values: 스키마 열 순서대로의 값 (키 제외)
+            
+        Returns:
+            새 행의 키
+        """
+        _, lastrowid = self._write(self.schema.insert_sql, values)
+        self.cache.invalidate("count")
+        return lastrowid
+    
+    def insert_many(self, rows: Iterable[Sequence]) -> int:
+        """
+        여러 행을 한 트랜잭션으로 삽입 (executemany)
+        
+        Returns:
+            삽입된 행 수
+        """
+        def work(conn):
+            return conn.executemany(self.schema.insert_sql, rows).rowcount
+        count = self.pool.submit(work).result()
+        self.cache.invalidate("count")
+        return count
+    
+    def update(self, key: int, *values, **fields) -> bool:
+        """
+        한 행 수정 (넘긴 열만 SET에 넣으므로 None을 넘기면 그 열은 NULL이 됨)
+        
+        Args:
+            key: 수정할 행의 키
+            *values: 스키마 열 순서대로의 값 (뒤쪽에서 빠진 열은 그대로 둠)
+            **fields: 열 이름으로 지정한 값 (예: price=1800)
+            
+        Returns:
+            수정된 행이 있으면 True (수정할 열이 없으면 False)
+        """
+        columns, params = self._update_params(key, values, fields)
+        if not columns:
+            return False
+        rowcount, _ = self._write(self.schema.update_sql_for(columns), params)
+        self.cache.invalidate(("id", key))
+        return rowcount > 0
+    
+    def update_many(self, changes: Iterable[Sequence]) -> int:
+        """
+        여러 행을 한 트랜잭션으로 수정
+        
+        Args:
+            changes: (키, 열 값...) 목록, 뒤쪽에서 빠진 열은 그대로 둠
+            
+        Returns:
+            수정된 행 수
+        """
+        groups, keys = self._update_groups(changes)
+        
+        def work(conn):
+            return sum(conn.executemany(sql, params).rowcount for sql, params in groups.items())
+        count = self.pool.submit(work).result()
+        for key in keys:
+            self.cache.invalidate(("id", key))
+        return count
+    
+    def _update_params(self, key: int, values: Sequence, fields: Dict = None) -> Tuple[tuple, list]:
+        """
+        수정할 열 이름들과 update_sql_for(열) 파라미터(열 값들 + 키)
+        
+        values는 스키마 열 순서대로 앞에서부터, fields는 열 이름으로 지정합니다.
+        """
+        if len(values) > len(self.schema.columns):
+            raise ValueError(f"{self.schema.table}의 열은 {len(self.schema.columns)}개입니다: {values}")
+        given = dict(zip(self.schema.columns, values))
+        for column, value in (fields or {}).items():
+            if column not in self.schema.columns:
+                raise ValueError(f"{self.schema.table}에 없는 열: {column}")
+            given[column] = value
+        columns = tuple(c for c in self.schema.columns if c in given)
+        return columns, [given[c] for c in columns] + [key]
+    
+    def _update_groups(self, changes: Iterable[Sequence]) -> Tuple[Dict[str, list], list]:
+        """(키, 열 값...) 목록을 UPDATE 문별 파라미터 목록으로 묶음 (executemany용), 수정할 키 목록"""
+        groups: Dict[str, list] = {}
+        keys = []
+        for key, *values in changes:
+            columns, params = self._update_params(key, values)
+            if columns:
+                groups.setdefault(self.schema.update_sql_for(columns), []).append(params)
+                keys.append(key)
+        return groups, keys
+    
+    def delete(self, key: int) -> bool:
+        """
+        한 행 삭제
+        
+        Returns:
+            삭제된 행이 있으면 True
+        """
+        rowcount, _ = self._write(self.schema.delete_sql, (key,))
+        self.cache.invalidate(("id", key))
+        self.cache.invalidate("count")
+        return rowcount > 0
+    
+    def delete_many(self, keys: Iterable[int]) -> int:
+        """
+        여러 행을 한 트랜잭션으로 삭제
+        
+        Returns:
+            삭제된 행 수
+        """
+        keys = list(keys)
+        
+        def work(conn):
+            return conn.executemany(self.schema.delete_sql, ((k,) for k in keys)).rowcount
+        count = self.pool.submit(work).result()
+        for key in keys:
+            self.cache.invalidate(("id", key))
+        self.cache.invalidate("count")
+        return count
+    
+    def submit_changes(self, inserts: Iterable[Sequence] = (), updates: Iterable[Sequence] = (),
+                       deletes: Iterable[int] = ()) -> Future:
+        """
+        삽입/수정/삭제를 쓰기 작업 하나(한 트랜잭션)로 묶어 넣고 바로 돌아옵니다 (작업 단위 저장용).
+        삭제, 수정, 삽입 순으로 실행하며 하나라도 실패하면 전부 롤백됩니다.
+        
+        Args:
+            inserts: 삽입할 열 값 목록 (키 제외)
+            updates: (키, 열 값...) 목록, 뒤쪽에서 빠진 열은 그대로 둠
+            deletes: 삭제할 키 목록
+            
+        Returns:
+            삽입된 행들의 새 키 목록(inserts 순서)을 담을 Future
+            (끝나면 관련 캐시 항목을 비우며, 콜백은 쓰기 스레드에서 불림)
+        """
+        inserts = [tuple(values) for values in inserts]
+        updates, updated = self._update_groups(updates)
+        deletes = list(deletes)
+        
+        def work(conn):
+            conn.executemany(self.schema.delete_sql, ((key,) for key in deletes))
+            for sql, params in updates.items():
+                conn.executemany(sql, params)
+            return [conn.execute(self.schema.insert_sql, values).lastrowid for values in inserts]
+        
+        def invalidate(_):
+            for key in deletes:
+                self.cache.invalidate(("id", key))
+            for key in updated:
+                self.cache.invalidate(("id", key))
+            self.cache.invalidate("count")
+        
+        future = self.pool.submit(work)
+        future.add_done_callback(invalidate)
+        return future
+    
+    # ---- 캐시/종료 ----
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """캐시 적중/실패 횟수와 크기"""
+        return self.cache.stats()
+    
+    def clear_cache(self):
+        """캐시 비우기"""
+        self.cache.clear()
+    
+    def close(self):
+        """쓰기 큐를 모두 처리한 뒤 연결 풀 종료"""
+        self.pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
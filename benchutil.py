@@ -0,0 +1,136 @@
+"""
+벤치마크 공용 도구 (ProductBenchmark.py, kimpga_benchmark.py에서 사용)
+
+호출별 시간 측정, 백분위수 요약, 결과 표 출력, JSON 저장과 이전 결과 비교(--compare)를 한 곳에 둡니다.
+각 벤치마크는 측정할 연산과 결과를 구분하는 열(labels, 예: size나 fixture)만 정하면 됩니다.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+import argparse
+import json
+import platform
+import sys
+import time
+
+
+# 결과를 구분하는 열: (키, 형식) 목록. 예: [("size", ">10,"), ("op", "<22")]
+Labels = Sequence[Tuple[str, str]]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값에서 nearest-rank 방식 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(op: str, timings: List[float], rows_per_call: int = 1, **labels) -> Dict:
+    """호출별 소요시간(초) 목록을 통계 딕셔너리로 요약 (labels는 결과를 구분하는 값, 예: size=10000)"""
+    timings = sorted(timings)
+    total = sum(timings)
+    calls = len(timings)
+    return {
+        "op": op,
+        **labels,
+        "calls": calls,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": total / calls * 1000 if calls else 0.0,
+        "ops_per_sec": calls / total if total > 0 else 0.0,
+        "rows_per_sec": calls * rows_per_call / total if total > 0 else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[int], object], calls: int) -> List[float]:
+    """fn(i)를 calls번 호출하며 호출마다 걸린 시간(초) 측정"""
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _header(key: str, spec: str) -> str:
+    # 숫자용 천 단위 구분자(,)는 머리글 문자열에 쓸 수 없으므로 뺀다
+    return f"{key:{spec.replace(',', '')}}"
+
+
+def print_results(results: List[Dict], labels: Labels, throughput: bool = True):
+    """결과 표 출력 (labels 열 다음에 calls, p50/p95/p99, throughput이면 ops/s와 rows/s)"""
+    head = " ".join(_header(key, spec) for key, spec in labels)
+    head += f" {'calls':>6} {'p50(ms)':>10} {'p95(ms)':>10} {'p99(ms)':>10}"
+    if throughput:
+        head += f" {'ops/s':>12} {'rows/s':>12}"
+    print(head)
+    for r in results:
+        line = " ".join(f"{r[key]:{spec}}" for key, spec in labels)
+        line += f" {r['calls']:>6} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['p99_ms']:>10.3f}"
+        if throughput:
+            line += f" {r['ops_per_sec']:>12,.0f} {r['rows_per_sec']:>12,.0f}"
+        print(line)
+
+
+def compare_results(old: List[Dict], new: List[Dict], threshold: float, labels: Labels) -> int:
+    """
+    이전 결과와 p50 기준으로 비교해 변화율 출력 (labels 값이 같은 항목끼리 비교)
+
+    Returns:
+        threshold(%)보다 느려진 항목 수
+    """
+    keys = [key for key, _ in labels]
+    old_map = {tuple(r.get(k) for k in keys): r for r in old}
+    regressions = 0
+    print("\n" + " ".join(_header(key, spec) for key, spec in labels)
+          + f" {'old p50':>10} {'new p50':>10} {'change':>9}")
+    for r in new:
+        prev = old_map.get(tuple(r.get(k) for k in keys))
+        if prev is None or prev["p50_ms"] <= 0:
+            continue
+        change = (r["p50_ms"] - prev["p50_ms"]) / prev["p50_ms"] * 100
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  << 느려짐"
+        print(" ".join(f"{r[key]:{spec}}" for key, spec in labels)
+              + f" {prev['p50_ms']:>10.3f} {r['p50_ms']:>10.3f} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def report_meta(**extra) -> Dict:
+    """JSON 보고서의 meta (실행 시각, 파이썬/플랫폼 버전 + 벤치마크별 설정)"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def add_report_args(p: argparse.ArgumentParser):
+    """--json, --compare, --threshold 옵션 추가"""
+    p.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    p.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    p.add_argument("--threshold", type=float, default=20.0,
+                   help="--compare 시 회귀로 볼 p50 증가율(%%) (기본 20)")
+
+
+def finish_report(args: argparse.Namespace, report: Dict, labels: Labels, throughput: bool = True):
+    """결과 표를 출력하고 --json이면 저장, --compare면 비교해 느려진 항목이 있을 때 종료 코드 1"""
+    print()
+    print_results(report["results"], labels, throughput)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[OK] JSON 저장됨: {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        regressions = compare_results(old["results"], report["results"], args.threshold, labels)
+        if regressions:
+            print(f"\n[WARN] {regressions}개 항목이 {args.threshold:.0f}% 이상 느려졌습니다.")
+            sys.exit(1)
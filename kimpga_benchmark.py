@@ -0,0 +1,87 @@
+"""
+kimpga_top20 파싱 벤치마크
+
+저장해 둔 HTML(기본: kimpga_fixtures/*.html)을 파서 백엔드(lxml/selectolax/html.parser)별로
+테이블 추출(extract_tables), KIMPGA 전용 파서(try_parse_kimpga), 전체 파싱(parse_top_coins)의
+지연시간(p50/p95/p99)을 측정합니다. 백엔드마다 결과가 같은지도 함께 확인합니다.
+결과는 JSON으로 저장해 이전 실행과 비교(--compare)할 수 있습니다.
+
+사용 예:
+    python kimpga_benchmark.py --json parse.json
+    python kimpga_benchmark.py --fixtures page1.html page2.html --repeat 200 --compare parse.json
+"""
+
+from typing import Dict, List
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+
+import kimpga_top20 as kimpga
+from benchutil import add_report_args, finish_report, report_meta, summarize, time_calls
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kimpga_fixtures", "*.html")
+# 결과 표/비교에서 항목을 구분하는 열 (rows: 파싱된 코인 수)
+LABELS = [("fixture", "<26"), ("op", "<30"), ("rows", ">5")]
+
+
+def bench_fixture(path: str, backends: List[str], top_n: int, repeat: int) -> List[Dict]:
+    """HTML 파일 하나를 백엔드별로 측정하고, 백엔드 간 결과가 다르면 경고"""
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    name = os.path.basename(path)
+
+    results = []
+    baseline = None
+    for backend in backends:
+        tables = kimpga.extract_tables(html, backend)
+        coins = kimpga.try_parse_kimpga(tables, top_n)
+        if baseline is None:
+            baseline = (backend, coins)
+        elif coins != baseline[1]:
+            print(f"[WARN] {name}: {backend} 결과가 {baseline[0]}와 다릅니다.")
+
+        labels = {"fixture": name, "rows": len(coins)}
+        results.append(summarize(f"{backend}:extract_tables", time_calls(
+            lambda i: kimpga.extract_tables(html, backend), repeat), **labels))
+        results.append(summarize(f"{backend}:try_parse_kimpga", time_calls(
+            lambda i: kimpga.try_parse_kimpga(tables, top_n), repeat), **labels))
+        # parse_top_coins는 못 찾으면 안내 메시지를 출력하므로 측정 출력과 섞이지 않게 숨긴다
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = time_calls(lambda i: kimpga.parse_top_coins(html, top_n, backend), repeat)
+        results.append(summarize(f"{backend}:parse_top_coins", timings, **labels))
+    return results
+
+
+def main():
+    p = argparse.ArgumentParser(description="kimpga_top20 파싱 벤치마크")
+    p.add_argument("--fixtures", nargs="+", help="측정할 HTML 파일 (기본: kimpga_fixtures/*.html)")
+    p.add_argument("--parsers", nargs="+", choices=kimpga.PARSER_BACKENDS,
+                   help="측정할 파서 백엔드 (기본: 설치된 것 전부)")
+    p.add_argument("--top", type=int, default=20, help="파싱할 코인 개수 (기본 20)")
+    p.add_argument("--repeat", type=int, default=50, help="항목별 반복 횟수 (기본 50)")
+    add_report_args(p)
+    args = p.parse_args()
+
+    fixtures = args.fixtures or sorted(glob.glob(DEFAULT_FIXTURES))
+    if not fixtures:
+        print("[ERROR] 측정할 HTML 파일이 없습니다.")
+        sys.exit(1)
+    backends = [b for b in (args.parsers or kimpga.PARSER_BACKENDS) if kimpga.backend_available(b)]
+
+    results = []
+    for path in fixtures:
+        print(f"[{os.path.basename(path)}] 측정 중... ({', '.join(backends)})")
+        results.extend(bench_fixture(path, backends, args.top, args.repeat))
+    report = {
+        "meta": report_meta(backends=backends, top=args.top, repeat=args.repeat),
+        "results": results,
+    }
+    finish_report(args, report, LABELS, throughput=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,60 +7,485 @@ KIMPGA(https://kimpga.com) 메인 페이지에서 상위 N개(기본 20개) 코
 방법:
 - 기본(빠른) 모드: requests + BeautifulSoup 사용 (JS 불필요한 정적 요소 파싱)
 - 필요시 Selenium(헤드리스 브라우저)을 사용해 렌더된 페이지 소스를 받아 파싱할 수 있습니다.
+  브라우저는 BrowserPool이 띄운 채 재사용하고, 대상 테이블이 나타날 때까지 기다린 뒤 소스를 읽습니다.
 
-출력: 파이썬 리스트(딕셔너리) 형태로 반환, 옵션으로 CSV로 저장 가능
+출력: 파이썬 리스트(딕셔너리) 형태로 반환, 옵션으로 CSV/JSONL/Parquet로 저장 가능
+      (열은 OUTPUT_COLUMNS로 고정, RowWriter가 행을 받는 대로 바로 씀)
+
+요청은 Fetcher 한 곳을 거칩니다: 세션(연결 재사용), 동시 요청 수 제한, 재시도(백오프),
+조건부 GET(ETag/Last-Modified), 호스트별 요청 간격 제한을 처리합니다.
+
+파싱은 설치된 빠른 파서(lxml, selectolax, 없으면 내장 html.parser)로 테이블을 한 번 훑어
+ListingTable로 만든 뒤 목록 파서들(KIMPGA 전용 → 일반 테이블 → 카드형 순)에 넘깁니다. html.parser는 SoupStrainer로 table 부분만 트리로 만듭니다.
+카드형 파서가 필요할 때만 BeautifulSoup으로 전체를 파싱합니다.
 
 주의: 사이트가 자바스크립트로 동적으로 렌더링한다면 requests로는 데이터가 보이지 않을 수 있습니다.
 그 경우 --selenium 옵션을 사용하세요(별도 설치 필요).
 
+계속 감시하려면 --watch INTERVAL: 한 프로세스에서 세션을 유지한 채 주기적으로 조회하고,
+이전 결과와 달라진 행만 JSON 한 줄씩 출력합니다 (--db로 SQLite에 변경 이력 기록).
+
 사용 예:
     python kimpga_top20.py --top 20 --csv top20.csv
+    python kimpga_top20.py --top 100 --watch 10 --db kimpga_ticks.db
+    python kimpga_top20.py --top 100 --watch 10 --out ticks_%Y%m%d.jsonl --append
 
 필요 패키지:
     pip install requests beautifulsoup4
+    # 선택: pip install lxml 또는 selectolax  (파싱 속도 향상)
     # selenium 사용 시: pip install selenium 그리고 브라우저 드라이버 필요
+    # Parquet 출력 시: pip install pyarrow
 """
 
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import atexit
+import contextlib
+import importlib
+import json
+import os
 import re
+import random
+import signal
+import sqlite3
+import threading
+import time
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
 import argparse
 import sys
 
 
-def fetch_html(url: str, headers: Optional[dict] = None) -> Optional[str]:
-    headers = headers or {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
-    try:
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        return resp.text
-    except Exception as e:
-        print(f"[ERROR] 요청 실패: {e}")
-        return None
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept-Encoding": "gzip, deflate",
+}
+# 잠시 후 다시 시도하면 될 수 있는 HTTP 상태 코드
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class FetchResult(NamedTuple):
+    url: str
+    text: Optional[str]         # 본문 (304면 이전에 받은 본문), 실패하면 None
+    status: Optional[int]       # 마지막 HTTP 상태 코드, 연결 실패면 None
+    not_modified: bool          # 304로 이전 본문을 재사용했는지
+    elapsed: float              # 재시도/대기를 포함한 소요 시간(초)
+    error: Optional[str] = None
+
+
+class HostRateLimiter:
+    """호스트별 최소 요청 간격(초)을 지키도록 대기 (여러 스레드에서 공유)"""
+
+    def __init__(self, interval: float = 0.0):
+        self.interval = interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Fetcher:
+    """
+    HTTP 요청 계층 (여러 페이지를 반복 조회하는 용도)
+
+    - requests.Session 하나로 TCP/TLS 연결을 재사용 (호스트별 연결 풀 크기 = max_workers)
+    - fetch_many: 최대 max_workers개까지 동시에 요청
+    - 연결 오류/타임아웃/429/5xx는 지수 백오프로 재시도 (Retry-After가 있으면 따르되 max_backoff초까지만)
+    - 조건부 GET: 받은 ETag/Last-Modified를 기억했다가 보내고, 304면 이전 본문을 재사용
+    - 같은 호스트에는 min_interval초 간격으로만 요청
+    """
+
+    def __init__(self, headers: Optional[dict] = None, timeout: float = 15.0, max_workers: int = 4,
+                 retries: int = 3, backoff: float = 0.5, min_interval: float = 0.0,
+                 max_backoff: float = 60.0):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = HostRateLimiter(min_interval)
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._validators = {}   # url -> (etag, last_modified, text)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _retry_delay(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        # 서버가 아주 긴 Retry-After를 보내도 감시가 몇 시간씩 멈추지 않도록 max_backoff로 자른다
+        if resp is not None and resp.headers.get("Retry-After"):
+            value = resp.headers["Retry-After"]
+            try:
+                return min(self.max_backoff, max(0.0, float(value)))
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(value).timestamp() - time.time()
+                    return min(self.max_backoff, max(0.0, delay))
+                except (TypeError, ValueError):
+                    pass
+        return min(self.max_backoff, self.backoff * (2 ** attempt) + random.uniform(0, self.backoff))
+
+    def fetch(self, url: str) -> FetchResult:
+        """URL 하나 요청 (재시도/조건부 GET/간격 제한 포함)"""
+        started = time.monotonic()
+        host = urlsplit(url).netloc
+        with self._lock:
+            cached = self._validators.get(url)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        status, error = None, None
+        attempt = 0
+        refetched = False
+        while True:
+            self.limiter.wait(host)
+            resp = None
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+                status = resp.status_code
+                if status == 304 and cached:
+                    return FetchResult(url, cached[2], status, True, time.monotonic() - started)
+                if status == 304:
+                    if refetched:
+                        return FetchResult(url, None, status, False, time.monotonic() - started,
+                                           "이전 본문 없이 304를 받았습니다")
+                    # 재사용할 이전 본문이 없으면 304는 쓸 수 없으므로 조건 없이 한 번 더 받는다
+                    # (재시도 횟수에는 세지 않지만 간격 제한은 그대로 지킴)
+                    with self._lock:
+                        self._validators.pop(url, None)
+                    headers = {"Cache-Control": "no-cache"}
+                    refetched = True
+                    continue
+                if status not in RETRY_STATUS:
+                    resp.raise_for_status()
+                    if "charset" not in resp.headers.get("Content-Type", "").lower():
+                        # charset이 없으면 requests는 ISO-8859-1로 읽으므로 한글이 깨진다
+                        resp.encoding = "utf-8"
+                    text = resp.text
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        with self._lock:
+                            self._validators[url] = (etag, last_modified, text)
+                    return FetchResult(url, text, status, False, time.monotonic() - started)
+                error = f"HTTP {status}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            except requests.RequestException as e:
+                # 4xx 등 다시 시도해도 소용없는 오류
+                return FetchResult(url, None, status, False, time.monotonic() - started, str(e))
+            if attempt >= self.retries:
+                return FetchResult(url, None, status, False, time.monotonic() - started, error)
+            time.sleep(self._retry_delay(attempt, resp))
+            attempt += 1
+
+    def fetch_many(self, urls: Iterable[str]) -> List[FetchResult]:
+        """여러 URL을 최대 max_workers개씩 동시에 요청 (결과는 입력 순서대로)"""
+        urls = list(urls)
+        if len(urls) <= 1 or self.max_workers <= 1:
+            return [self.fetch(url) for url in urls]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch")
+        return list(self._executor.map(self.fetch, urls))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_fetcher: Optional[Fetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> Fetcher:
+    """모듈 공용 Fetcher (처음 쓸 때 만듦) - 여러 번 호출해도 연결을 재사용"""
+    global _default_fetcher
+    if _default_fetcher is None:
+        # 여러 스레드가 동시에 처음 호출해도 세션은 하나만 만든다
+        with _default_fetcher_lock:
+            if _default_fetcher is None:
+                _default_fetcher = Fetcher()
+    return _default_fetcher
+
+
+def fetch_html(url: str, headers: Optional[dict] = None, fetcher: Optional[Fetcher] = None) -> Optional[str]:
+    if headers is not None and fetcher is None:
+        # 헤더를 따로 지정하면 그 헤더로 만든 Fetcher 사용
+        with Fetcher(headers=headers) as own:
+            return fetch_html(url, fetcher=own)
+    result = (fetcher or get_fetcher()).fetch(url)
+    if result.text is None:
+        print(f"[ERROR] 요청 실패: {result.error}")
+    return result.text
+
+
+# HTML 파서 우선순위: 설치된 C 파서를 먼저 쓴다. lxml은 html.parser와 같은 트리를 만들고,
+# selectolax(lexbor)는 더 빠르지만 HTML5 규칙대로 tbody 밖의 tr도 tbody로 감싼다 (원본 소스로 보정).
+PARSER_BACKENDS = ("lxml", "selectolax", "html.parser")
+# html.parser(순수 파이썬)로 파싱할 때는 테이블 부분만 트리로 만든다 (스크립트/메뉴 등은 건너뜀)
+TABLE_STRAINER = SoupStrainer("table")
+
+_backend_cache: Dict[str, bool] = {}
+
+
+class ListingRow(NamedTuple):
+    """테이블의 tr 하나를 한 번 훑어 모은 정보"""
+    cells: List[str]                     # td/th 텍스트 (텍스트 조각의 공백을 지우고 이어 붙임)
+    texts: List[str]                     # td/th 텍스트 (조각 사이를 공백 하나로)
+    images: List[Tuple[str, List[str]]]  # img[alt]마다 (alt, 같은 부모 요소 안 span 텍스트들)
+    in_body: bool                        # tbody 안의 행인지
+
+
+class ListingTable(NamedTuple):
+    """파서가 한 번 훑어 만든 테이블 요약 (모든 목록 파서가 이것을 함께 사용)"""
+    headers: List[str]          # th 텍스트
+    rows: List[ListingRow]      # 테이블 안의 모든 tr (문서 순서)
+
+
+def _listing_row(pieces_per_cell: List[List[str]], images: List[Tuple[str, List[str]]],
+                 in_body: bool) -> ListingRow:
+    """셀별 텍스트 조각(공백 제거, 빈 조각 제외)으로 ListingRow 생성"""
+    return ListingRow(["".join(p) for p in pieces_per_cell], [" ".join(p) for p in pieces_per_cell],
+                      images, in_body)
+
+
+def backend_available(name: str) -> bool:
+    """파서 백엔드를 쓸 수 있는지 (설치 여부, 결과는 캐시)"""
+    if name not in _backend_cache:
+        try:
+            if name == "selectolax":
+                importlib.import_module("selectolax.lexbor")
+            elif name == "lxml":
+                importlib.import_module("lxml.html")
+            elif name != "html.parser":
+                return False
+            _backend_cache[name] = True
+        except ImportError:
+            _backend_cache[name] = False
+    return _backend_cache[name]
+
+
+def pick_backend(preferred: Optional[str] = None) -> str:
+    """preferred가 있으면 그것을, 없거나 쓸 수 없으면 PARSER_BACKENDS 중 처음 쓸 수 있는 파서"""
+    if preferred and backend_available(preferred):
+        return preferred
+    if preferred:
+        print(f"[WARN] 파서 '{preferred}'를 쓸 수 없어 기본 파서를 사용합니다.")
+    for name in PARSER_BACKENDS:
+        if backend_available(name):
+            return name
+    return "html.parser"
+
+
+def soup_builder() -> str:
+    """BeautifulSoup이 필요한 경로(카드형 파서)에서 쓸 트리 빌더"""
+    return "lxml" if backend_available("lxml") else "html.parser"
+
+
+_TABLE_OR_TBODY_TAG = re.compile(r"<(/?)(table|tbody)\b", re.I)
+
+
+def _explicit_tbody(html: str) -> List[bool]:
+    """원본 소스의 테이블마다(여는 태그 순서) <tbody>를 직접 적었는지"""
+    flags, stack = [], []
+    for m in _TABLE_OR_TBODY_TAG.finditer(html):
+        closing, tag = m.group(1), m.group(2).lower()
+        if tag == "table":
+            if not closing:
+                stack.append(len(flags))
+                flags.append(False)
+            elif stack:
+                stack.pop()
+        elif not closing and stack:
+            flags[stack[-1]] = True
+    return flags
+
+
+def _tables_selectolax(html: str) -> List[ListingTable]:
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style"])
+    # lexbor는 tbody 없이 적은 tr도 tbody로 감싸므로, 다른 백엔드처럼 원본에 tbody가 있는 테이블만 본문으로 본다
+    tables_found = tree.css("table")
+    explicit = _explicit_tbody(html)
+    if len(explicit) != len(tables_found):
+        # 주석/스크립트 안의 <table> 등으로 짝이 맞지 않으면 문서 전체 기준으로 판단
+        explicit = [bool(re.search(r"<tbody\b", html, re.I))] * len(tables_found)
+
+    def pieces(node):
+        # 텍스트 노드별로 공백을 지운 조각 (bs4 get_text(strip=True)의 조각과 같음)
+        return [t for t in node.text(deep=True, separator="\x00", strip=True).split("\x00") if t]
+
+    has_tbody = {table.mem_id: flag for table, flag in zip(tables_found, explicit)}
+
+    def in_body(tr, table_id):
+        # Node의 ==는 html 문자열을 비교하므로 mem_id로 테이블에 닿았는지 본다
+        node = tr.parent
+        while node is not None and node.mem_id != table_id:
+            if node.tag == "tbody":
+                # tbody를 가진 테이블(안쪽 테이블일 수 있음)의 원본에 tbody가 있었을 때만 본문
+                return node.parent is not None and has_tbody.get(node.parent.mem_id, False)
+            node = node.parent
+        return False
 
+    tables = []
+    for table in tables_found:
+        table_id = table.mem_id
+        rows = []
+        for tr in table.css("tr"):
+            images = [((img.attributes.get("alt") or "").strip(),
+                       ["".join(pieces(sp)) for sp in img.parent.css("span")] if img.parent else [])
+                      for img in tr.css("img[alt]")]
+            rows.append(_listing_row([pieces(c) for c in tr.css("td, th")], images, in_body(tr, table_id)))
+        tables.append(ListingTable(["".join(pieces(th)) for th in table.css("th")], rows))
+    return tables
 
-def try_parse_table(soup: BeautifulSoup, top_n: int) -> List[Dict]:
+
+_lxml_xpaths = {}
+
+
+def _tables_lxml(html: str) -> List[ListingTable]:
+    import lxml.html
+    from lxml import etree
+    if not _lxml_xpaths:
+        _lxml_xpaths.update(
+            text=etree.XPath(".//text()[not(parent::script or parent::style)]"),
+            th=etree.XPath(".//th"),
+            rows=etree.XPath(".//tr"),
+            cells=etree.XPath(".//td|.//th"),
+            images=etree.XPath(".//img[@alt]"),
+            spans=etree.XPath(".//span"),
+        )
+    x = _lxml_xpaths
+    doc = lxml.html.document_fromstring(html)
+
+    def pieces(el):
+        return [t for t in (s.strip() for s in x["text"](el)) if t]
+
+    def in_body(tr, table):
+        el = tr.getparent()
+        while el is not None and el is not table:
+            if el.tag == "tbody":
+                return True
+            el = el.getparent()
+        return False
+
+    tables = []
+    for table in doc.iter("table"):
+        rows = []
+        for tr in x["rows"](table):
+            images = []
+            for img in x["images"](tr):
+                parent = img.getparent()
+                images.append((img.get("alt", "").strip(),
+                               ["".join(pieces(sp)) for sp in x["spans"](parent)] if parent is not None else []))
+            rows.append(_listing_row([pieces(c) for c in x["cells"](tr)], images, in_body(tr, table)))
+        tables.append(ListingTable(["".join(pieces(th)) for th in x["th"](table)], rows))
+    return tables
+
+
+_TABLE_TAG = re.compile(r"<(/?)table\b", re.I)
+
+
+def _table_fragments(html: str) -> str:
+    """html에서 가장 바깥 <table>...</table> 구간만 잘라 이어 붙임 (순수 파이썬 파서의 입력을 줄임)"""
+    parts, depth, start = [], 0, 0
+    for m in _TABLE_TAG.finditer(html):
+        if not m.group(1):
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                end = html.find(">", m.end())
+                parts.append(html[start:end + 1 if end >= 0 else len(html)])
+    if depth:
+        parts.append(html[start:])
+    return "".join(parts)
+
+
+def _tables_soup(soup: BeautifulSoup) -> List[ListingTable]:
+    def pieces(tag):
+        return list(tag.stripped_strings)
+
+    def in_body(tr, table):
+        for parent in tr.parents:
+            if parent is table:
+                return False
+            if parent.name == "tbody":
+                return True
+        return False
+
+    tables = []
+    for table in soup.find_all("table"):
+        rows = []
+        for tr in table.find_all("tr"):
+            images = [((img.get("alt") or "").strip(),
+                       [sp.get_text(strip=True) for sp in img.parent.find_all("span")] if img.parent else [])
+                      for img in tr.find_all("img", alt=True)]
+            rows.append(_listing_row([pieces(c) for c in tr.find_all(["td", "th"])], images, in_body(tr, table)))
+        tables.append(ListingTable([th.get_text(strip=True) for th in table.find_all("th")], rows))
+    return tables
+
+
+def extract_tables(html: str, backend: Optional[str] = None) -> List[ListingTable]:
+    """html의 모든 테이블을 한 번에 훑어 ListingTable 목록으로 만든다"""
+    backend = pick_backend(backend)
+    if backend == "selectolax":
+        return _tables_selectolax(html)
+    if backend == "lxml":
+        return _tables_lxml(html)
+    return _tables_soup(BeautifulSoup(_table_fragments(html), "html.parser", parse_only=TABLE_STRAINER))
+
+
+def try_parse_table(tables, top_n: int) -> List[Dict]:
     """일반적인 테이블 구조에서 코인 목록 파싱 시도
     - 테이블 헤더를 보고 컬럼 매핑을 시도
     - 가능한 정보: rank, name, symbol, price, change, volume, market_cap
+    - tables: extract_tables() 결과 (BeautifulSoup 객체를 넘겨도 됨)
     """
+    if isinstance(tables, BeautifulSoup):
+        tables = _tables_soup(tables)
     results = []
-    tables = soup.find_all("table")
     for table in tables:
         # 헤더 셀 텍스트로 테이블인지 추정
-        headers = [th.get_text(strip=True) for th in table.find_all("th")]
-        headers_text = " ".join(headers).lower()
+        headers_text = " ".join(table.headers).lower()
         if any(k in headers_text for k in ("코인", "coin", "price", "가격", "변동", "change")):
             # 후보 테이블
-            for tr in table.select("tbody tr"):
+            for row in table.rows:
                 if len(results) >= top_n:
                     break
-                cols = [td.get_text(strip=True) for td in tr.find_all(["td", "th"])]
-                if not cols:
+                cols = row.cells
+                if not row.in_body or not cols:
                     continue
                 entry = {"raw": cols}
                 # 간단한 매핑 시도: 첫 열이 순위일 확률
@@ -91,9 +516,11 @@ def try_parse_cards(soup: BeautifulSoup, top_n: int) -> List[Dict]:
     """
     results = []
     # 코인 이름이나 가격을 포함하는 일반적인 클래스 후보
-    candidates = soup.find_all(lambda tag: tag.name in ("div", "li", "tr") and tag.get_text(strip=True))
-    for c in candidates:
+    # (문서 순서대로 보면서 top_n개를 찾으면 멈추므로 뒤쪽 요소의 텍스트는 만들지 않는다)
+    for c in soup.find_all(("div", "li", "tr")):
         text = c.get_text(" ", strip=True)
+        if not text:
+            continue
         if any(k in text for k in ("BTC", "ETH", "코인", "가격", "원", "KRW", "USD")):
             # 간단히 name과 price를 분리하여 저장
             parts = text.split()
@@ -108,171 +535,804 @@ def try_parse_cards(soup: BeautifulSoup, top_n: int) -> List[Dict]:
     return results[:top_n]
 
 
-def try_parse_kimpga(soup: BeautifulSoup, top_n: int) -> List[Dict]:
-    """KIMPGA 특화 파서
-    제공하신 HTML 예시를 기반으로 구현:
-    - 코인 심볼은 <img alt="SYMBOL"> 에 들어있음
-    - 코인 이름은 같은 셀(또는 같은 tr) 안의 span(overflow-ellipsis 등)에 들어있음
-    - 가격/변동은 같은 tr의 다른 td에서 찾아 시도
-    """
-    results: List[Dict] = []
+_NUMBER = re.compile(r"[-+]?\d[\d,]*(?:\.\d+)?")
+_PERCENT = re.compile(r"([-+]?\d[\d,]*(?:\.\d+)?)\s*%")
+_KIMPGA_FIELDS = (
+    ("premium", re.compile(r"김프|프리미엄|premium|kimp", re.I)),
+    ("change", re.compile(r"변동|등락|전일|change", re.I)),
+    ("price", re.compile(r"현재가|가격|시세|price", re.I)),
+)
 
-    # img 태그의 alt 속성(심볼)을 기준으로 후보를 찾는다
-    imgs = soup.find_all("img", alt=True)
-    for img in imgs:
-        if len(results) >= top_n:
-            break
 
-        symbol = img.get("alt", "").strip()
-        if not symbol:
+class KimpgaCoin(TypedDict):
+    """try_parse_kimpga 결과 한 건"""
+    rank: int
+    symbol: str
+    name: Optional[str]
+    price: Optional[Decimal]     # 원화 현재가
+    change: Optional[float]      # 전일 대비 변동률(%)
+    premium: Optional[float]     # 김치 프리미엄(%)
+    raw: str
+
+
+def _to_decimal(text: str) -> Optional[Decimal]:
+    m = _NUMBER.search(text)
+    if not m:
+        return None
+    try:
+        return Decimal(m.group().replace(",", ""))
+    except InvalidOperation:
+        return None
+
+
+def _to_percent(text: str) -> Optional[float]:
+    m = _PERCENT.search(text)
+    return float(m.group(1).replace(",", "")) if m else None
+
+
+def _kimpga_columns(headers: List[str]) -> Dict[str, int]:
+    """헤더 텍스트로 price/change/premium 열 위치 찾기 (못 찾은 필드는 빠짐)"""
+    columns: Dict[str, int] = {}
+    for idx, header in enumerate(headers):
+        for field, pattern in _KIMPGA_FIELDS:
+            if field not in columns and pattern.search(header):
+                columns[field] = idx
+                break
+    return columns
+
+
+def _kimpga_name(symbol: str, spans: List[str]) -> Optional[str]:
+    """img와 같은 컨테이너의 span 중 심볼/아이콘 글자가 아닌 첫 텍스트"""
+    for txt in spans:
+        if not txt or txt.upper() == symbol.upper():
+            continue
+        # 너무 짧은 영문 대문자(아이콘 등) 건너뛰기
+        if len(txt) <= 4 and txt.isupper():
             continue
+        return txt
+    return None
 
-        # 가능한 tr 컨텍스트를 찾는다
-        tr = img.find_parent("tr") or img.find_parent()
-        # 이름 추출: 같은 td/컨테이너 내의 span 중에서 심볼과 다른 텍스트를 선택
-        name = None
-        parent = img.find_parent()
-        spans = parent.find_all("span") if parent else []
-        for sp in spans:
-            txt = sp.get_text(strip=True)
-            if not txt:
-                continue
-            # 심볼(예: USDT)와 동일한 텍스트는 건너뜀
-            if txt.upper() == symbol.upper():
-                continue
-            # 너무 짧은 영문 대문자(아이콘 등) 건너뛰기
-            if len(txt) <= 4 and txt.isupper():
-                continue
-            name = txt
-            break
 
-        # 가격/변동 추정: 같은 tr 내에서 숫자/통화표시를 포함한 td를 찾아본다
-        price = None
-        change = None
-        if tr:
-            tds = tr.find_all("td")
-            for td in tds:
-                txt = td.get_text(" ", strip=True)
-                if not txt:
-                    continue
-                # 가격 패턴 예: 12,345 원 / $12,345 / 12,345.67
-                if re.search(r"\d[\d,\.]+\s*(원|krw|usd|\$)?", txt.replace('\xa0',' '), re.I):
-                    # 가격으로 추정. 첫 발견을 가격으로 사용
-                    if price is None and any(ch.isdigit() for ch in txt):
-                        price = txt
-                        continue
-                # 변동(%) 패턴
-                if re.search(r"[-+]?\d+\.?\d*%", txt):
-                    change = txt
+def try_parse_kimpga(tables, top_n: int) -> List[KimpgaCoin]:
+    """KIMPGA 특화 파서 (iter_kimpga 결과를 목록으로)"""
+    return list(iter_kimpga(tables, top_n))
 
-        entry: Dict = {"symbol": symbol, "name": name or None, "price": price, "change": change, "raw": tr.get_text(" ", strip=True) if tr else parent.get_text(" ", strip=True)}
-        results.append(entry)
 
-    # 일부 중복/잘못 감지된 항목이 있을 수 있으므로 심볼 기준으로 고유화
+def iter_kimpga(tables, top_n: int) -> Iterator[KimpgaCoin]:
+    """KIMPGA 특화 파서 - 행을 하나 파싱할 때마다 바로 내보냄
+    제공하신 HTML 예시를 기반으로 구현:
+    - 코인 심볼은 <img alt="SYMBOL"> 에 들어있음
+    - 코인 이름은 같은 셀(또는 같은 tr) 안의 span(overflow-ellipsis 등)에 들어있음
+    - 가격/변동/김프는 같은 tr의 다른 td에서 찾음 (헤더가 있으면 헤더로 열을 정함)
+    - tables: extract_tables() 결과 (BeautifulSoup 객체를 넘겨도 됨)
+    각 tr은 extract_tables()에서 한 번만 훑었으므로 여기서는 그 결과만 본다.
+    가격은 Decimal, 변동률/김프는 float(%)로 돌려준다.
+    """
+    if isinstance(tables, BeautifulSoup):
+        tables = _tables_soup(tables)
+    count = 0
     seen = set()
-    unique_results: List[Dict] = []
-    for e in results:
-        sym = (e.get("symbol") or "").upper()
-        if not sym or sym in seen:
-            continue
-        seen.add(sym)
-        unique_results.append(e)
-        if len(unique_results) >= top_n:
-            break
+    for table in tables:
+        columns = _kimpga_columns(table.headers)
+        for row in table.rows:
+            if count >= top_n:
+                return
+            if not row.images:
+                continue
+            # 한 행에 아이콘이 여럿이면 alt가 있는 첫 번째를 심볼로 본다
+            symbol, spans = next(((alt, sp) for alt, sp in row.images if alt), ("", []))
+            if not symbol or symbol.upper() in seen:
+                continue
 
-    # 결과에 순위 추가
-    for idx, it in enumerate(unique_results, start=1):
-        it.setdefault("rank", idx)
+            texts = row.texts
+            price = change = premium = None
+            if columns and len(texts) == len(table.headers):
+                if "price" in columns:
+                    price = _to_decimal(texts[columns["price"]])
+                if "change" in columns:
+                    change = _to_percent(texts[columns["change"]])
+                if "premium" in columns:
+                    premium = _to_percent(texts[columns["premium"]])
+            else:
+                # 헤더가 없으면 순서로 추정: 퍼센트가 아닌 첫 숫자가 가격, 퍼센트는 변동 → 김프 순
+                percents = []
+                for idx, txt in enumerate(texts):
+                    if not txt or (idx == 0 and txt.isdigit()) or symbol in txt.split():
+                        continue
+                    pct = _to_percent(txt)
+                    if pct is not None:
+                        percents.append(pct)
+                    elif price is None:
+                        price = _to_decimal(txt)
+                if percents:
+                    change = percents[0]
+                if len(percents) > 1:
+                    premium = percents[1]
 
-    return unique_results[:top_n]
+            seen.add(symbol.upper())
+            count += 1
+            yield KimpgaCoin(rank=count, symbol=symbol, name=_kimpga_name(symbol, spans),
+                             price=price, change=change, premium=premium, raw=" ".join(texts))
 
 
-def get_top_coins(url: str, top_n: int = 20, use_selenium: bool = False, driver_path: Optional[str] = None) -> List[Dict]:
-    """주어진 URL에서 상위 top_n 코인 정보를 반환합니다.
+class BrowserPool:
+    """
+    렌더링용 헤드리스 Chrome(WebDriver) 풀 (여러 번 렌더링하는 용도)
 
-    기본적으로 requests로 시도합니다. 필요하면 use_selenium=True로 렌더링 후 파싱할 수 있습니다.
+    - 드라이버를 띄운 채 재사용 (최대 size개, 필요할 때 만듦)
+    - 빌려줄 때마다 상태 확인(health check)을 하고 응답이 없으면 새로 띄움
+    - 한 드라이버가 max_pages 페이지를 렌더링하면 종료하고 새로 띄움 (메모리 누수 방지)
+    - page_source는 wait_selector(기본: 심볼 이미지가 있는 테이블)가 나타날 때까지 기다린 뒤 읽음
     """
-    html = fetch_html(url)
-    if html is None and use_selenium:
-        html = None  # will try selenium below
 
-    if html is None and use_selenium:
-        # Selenium 사용 시도
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-        except Exception as e:
-            print(f"[ERROR] selenium 모듈을 불러올 수 없습니다: {e}")
-            return []
+    def __init__(self, size: int = 1, driver_path: Optional[str] = None, max_pages: int = 50,
+                 wait_timeout: float = 15.0, wait_selector: str = "table img[alt]"):
+        self.size = max(1, size)
+        self.driver_path = driver_path
+        self.max_pages = max_pages
+        self.wait_timeout = wait_timeout
+        self.wait_selector = wait_selector
+        self._idle = []         # [driver, 렌더링한 페이지 수]
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _create(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
 
         opts = Options()
         opts.add_argument("--headless=new")
         opts.add_argument("--disable-gpu")
         opts.add_argument("--no-sandbox")
-        driver = None
+        # 이미지는 받지 않아도 img alt는 DOM에 남는다
+        opts.add_argument("--blink-settings=imagesEnabled=false")
+        # DOMContentLoaded에서 get()이 돌아오고, 나머지는 명시적 대기로 기다린다
+        opts.page_load_strategy = "eager"
+        service = Service(self.driver_path) if self.driver_path else Service()
+        return webdriver.Chrome(service=service, options=opts)
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _acquire(self) -> list:
+        with self._cond:
+            # close()가 깨우면 빈자리를 기다리지 않고 바로 빠져나와 예외를 낸다
+            while not self._closed and not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError("BrowserPool이 이미 닫혔습니다")
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                self._created += 1
+        if entry is not None:
+            if self._healthy(entry[0]):
+                return entry
+            self._quit(entry[0])
+        try:
+            return [self._create(), 0]
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, entry: list, broken: bool = False) -> None:
+        entry[1] += 1
+        if broken or self._closed or entry[1] >= self.max_pages:
+            self._quit(entry[0])
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def render(self, url: str) -> Optional[str]:
+        """url을 렌더링해 페이지 소스를 반환 (실패하면 None)"""
+        try:
+            from selenium.common.exceptions import TimeoutException
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.support.ui import WebDriverWait
+        except Exception as e:
+            print(f"[ERROR] selenium 모듈을 불러올 수 없습니다: {e}")
+            return None
+
+        try:
+            entry = self._acquire()
+        except Exception as e:
+            print(f"[ERROR] 브라우저를 시작하지 못했습니다: {e}")
+            return None
+        driver = entry[0]
+        broken = False
         try:
-            if driver_path:
-                driver = webdriver.Chrome(executable_path=driver_path, options=opts)
-            else:
-                driver = webdriver.Chrome(options=opts)
             driver.get(url)
-            html = driver.page_source
+            try:
+                WebDriverWait(driver, self.wait_timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.wait_selector)))
+            except TimeoutException:
+                # 구조가 달라 대상이 안 보이는 것일 수 있으니 지금까지 렌더된 소스로 파서들을 시도
+                print(f"[WARN] {self.wait_timeout:.0f}초 안에 '{self.wait_selector}'가 나타나지 않았습니다.")
+            return driver.page_source
         except Exception as e:
+            broken = True
             print(f"[ERROR] Selenium으로 페이지를 로드하지 못했습니다: {e}")
-            if driver:
-                driver.quit()
-            return []
+            return None
         finally:
-            if driver:
-                driver.quit()
+            self._release(entry, broken)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for driver, _ in idle:
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_browser_pools: Dict[Optional[str], BrowserPool] = {}
+_browser_pools_lock = threading.Lock()
+
+
+def get_browser_pool(driver_path: Optional[str] = None) -> BrowserPool:
+    """모듈 공용 BrowserPool (driver_path별로 처음 쓸 때 만들고, 프로세스가 끝날 때 브라우저를 닫음)"""
+    pool = _browser_pools.get(driver_path)
+    if pool is None:
+        # 여러 스레드가 동시에 처음 호출해도 풀(브라우저)은 하나만 만든다
+        with _browser_pools_lock:
+            pool = _browser_pools.get(driver_path)
+            if pool is None:
+                pool = BrowserPool(driver_path=driver_path)
+                atexit.register(pool.close)
+                _browser_pools[driver_path] = pool
+    return pool
+
+
+def render_with_selenium(url: str, driver_path: Optional[str] = None,
+                         browser_pool: Optional[BrowserPool] = None) -> Optional[str]:
+    """헤드리스 Chrome으로 페이지를 렌더링해 소스를 반환 (실패하면 None)
+    browser_pool을 주면 그 풀의 브라우저를 쓰고, 없으면 모듈 공용 풀을 씁니다.
+    """
+    return (browser_pool or get_browser_pool(driver_path)).render(url)
+
+
+def get_top_coins(url: str, top_n: int = 20, use_selenium: bool = False, driver_path: Optional[str] = None,
+                  fetcher: Optional[Fetcher] = None, parser: Optional[str] = None,
+                  browser_pool: Optional[BrowserPool] = None,
+                  on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """주어진 URL에서 상위 top_n 코인 정보를 반환합니다.
+
+    기본적으로 requests로 시도합니다. 필요하면 use_selenium=True로 렌더링 후 파싱할 수 있습니다.
+    fetcher를 주면 그 세션/재시도/간격 설정을 사용합니다 (없으면 모듈 공용 Fetcher).
+    parser로 HTML 파서를 고를 수 있습니다 (기본: 설치된 것 중 lxml > selectolax > html.parser).
+    browser_pool을 주면 Selenium 렌더링에 그 풀의 브라우저를 재사용합니다 (없으면 모듈 공용 풀).
+    on_item을 주면 코인 하나를 파싱할 때마다 그 행으로 호출합니다 (parse_top_coins 참고).
+    """
+    html = fetch_html(url, fetcher=fetcher)
+    if html is None and use_selenium:
+        # Selenium 사용 시도
+        html = render_with_selenium(url, driver_path, browser_pool)
 
     if not html:
         print("[WARN] 페이지 소스를 가져오지 못했습니다.")
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_top_coins(html, top_n, parser, on_item)
 
-    # 1) 테이블 기반 파싱 시도
-    res = try_parse_table(soup, top_n)
-    if res:
-        return res[:top_n]
 
-    # 2) 카드/리스트 기반 파싱 시도
-    res = try_parse_cards(soup, top_n)
+def parse_top_coins(html: str, top_n: int = 20, parser: Optional[str] = None,
+                    on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """페이지 소스에서 상위 top_n 코인 정보를 파싱 (파서들을 순서대로 시도)
+    on_item을 주면 행을 하나 파싱할 때마다 호출합니다 (파일에 바로 쓰는 용도).
+    """
+    results = []
+    for item in iter_top_coins(html, top_n, parser):
+        if on_item is not None:
+            on_item(item)
+        results.append(item)
+    if not results:
+        print("[INFO] 자동 파서로 데이터를 찾지 못했습니다. 페이지 구조가 동적이거나 커스텀 클래스일 수 있습니다.")
+    return results
+
+
+def iter_top_coins(html: str, top_n: int = 20, parser: Optional[str] = None) -> Iterator[Dict]:
+    """parse_top_coins와 같은 순서로 파서들을 시도하며 행을 하나씩 내보냄"""
+    # 테이블은 한 번만 훑어서 목록 파서들이 함께 쓴다
+    tables = extract_tables(html, parser)
+
+    # 1) KIMPGA 구조(img alt 심볼 + 같은 tr의 가격/변동/김프) 파싱 시도 - 행마다 바로 내보냄
+    found = False
+    for coin in iter_kimpga(tables, top_n):
+        found = True
+        yield coin
+    if found:
+        return
+
+    # 2) 일반 테이블 기반 파싱 시도
+    res = try_parse_table(tables, top_n)
     if res:
-        return res[:top_n]
+        yield from res[:top_n]
+        return
 
-    print("[INFO] 자동 파서로 데이터를 찾지 못했습니다. 페이지 구조가 동적이거나 커스텀 클래스일 수 있습니다.")
-    return []
+    # 3) 카드/리스트 기반 파싱 시도 (div/li가 필요하므로 이때만 BeautifulSoup으로 전체를 파싱)
+    yield from try_parse_cards(BeautifulSoup(html, soup_builder()), top_n)[:top_n]
+
+
+class TickStore:
+    """
+    --watch 결과를 SQLite 시계열 테이블(coin_ticks)에 기록
 
+    바뀐 행만 들어오므로 변경 이력이 쌓입니다. 행은 메모리에 모았다가
+    batch_size행이 차거나 flush_interval초가 지나면 한 트랜잭션(executemany)으로 씁니다.
+    """
+
+    CREATE_SQL = (
+        "CREATE TABLE IF NOT EXISTS coin_ticks (\n"
+        "    ts REAL NOT NULL,\n"
+        "    symbol TEXT NOT NULL,\n"
+        "    rank INTEGER,\n"
+        "    name TEXT,\n"
+        "    price TEXT,\n"         # Decimal을 잃지 않도록 문자열로 보관
+        "    change REAL,\n"
+        "    premium REAL,\n"
+        "    removed INTEGER NOT NULL DEFAULT 0\n"
+        ")"
+    )
+    INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_coin_ticks_symbol_ts ON coin_ticks (symbol, ts)"
+    INSERT_SQL = ("INSERT INTO coin_ticks (ts, symbol, rank, name, price, change, premium, removed) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 30.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.conn = sqlite3.connect(path)
+        # 쓰는 동안에도 다른 프로세스가 읽을 수 있게 WAL 사용
+        self.conn.execute("PRAGMA journal_mode = WAL").fetchone()
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self.conn:
+            self.conn.execute(self.CREATE_SQL)
+            self.conn.execute(self.INDEX_SQL)
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def add(self, events: List[Dict]) -> None:
+        for e in events:
+            price = e.get("price")
+            self._pending.append((e["ts"], str(e["key"]), e.get("rank"), e.get("name"),
+                                  None if price is None else str(price), e.get("change"), e.get("premium"),
+                                  1 if e.get("removed") else 0))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """flush_interval초가 지났으면 쌓인 행을 기록 (변화가 없는 tick에도 호출)"""
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            with self.conn:
+                self.conn.executemany(self.INSERT_SQL, self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+class CoinWatcher:
+    """
+    --watch 모드: 같은 Fetcher(세션)로 주기적으로 조회해 이전 스냅샷과 달라진 행만 돌려줌
+
+    - 304(조건부 GET)이거나 본문이 이전과 같으면 파싱하지 않음
+    - 행 키는 symbol (없으면 name, rank), raw는 비교하지 않음
+    - 목록에서 빠진 키는 {"removed": True} 이벤트로 알림
+    - 파싱 결과가 비었거나 이전 행 수의 MIN_KEEP_RATIO보다 적으면 (점검/오류 페이지, 구조 변경)
+      실패한 조회로 보고 이전 스냅샷을 그대로 둠
+    """
+
+    IGNORED_FIELDS = ("raw",)
+    MIN_KEEP_RATIO = 0.5
+
+    def __init__(self, url: str, top_n: int = 20, fetcher: Optional[Fetcher] = None, parser: Optional[str] = None,
+                 use_selenium: bool = False, driver_path: Optional[str] = None,
+                 browser_pool: Optional[BrowserPool] = None):
+        self.url = url
+        self.top_n = top_n
+        self.fetcher = fetcher or get_fetcher()
+        self.parser = parser
+        self.use_selenium = use_selenium
+        self.driver_path = driver_path
+        self.browser_pool = browser_pool
+        self._last_html = None
+        self._snapshot = {}     # key -> 비교용 값 튜플
+
+    @classmethod
+    def _key(cls, item: Dict):
+        return item.get("symbol") or item.get("name") or item.get("rank")
+
+    def poll(self) -> List[Dict]:
+        """한 번 조회해 바뀐 행 이벤트 목록 반환 (실패하거나 바뀐 게 없으면 빈 목록)"""
+        result = self.fetcher.fetch(self.url)
+        html = result.text
+        if html is None:
+            print(f"[ERROR] 요청 실패: {result.error}", file=sys.stderr)
+            if not self.use_selenium:
+                return []
+            with contextlib.redirect_stdout(sys.stderr):
+                html = render_with_selenium(self.url, self.driver_path, self.browser_pool)
+            if not html:
+                return []
+        if result.not_modified or html == self._last_html:
+            return []
+        self._last_html = html
+        # 파서의 안내 메시지가 JSON 출력과 섞이지 않게 stderr로 보냄
+        with contextlib.redirect_stdout(sys.stderr):
+            items = parse_top_coins(html, self.top_n, self.parser)
+        if not items or len(items) < len(self._snapshot) * self.MIN_KEEP_RATIO:
+            # 모든 코인을 removed로 알렸다가 다음 조회에서 다시 새 행으로 알리는 일이 없게 한다
+            print(f"[WARN] 파싱된 행이 {len(items)}개뿐이라 이번 조회는 건너뜁니다 "
+                  f"(이전 {len(self._snapshot)}개).", file=sys.stderr)
+            return []
+        return self.diff(items)
+
+    def diff(self, items: List[Dict]) -> List[Dict]:
+        """스냅샷을 items로 바꾸고, 새로 생기거나 값이 바뀐 행과 빠진 키를 이벤트로 반환"""
+        now = round(time.time(), 3)
+        ignored = self.IGNORED_FIELDS
+        snapshot = {}
+        events = []
+        for item in items:
+            key = self._key(item)
+            if key is None or key in snapshot:
+                continue
+            values = tuple((k, v) for k, v in item.items() if k not in ignored)
+            snapshot[key] = values
+            if self._snapshot.get(key) != values:
+                events.append({"ts": now, "key": key, **dict(values)})
+        for key, values in self._snapshot.items():
+            if key not in snapshot:
+                last = dict(values)
+                events.append({"ts": now, "key": key, "symbol": last.get("symbol"), "name": last.get("name"),
+                               "removed": True})
+        self._snapshot = snapshot
+        return events
+
+    def run(self, interval: float, out=None, store: Optional[TickStore] = None, max_ticks: int = 0,
+            writers: Iterable["RowWriter"] = ()) -> None:
+        """interval초마다 poll하고 이벤트를 JSON 한 줄씩 출력 (max_ticks가 0이면 Ctrl+C까지 반복)
+        store(SQLite)와 writers(csv/jsonl/parquet 파일)가 있으면 같은 이벤트를 함께 기록합니다.
+        """
+        out = out or sys.stdout
+        encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+        ticks = 0
+        next_tick = time.monotonic()
+        try:
+            while True:
+                events = self.poll()
+                if events:
+                    out.write("".join(encoder.encode(e) + "\n" for e in events))
+                    out.flush()
+                    if store is not None:
+                        store.add(events)
+                    for writer in writers:
+                        writer.write(events)
+                for writer in writers:
+                    # parquet은 flush_interval/roll_interval이 지났을 때만 row group을 쓰거나 파일을 닫는다
+                    writer.flush_if_due()
+                if store is not None:
+                    # 이벤트가 끊겨도 모아 둔 행이 flush_interval보다 오래 메모리에 남지 않게
+                    store.flush_if_due()
+                ticks += 1
+                if max_ticks and ticks >= max_ticks:
+                    break
+                # 조회에 걸린 시간을 빼고 기다려 주기가 밀리지 않게 한다
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.monotonic()
+        except KeyboardInterrupt:
+            print("[INFO] 감시를 종료합니다.", file=sys.stderr)
+        finally:
+            if store is not None:
+                store.flush()
+
+
+# 출력 파일의 고정 열 (이 순서로 씀). 파서에 따라 없는 값은 빈 칸(None)
+OUTPUT_COLUMNS = (
+    ("ts", "float"),        # 수집 시각 (epoch 초)
+    ("rank", "int"),
+    ("symbol", "str"),
+    ("name", "str"),
+    ("price", "str"),       # Decimal을 잃지 않도록 문자열
+    ("change", "float"),    # %
+    ("premium", "float"),   # %
+    ("removed", "bool"),    # --watch에서 목록에서 빠진 코인
+    ("raw", "str"),
+)
+OUTPUT_FIELDS = tuple(name for name, _ in OUTPUT_COLUMNS)
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet")
+
+
+def _output_value(value, kind: str):
+    """값 하나를 열 타입에 맞게 변환 (변환할 수 없으면 None)"""
+    if value is None:
+        return False if kind == "bool" else None
+    if kind == "str":
+        if isinstance(value, (list, tuple)):
+            return " ".join(str(v) for v in value)
+        return str(value)
+    if kind == "bool":
+        return bool(value)
+    if isinstance(value, str):
+        # 일반 테이블/카드 파서는 "1,234원", "-1.2%" 같은 문자열을 준다
+        value = _to_percent(value) if "%" in value else _to_decimal(value)
+        if value is None:
+            return None
+    if kind == "int":
+        return int(value)
+    return float(value)
 
-def save_csv(items: List[Dict], path: str) -> None:
+
+def output_row(item: Dict, ts: Optional[float] = None) -> tuple:
+    """파서 결과/감시 이벤트 하나를 OUTPUT_COLUMNS 순서의 튜플로 변환"""
+    return tuple(_output_value(item.get(name, ts) if name == "ts" else item.get(name), kind)
+                 for name, kind in OUTPUT_COLUMNS)
+
+
+class RowWriter:
+    """
+    고정 열(OUTPUT_COLUMNS)로 행을 받는 대로 바로 쓰는 출력 파일 (csv/jsonl/parquet)
+
+    - 형식은 fmt 또는 확장자로 정함
+    - append=True면 기존 파일 뒤에 이어 씀 (csv는 머리글이 같아야 함).
+      Parquet은 이어 쓸 수 없으므로 "이름-1.parquet"처럼 비어 있는 새 파일에 씀
+    - path에 strftime 형식(예: ticks_%Y%m%d.jsonl)이 있으면 이름이 바뀌는 시점에 새 파일로 넘어감 (회전)
+    - csv/jsonl은 write()마다 flush하고, parquet은 row_group행이 차거나 flush_interval초가 지나면
+      모인 만큼 row group으로 씀 (flush_if_due()를 주기적으로 부를 때)
+    - parquet은 닫아야 footer가 써져 읽을 수 있으므로 roll_interval초마다 파일을 닫고
+      "이름-1.parquet"처럼 다음 파일로 넘어감
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, append: bool = False, row_group: int = 10000,
+                 flush_interval: float = 300.0, roll_interval: float = 3600.0):
+        self.pattern = path
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {self.fmt} ({', '.join(OUTPUT_FORMATS)} 중 하나)")
+        self.append = append
+        self.row_group = row_group
+        self.flush_interval = flush_interval
+        self.roll_interval = roll_interval
+        self.path = None        # 지금 쓰고 있는 파일
+        self._name = None       # pattern을 strftime한 이름 (바뀌면 회전)
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._pending = []
+        self._opened_at = self._flushed_at = 0.0
+        self._rolled = False    # 같은 이름으로 다시 열 때 덮어쓰지 않고 번호를 붙임
+
+    def write(self, items: Iterable[Dict], ts: Optional[float] = None) -> int:
+        """items를 고정 열로 변환해 씀 (ts가 없는 행은 ts로 채움). 쓴 행 수 반환"""
+        ts = time.time() if ts is None else ts
+        name = time.strftime(self.pattern, time.localtime(ts)) if "%" in self.pattern else self.pattern
+        if name != self._name:
+            self._close_file()
+            self._rolled = False
+            self._open(name)
+            self._name = name
+        elif self._writer is None:
+            # roll_interval로 닫은 뒤 같은 이름으로 이어 쓰는 경우
+            self._open(name)
+        rows = [output_row(it, ts) for it in items]
+        if not rows:
+            return 0
+        if self.fmt == "parquet":
+            self._pending.extend(rows)
+            if len(self._pending) >= self.row_group:
+                self._flush_parquet()
+        else:
+            if self.fmt == "csv":
+                self._writer.writerows(rows)
+            else:
+                encode = self._writer.encode
+                self._file.write("".join(encode(dict(zip(OUTPUT_FIELDS, row))) + "\n" for row in rows))
+            self._file.flush()
+        self.rows += len(rows)
+        return len(rows)
+
+    def _open(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._opened_at = self._flushed_at = time.monotonic()
+        if self.fmt == "csv":
+            if exists and self.append:
+                with open(path, newline="", encoding="utf-8-sig") as f:
+                    header = next(csv.reader(f), [])
+                if tuple(header) != OUTPUT_FIELDS:
+                    raise ValueError(f"{path}의 머리글이 출력 열과 다릅니다: {header}")
+                # utf-8-sig로 이어 쓰면 BOM이 중간에 다시 들어가므로 utf-8로 연다
+                self._file = open(path, "a", newline="", encoding="utf-8")
+                self._writer = csv.writer(self._file)
+            else:
+                self._file = open(path, "w", newline="", encoding="utf-8-sig")
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(OUTPUT_FIELDS)
+        elif self.fmt == "jsonl":
+            self._file = open(path, "a" if self.append else "w", encoding="utf-8")
+            self._writer = json.JSONEncoder(ensure_ascii=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if exists and (self.append or self._rolled):
+                stem, ext = os.path.splitext(path)
+                n = 1
+                while os.path.exists(f"{stem}-{n}{ext}"):
+                    n += 1
+                path = f"{stem}-{n}{ext}"
+            types = {"float": pa.float64(), "int": pa.int64(), "str": pa.string(), "bool": pa.bool_()}
+            self._schema = pa.schema([(name, types[kind]) for name, kind in OUTPUT_COLUMNS])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        self.path = path
+
+    def _flush_parquet(self) -> None:
+        if not self._pending:
+            return
+        import pyarrow as pa
+        columns = list(zip(*self._pending))
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self._schema)], schema=self._schema))
+        self._pending = []
+        self._flushed_at = time.monotonic()
+
+    def flush_if_due(self) -> None:
+        """parquet: flush_interval초가 지났으면 모인 행을 쓰고, roll_interval초가 지났으면 파일을 닫음"""
+        if self.fmt != "parquet" or self._writer is None:
+            return
+        now = time.monotonic()
+        if now - self._opened_at >= self.roll_interval:
+            self._close_file()
+            self._rolled = True
+        elif self._pending and now - self._flushed_at >= self.flush_interval:
+            self._flush_parquet()
+
+    def _close_file(self) -> None:
+        if self._writer is None:
+            return
+        if self.fmt == "parquet":
+            self._flush_parquet()
+            self._writer.close()
+        else:
+            self._file.close()
+        self._file = self._writer = None
+
+    def close(self) -> None:
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def save_csv(items: List[Dict], path: str, append: bool = False) -> None:
     if not items:
         print("[WARN] 저장할 데이터가 없습니다.")
         return
-    # 모든 키 집합 수집
-    keys = set()
-    for it in items:
-        keys.update(it.keys())
-    keys = list(keys)
-    with open(path, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        for it in items:
-            writer.writerow(it)
+    # 열은 OUTPUT_COLUMNS로 고정 (실행마다 순서가 바뀌지 않음)
+    with RowWriter(path, fmt="csv", append=append) as writer:
+        writer.write(items)
     print(f"[OK] CSV 저장됨: {path}")
 
 
+def open_writers(csv_path: Optional[str], out_path: Optional[str], append: bool = False) -> List[RowWriter]:
+    """--csv(항상 CSV)와 --out(확장자로 형식 결정)에 쓸 RowWriter 목록"""
+    writers = []
+    if csv_path:
+        writers.append(RowWriter(csv_path, fmt="csv", append=append))
+    if out_path:
+        writers.append(RowWriter(out_path, append=append))
+    return writers
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
 def main():
     p = argparse.ArgumentParser(description="KIMPGA 상위 코인 크롤러")
     p.add_argument("--url", default="https://kimpga.com/", help="크롤링 대상 URL")
     p.add_argument("--top", type=int, default=20, help="가져올 상위 개수 (기본 20)")
     p.add_argument("--csv", help="결과를 저장할 CSV 파일 경로")
+    p.add_argument("--out", help="결과를 저장할 파일 경로, 확장자로 형식 결정 (.csv/.jsonl/.parquet). "
+                                 "strftime 형식(예: ticks_%%Y%%m%%d.jsonl)을 넣으면 날짜별로 파일을 나눔")
+    p.add_argument("--append", action="store_true", help="--out/--csv 파일이 있으면 이어서 씀")
     p.add_argument("--selenium", action="store_true", help="Selenium을 사용해 렌더된 페이지를 가져옵니다")
     p.add_argument("--driver", help="Selenium 사용시 브라우저 드라이버 경로(선택)")
+    p.add_argument("--browser-recycle", type=int, default=50,
+                   help="Selenium 브라우저 하나로 렌더링할 페이지 수, 넘으면 새로 띄움 (기본 50)")
+    p.add_argument("--parser", choices=PARSER_BACKENDS,
+                   help="HTML 파서 (기본: 설치된 것 중 lxml > selectolax > html.parser 순)")
+    p.add_argument("--retries", type=int, default=3, help="요청 실패 시 재시도 횟수 (기본 3)")
+    p.add_argument("--timeout", type=float, default=15.0, help="요청 타임아웃(초) (기본 15)")
+    p.add_argument("--min-interval", type=float, default=0.0,
+                   help="같은 호스트에 보내는 요청 사이 최소 간격(초) (기본 0)")
+    p.add_argument("--watch", type=float, metavar="INTERVAL",
+                   help="INTERVAL초마다 계속 조회해 바뀐 행만 JSON 한 줄씩 출력 (Ctrl+C로 종료)")
+    p.add_argument("--ticks", type=int, default=0, help="--watch 시 조회 횟수 (기본 0: 무한)")
+    p.add_argument("--db", help="--watch 시 바뀐 행을 기록할 SQLite 파일 경로 (coin_ticks 테이블)")
+    p.add_argument("--db-batch", type=int, default=200, help="--db에 한 번에 쓰는 행 수 (기본 200)")
     args = p.parse_args()
+    if args.out and os.path.splitext(args.out)[1].lstrip(".").lower() not in OUTPUT_FORMATS:
+        p.error(f"--out 확장자는 {', '.join('.' + f for f in OUTPUT_FORMATS)} 중 하나여야 합니다")
+
+    if args.watch is not None:
+        if args.watch <= 0:
+            p.error("--watch 간격은 0보다 커야 합니다")
+        store = TickStore(args.db, batch_size=args.db_batch) if args.db else None
+        writers = open_writers(args.csv, args.out, args.append)
+        # kill(SIGTERM)로 끝낼 때도 Ctrl+C처럼 정리해 parquet footer와 남은 행을 쓴다
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        with Fetcher(timeout=args.timeout, retries=args.retries, min_interval=args.min_interval) as fetcher, \
+                BrowserPool(driver_path=args.driver, max_pages=args.browser_recycle) as browsers:
+            watcher = CoinWatcher(args.url, args.top, fetcher, args.parser, args.selenium, args.driver, browsers)
+            try:
+                watcher.run(args.watch, store=store, max_ticks=args.ticks, writers=writers)
+            finally:
+                if store is not None:
+                    store.close()
+                for w in writers:
+                    w.close()
+        return
 
-    items = get_top_coins(args.url, top_n=args.top, use_selenium=args.selenium, driver_path=args.driver)
+    # 파일은 파싱되는 행마다 바로 쓴다 (행이 하나도 없으면 파일을 만들지 않음)
+    writers = open_writers(args.csv, args.out, args.append)
+    ts = time.time()
+
+    def write_item(item: Dict) -> None:
+        for w in writers:
+            w.write((item,), ts)
+
+    fetcher = Fetcher(timeout=args.timeout, retries=args.retries, min_interval=args.min_interval)
+    browsers = BrowserPool(driver_path=args.driver, max_pages=args.browser_recycle)
+    try:
+        items = get_top_coins(args.url, top_n=args.top, use_selenium=args.selenium, driver_path=args.driver,
+                              fetcher=fetcher, parser=args.parser, browser_pool=browsers, on_item=write_item)
+    finally:
+        fetcher.close()
+        browsers.close()
+        for w in writers:
+            w.close()
     if not items:
         print("[INFO] 결과가 없습니다. --selenium 옵션을 시도하거나 크롤링 대상의 CSS 셀렉터를 확인하세요.")
         sys.exit(0)
@@ -280,8 +1340,8 @@ def main():
     for i, it in enumerate(items, start=1):
         print(f"{i:2d}: {it}")
 
-    if args.csv:
-        save_csv(items, args.csv)
+    for w in writers:
+        print(f"[OK] 저장됨: {w.path} ({w.rows}행)")
 
 
 if __name__ == "__main__":
@@ -3,56 +3,894 @@ import sqlite3
 import random
 import datetime
 import os
+import csv
+import tempfile
+import threading
+import itertools
+from collections import OrderedDict, namedtuple
 import openpyxl
 from PyQt5 import QtCore, QtWidgets, QtGui
 
+from ProductRepository import MYPROD, ProductRepository, build_match_query
+
 
 DB_PATH = "myprod.db"
+COLUMNS = ["id", "name", "price", "qty"]
+EXPORT_BATCH = 5000
+SAMPLE_ROWS = 100
+SEARCH_DEBOUNCE_MS = 250
+
+
+def create_search_index(conn):
+    """
+    이름 검색용 FTS5 인덱스. 트리거로 MyProd 변경과 동기화한다. 반환값: FTS 사용 가능 여부
+    repo.submit()으로 쓰기 트랜잭션 안에서 실행하므로 여기서는 커밋하지 않는다.
+    (테이블/트리거 SQL은 ProductRepository의 MYPROD 스키마가 만든다)
+    """
+    try:
+        MYPROD.create_fts(conn)
+        return True
+    except sqlite3.Error:
+        # FTS5 미지원 SQLite에서는 LIKE 검색을 사용
+        return False
+
+
+def ensure_sample_data(repo, n):
+    """MyProd가 n건 미만이면 샘플 데이터로 채운다 (insert_many, 한 트랜잭션)"""
+    count = repo.count()
+    if count >= n:
+        return 0
+    rows = [(f"Product {idx:03d}", random.randint(1000, 200000), random.randint(1, 200))
+            for idx in range(count + 1, n + 1)]
+    return repo.insert_many(rows)
+
+
+ProductFilter = namedtuple("ProductFilter", "text price_min price_max qty_min qty_max",
+                           defaults=(None, None, None, None, None))
+
+
+def as_product_filter(product_filter):
+    """None/검색어 문자열/ProductFilter를 ProductFilter로 통일"""
+    if isinstance(product_filter, ProductFilter):
+        return product_filter
+    return ProductFilter(text=product_filter or None)
+
+
+def product_where(product_filter=None, fts_enabled=False):
+    """
+    필터(이름 검색어, 가격/수량 범위)에 해당하는 WHERE 절(앞에 공백 포함)과 파라미터.
+    조건이 없으면 빈 절. 범위 조건은 price/qty 인덱스를 탄다.
+    """
+    flt = as_product_filter(product_filter)
+    conds, params = [], []
+    if flt.text and fts_enabled:
+        conds.append(MYPROD.fts_condition)
+        params.append(build_match_query(flt.text))
+    elif flt.text:
+        conds.append("name LIKE ?")
+        params.append(f"%{flt.text}%")
+    for col, op, value in (("price", ">=", flt.price_min), ("price", "<=", flt.price_max),
+                           ("qty", ">=", flt.qty_min), ("qty", "<=", flt.qty_max)):
+        if value is not None:
+            conds.append(f"{col} {op} ?")
+            params.append(value)
+    if not conds:
+        return "", ()
+    return " WHERE " + " AND ".join(conds), tuple(params)
+
+
+def product_order(sort_column=0, descending=False):
+    """정렬 열 + id(동률 처리) ORDER BY 절"""
+    col = COLUMNS[sort_column]
+    direction = "DESC" if descending else "ASC"
+    if col == "id":
+        return f" ORDER BY id {direction}"
+    return f" ORDER BY {col} {direction}, id {direction}"
+
+
+def product_query(product_filter=None, fts_enabled=False, sort_column=0, descending=False):
+    """목록/내보내기 공용 SELECT 문과 파라미터"""
+    where, params = product_where(product_filter, fts_enabled)
+    return f"SELECT id, name, price, qty FROM MyProd{where}" + product_order(sort_column, descending), params
+
+
+def seek_condition(sort_column, descending, key):
+    """
+    product_order() 정렬에서 key(어떤 행의 (정렬값, id))보다 뒤에 오는 행의 조건과 파라미터.
+    SQLite는 NULL을 오름차순에서 맨 앞, 내림차순에서 맨 뒤에 두므로
+    (열, id) 행 값 비교(NULL과 비교하면 거짓)만으로는 NULL 행이 빠지지 않게 따로 처리한다.
+    """
+    col = COLUMNS[sort_column]
+    value, key_id = key
+    if col == "id":
+        return f"id {'<' if descending else '>'} ?", [key_id]
+    if descending:
+        if value is None:
+            return f"({col} IS NULL AND id < ?)", [key_id]
+        return f"(({col}, id) < (?, ?) OR {col} IS NULL)", [value, key_id]
+    if value is None:
+        return f"({col} IS NOT NULL OR id > ?)", [key_id]
+    return f"({col}, id) > (?, ?)", [value, key_id]
+
+
+def product_page_query(product_filter, fts_enabled, sort_column, descending, page_size,
+                       after_key=None, offset=0):
+    """
+    정렬/필터가 적용된 한 페이지 SELECT 문과 파라미터.
+    after_key(직전 페이지 마지막 행의 (정렬값, id))가 있으면 그 다음부터(키셋), 없으면 OFFSET.
+    """
+    where, params = product_where(product_filter, fts_enabled)
+    order = product_order(sort_column, descending)
+    sql = f"SELECT id, name, price, qty FROM MyProd{where}"
+    if after_key is not None:
+        seek, seek_params = seek_condition(sort_column, descending, after_key)
+        sql += (" AND " if where else " WHERE ") + seek
+        return sql + order + " LIMIT ?", list(params) + seek_params + [page_size]
+    return sql + order + " LIMIT ? OFFSET ?", list(params) + [page_size, offset]
+
+
+def export_rows(repo, path, fmt, sql, params=(), progress=None, cancelled=None):
+    """
+    MyProd 조회 결과를 EXPORT_BATCH행씩 읽어 파일로 바로 씁니다 (메모리에 전체를 올리지 않음).
+
+    fmt: "xlsx"(openpyxl write-only), "csv", "parquet"(pyarrow 필요)
+    progress(done, total): 배치마다 호출, cancelled(): True를 돌려주면 중단
+    같은 폴더의 임시 파일에 쓰고 끝까지 성공했을 때만 path로 바꿔 놓으므로(os.replace)
+    취소나 오류가 나도 path에 있던 기존 파일은 그대로 남고 반쯤 쓴 파일도 남지 않습니다.
+    반환값: 쓴 행 수, 취소되면 None
+    """
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)") from None
+    elif fmt not in ("xlsx", "csv"):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".export-", suffix="." + fmt,
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        with repo.reader() as conn:
+            (total,) = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()
+            cur = conn.execute(sql, params)
+            batches = iter(lambda: cur.fetchmany(EXPORT_BATCH), [])
+
+            if fmt == "xlsx":
+                wb = openpyxl.Workbook(write_only=True)
+                ws = wb.create_sheet()
+                ws.append(COLUMNS)
+
+                def write_batch(rows):
+                    for row in rows:
+                        ws.append(row)
+
+                def finish():
+                    wb.save(tmp_path)
+
+                def abort():
+                    # write-only 시트는 저장해야 닫히고 openpyxl 임시 파일도 정리된다 (결과는 버림)
+                    try:
+                        wb.save(tmp_path)
+                    except Exception:
+                        pass
+            elif fmt == "csv":
+                f = open(tmp_path, "w", newline="", encoding="utf-8-sig")
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                write_batch = writer.writerows
+                finish = abort = f.close
+            else:
+                schema = pa.schema([("id", pa.int64()), ("name", pa.string()),
+                                    ("price", pa.int64()), ("qty", pa.int64())])
+                pw = pq.ParquetWriter(tmp_path, schema)
+
+                def write_batch(rows):
+                    columns = list(zip(*rows))
+                    pw.write_table(pa.Table.from_arrays(
+                        [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                        schema=schema))
+
+                finish = abort = pw.close
+
+            done = 0
+            finished = False
+            try:
+                for rows in batches:
+                    if cancelled and cancelled():
+                        return None
+                    write_batch(rows)
+                    done += len(rows)
+                    if progress:
+                        progress(done, total)
+                finish()
+                finished = True
+            finally:
+                # 취소/오류로 빠져나갈 때도 파일 핸들은 닫는다 (임시 파일은 아래에서 지움)
+                if not finished:
+                    abort()
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return done
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+IMPORT_HEADERS = {
+    "name": ("name", "제품명", "이름"),
+    "price": ("price", "가격"),
+    "qty": ("qty", "quantity", "수량"),
+}
+
+
+def read_import_rows(path):
+    """
+    CSV/xlsx 파일을 한 행씩 읽는 제너레이터 (xlsx는 openpyxl read-only 모드).
+    반환값: (예상 전체 행 수, (줄 번호, 값 리스트) 제너레이터)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        ws = wb.active
+        total = ws.max_row or 0
+
+        def rows():
+            try:
+                for line, values in enumerate(ws.iter_rows(values_only=True), start=1):
+                    yield line, list(values)
+            finally:
+                wb.close()
+        return total, rows()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            total = sum(1 for _ in f)
+
+        def rows():
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                yield from enumerate(csv.reader(f), start=1)
+        return total, rows()
+    raise ValueError(f"지원하지 않는 형식입니다: {ext}")
+
+
+def _to_int(value):
+    """가격/수량 값 변환: 정수, 정수인 실수, '12,000' 같은 문자열 허용. 실패하면 None"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    try:
+        return int(str(value).strip().replace(",", ""))
+    except ValueError:
+        return None
+
+
+def validate_batch(batch, columns):
+    """
+    한 배치를 열 단위로 검사한다. columns: {"name": 열 번호, "price": ..., "qty": ...}
+    반환값: (통과한 (name, price, qty) 리스트, 거부된 (줄 번호, 원래 값, 사유) 리스트)
+    """
+    lines = [line for line, _ in batch]
+    raw = [values for _, values in batch]
+
+    def column(key):
+        i = columns[key]
+        return [values[i] if i < len(values) else None for values in raw]
+
+    names = [str(v).strip() if v is not None else "" for v in column("name")]
+    prices = [_to_int(v) for v in column("price")]
+    qtys = [_to_int(v) for v in column("qty")]
+
+    good, rejected = [], []
+    for line, values, name, price, qty in zip(lines, raw, names, prices, qtys):
+        if not name:
+            rejected.append((line, values, "제품명 없음"))
+        elif price is None or qty is None:
+            rejected.append((line, values, "가격/수량이 정수가 아님"))
+        else:
+            good.append((name, price, qty))
+    return good, rejected
+
+
+def write_reject_report(path, rejected):
+    """거부된 행을 '<파일명>_rejected.csv'에 사유와 함께 저장하고 그 경로를 돌려준다"""
+    report = os.path.splitext(path)[0] + "_rejected.csv"
+    with open(report, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason", "values"])
+        for line, values, reason in rejected:
+            writer.writerow([line, reason] + ["" if v is None else v for v in values])
+    return report
+
+
+_import_seq = itertools.count(1)
+
+
+def import_rows(repo, path, progress=None, cancelled=None, batch_size=EXPORT_BATCH):
+    """
+    CSV/xlsx 파일을 읽어 검사한 뒤 MyProd에 한 트랜잭션으로 넣는다.
+    첫 행에 name/price/qty(또는 제품명/가격/수량) 머리글이 있으면 그 열을 쓰고,
+    없으면 1~3열을 name, price, qty로 본다.
+
+    파일 읽기와 검사는 호출한 스레드에서 하고, 통과한 행은 batch_size행씩 쓰기 연결의
+    TEMP 테이블에 모은다 (한 배치를 쓰는 동안 다음 배치를 검사). 다 읽으면 INSERT ... SELECT
+    한 번으로 MyProd에 옮기므로, 그 전까지는 다른 연결에 보이지 않고 중간에 취소/실패하거나
+    프로세스가 죽어도 MyProd에는 아무것도 남지 않는다.
+
+    거부된 행이 있으면 원본 옆에 '<파일명>_rejected.csv'로 사유와 함께 저장한다.
+    반환값: (넣은 행 수, 거부된 행 수, 거부 보고서 경로 또는 None, 보고서 저장 오류 또는 None),
+    취소되면 None
+    """
+    total, rows = read_import_rows(path)
+    columns = {"name": 0, "price": 1, "qty": 2}
+    stage = f"import_stage_{next(_import_seq)}"
+    stage_insert = f"INSERT INTO temp.{stage} (name, price, qty) VALUES (?, ?, ?)"
+    rejected = []
+    pending = None      # 쓰기 스레드에서 처리 중인 배치
+    done = 0
+
+    def submit(good):
+        nonlocal pending
+        if pending is not None:
+            pending.result()
+        pending = repo.submit(lambda conn: conn.executemany(stage_insert, good)) if good else None
+
+    def drop_stage():
+        # 실패해도 TEMP 테이블은 쓰기 연결에만 있고 MyProd에는 들어가지 않았다
+        try:
+            repo.submit(lambda conn: conn.execute(f"DROP TABLE IF EXISTS temp.{stage}")).result()
+        except Exception:
+            pass
+
+    def publish(conn):
+        count = conn.execute(f"INSERT INTO MyProd (name, price, qty) "
+                             f"SELECT name, price, qty FROM temp.{stage} ORDER BY rowid").rowcount
+        conn.execute(f"DROP TABLE temp.{stage}")
+        return count
+
+    repo.submit(lambda conn: conn.execute(
+        f"CREATE TEMP TABLE {stage} (name TEXT, price INTEGER, qty INTEGER)")).result()
+    try:
+        batch = []
+        for line, values in rows:
+            if line == 1:
+                header = [str(v).strip().lower() if v is not None else "" for v in values]
+                found = {key: header.index(alias) for key, aliases in IMPORT_HEADERS.items()
+                         for alias in aliases if alias in header}
+                if "name" in found:
+                    columns.update(found)
+                    done += 1
+                    continue
+            if not any(v not in (None, "") for v in values):
+                done += 1
+                continue
+            batch.append((line, values))
+            if len(batch) >= batch_size:
+                if cancelled and cancelled():
+                    submit(None)
+                    drop_stage()
+                    return None
+                good, bad = validate_batch(batch, columns)
+                submit(good)
+                rejected.extend(bad)
+                done += len(batch)
+                batch = []
+                if progress:
+                    progress(done, total)
+        if batch:
+            good, bad = validate_batch(batch, columns)
+            submit(good)
+            rejected.extend(bad)
+        submit(None)
+        if cancelled and cancelled():
+            drop_stage()
+            return None
+        inserted = repo.submit(publish).result()
+    except Exception:
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass
+        drop_stage()
+        raise
+    finally:
+        # 캐시된 전체 개수 등은 더 이상 맞지 않는다
+        repo.clear_cache()
+    if progress:
+        progress(total, total)
+
+    # 행은 이미 저장되었으므로 보고서를 못 써도 가져오기는 되돌리지 않고 오류만 알린다
+    report = report_error = None
+    if rejected:
+        try:
+            report = write_reject_report(path, rejected)
+        except OSError as e:
+            report_error = str(e)
+    return inserted, len(rejected), report, report_error
+
+
+class ProductTableModel(QtCore.QAbstractTableModel):
+    """
+    MyProd 테이블을 필요한 만큼만 읽어 보여주는 모델
+
+    - canFetchMore/fetchMore로 스크롤할 때 PAGE_SIZE행씩 rowCount를 늘린다
+    - 실제 행 데이터는 페이지 단위 LRU 캐시(MAX_PAGES)에만 두므로 메모리가 일정하다
+    - 정렬/필터는 SQL(ORDER BY/WHERE)로 처리하고, 페이지는 직전 페이지의
+      마지막 (정렬값, id) 다음부터 읽는다(키셋). 멀리 건너뛴 페이지만 OFFSET을 쓴다
+    - 캐시에 없는 페이지는 스레드 풀의 PageTask로 읽고, 그동안 그 행은 빈 칸으로 그린다.
+      페이지가 도착하면 dataChanged로 다시 그린다 (GUI 스레드는 쿼리를 기다리지 않음)
+    """
+    PAGE_SIZE = 200
+    MAX_PAGES = 20
+
+    page_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, repo, fts_enabled=False, parent=None, thread_pool=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.fts_enabled = fts_enabled
+        self.thread_pool = thread_pool or QtCore.QThreadPool.globalInstance()
+        self.product_filter = ProductFilter()
+        self.sort_column = 0
+        self.sort_order = QtCore.Qt.AscendingOrder
+        self._total = 0
+        self._loaded = 0
+        self._pages = OrderedDict()
+        self._page_keys = {}
+        # 읽는 중인 페이지 -> 요청 번호. 캐시를 버리면 비우고, 번호가 다른 결과는 버린다
+        self._pending = {}
+        self._requests = itertools.count(1)
+        self._running = set()
+
+    # ---- 조회 조건 ----
+
+    def set_filter(self, product_filter):
+        self.product_filter = as_product_filter(product_filter)
+        self.refresh()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if not 0 <= column < len(COLUMNS):
+            return
+        self.sort_column = column
+        self.sort_order = order
+        # 정렬만 바뀌면 행 수는 같으므로 COUNT 없이 캐시만 비우고 다시 읽는다
+        self.beginResetModel()
+        self._clear_pages()
+        self._loaded = min(self._total, self.PAGE_SIZE)
+        self.endResetModel()
+
+    def refresh(self):
+        """조건을 유지한 채 처음부터 다시 읽기"""
+        self.beginResetModel()
+        self._reload()
+        self.endResetModel()
+
+    def _reload(self):
+        self._clear_pages()
+        where, params = product_where(self.product_filter, self.fts_enabled)
+        (self._total,) = self.repo.query_one(f"SELECT COUNT(*) FROM MyProd{where}", params)
+        self._loaded = min(self._total, self.PAGE_SIZE)
+
+    # ---- 페이지 캐시 ----
+
+    def _clear_pages(self):
+        self._pages.clear()
+        self._page_keys.clear()
+        self._pending.clear()
+
+    def _request_page(self, page):
+        """캐시에 없는 페이지를 스레드 풀에서 읽도록 예약 (이미 읽는 중이면 그대로 둠)"""
+        if page in self._pending:
+            return
+        desc = self.sort_order == QtCore.Qt.DescendingOrder
+        key = self._page_keys.get(page - 1) if page > 0 else None
+        sql, params = product_page_query(self.product_filter, self.fts_enabled, self.sort_column, desc,
+                                         self.PAGE_SIZE, after_key=key, offset=page * self.PAGE_SIZE)
+        request = next(self._requests)
+        task = PageTask(request, page, self.repo, sql, params)
+        task.signals.loaded.connect(self._on_page_loaded)
+        task.signals.failed.connect(self._on_page_failed)
+        # 풀에서 도는 동안 파이썬 객체가 사라지지 않게 끝날 때까지 참조를 잡아 둔다
+        task.signals.finished.connect(self._running.discard)
+        self._running.add(task)
+        self._pending[page] = request
+        self.thread_pool.start(task)
+
+    def _on_page_loaded(self, request, page, rows):
+        if self._pending.get(page) == request:
+            del self._pending[page]
+            self._store_page(page, rows)
+        # 늦게 온 결과는 버리고, 그 구간을 다시 그리게 해 지금 조건으로 다시 요청되게 한다
+        first = page * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, self._loaded) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(COLUMNS) - 1))
+
+    def _on_page_failed(self, request, page, message):
+        if self._pending.get(page) == request:
+            del self._pending[page]
+            self.page_failed.emit(message)
+
+    def _store_page(self, page, rows):
+        if rows:
+            last = rows[-1]
+            self._page_keys[page] = (last[self.sort_column], last[0])
+        self._pages[page] = rows
+        while len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+        return rows
+
+    # ---- 백그라운드 검색 결과 반영 ----
+
+    def show_first_page(self, product_filter, rows):
+        """
+        검색 워커가 보낸 첫 페이지로 화면을 바꾼다. 전체 개수는 아직 모르므로
+        이 페이지만 보여 주고, set_total()이 오면 나머지를 스크롤로 불러올 수 있다.
+        """
+        self.beginResetModel()
+        self.product_filter = as_product_filter(product_filter)
+        self._clear_pages()
+        self._store_page(0, rows)
+        self._total = self._loaded = len(rows)
+        self.endResetModel()
+
+    def set_total(self, total):
+        """검색 워커가 보낸 전체 개수 반영 (이후 fetchMore로 더 불러옴)"""
+        self._total = max(total, self._loaded)
+
+    # ---- 한 행 단위 반영 (전체 다시 읽기 없이) ----
+
+    def _sort_key(self, row):
+        return row[self.sort_column], row[0]
+
+    def _matches(self, prod_id):
+        """현재 필터에 해당 id가 포함되는지"""
+        where, params = product_where(self.product_filter, self.fts_enabled)
+        sql = f"SELECT 1 FROM MyProd{where}" + (" AND " if where else " WHERE ") + "id = ?"
+        return self.repo.query_one(sql, list(params) + [prod_id]) is not None
+
+    def _position(self, row):
+        """현재 정렬에서 row보다 앞에 오는 행 수 (캐시에 있으면 캐시에서 찾음)"""
+        for page, rows in self._pages.items():
+            for offset, cached in enumerate(rows):
+                if cached[0] == row[0]:
+                    return page * self.PAGE_SIZE + offset
+        where, params = product_where(self.product_filter, self.fts_enabled)
+        # row보다 앞에 오는 행 = 정렬 방향을 뒤집었을 때 row 뒤에 오는 행
+        cond, cond_params = seek_condition(self.sort_column, self.sort_order != QtCore.Qt.DescendingOrder,
+                                           self._sort_key(row))
+        sql = f"SELECT COUNT(*) FROM MyProd{where}" + (" AND " if where else " WHERE ") + cond
+        return self.repo.query_one(sql, list(params) + cond_params)[0]
+
+    def _invalidate_from(self, page):
+        """page 이후의 캐시/키셋 위치를 버림 (행이 밀리거나 당겨졌을 때, 읽는 중인 페이지 결과도 버림)"""
+        for p in [p for p in self._pages if p >= page]:
+            del self._pages[p]
+        for p in [p for p in self._page_keys if p >= page]:
+            del self._page_keys[p]
+        for p in [p for p in self._pending if p >= page]:
+            del self._pending[p]
+
+    def insert_product(self, row):
+        """
+        DB에 새로 들어간 행을 정렬 위치에 끼워 넣는다.
+        반환값: 화면 행 번호, 필터에 안 맞거나 아직 불러오지 않은 구간이면 None
+        """
+        if not self._matches(row[0]):
+            return None
+        pos = self._position(row)
+        self._total += 1
+        # 이미 불러온 구간 안이거나, 전부 불러온 상태에서 맨 끝에 붙는 경우만 화면에 추가
+        if pos < self._loaded or self._loaded == self._total - 1:
+            self.beginInsertRows(QtCore.QModelIndex(), pos, pos)
+            self._loaded += 1
+            self._invalidate_from(pos // self.PAGE_SIZE)
+            self.endInsertRows()
+            return pos
+        return None
+
+    def remove_product(self, row):
+        """DB에서 지운 행(삭제 전 값)을 화면에서 뺀다"""
+        pos = self._position(row)
+        self._total -= 1
+        if pos < self._loaded:
+            self.beginRemoveRows(QtCore.QModelIndex(), pos, pos)
+            self._loaded -= 1
+            self._invalidate_from(pos // self.PAGE_SIZE)
+            self.endRemoveRows()
+
+    def update_product(self, old_row, new_row):
+        """
+        수정된 행을 반영한다. 정렬 위치와 필터 포함 여부가 그대로면 그 자리에서 값만 바꾸고,
+        아니면 빼고 새 위치에 넣는다. 반환값: 새 화면 행 번호 또는 None
+        """
+        if self._sort_key(old_row) == self._sort_key(new_row) and self._matches(new_row[0]):
+            pos = self._position(old_row)
+            page, offset = divmod(pos, self.PAGE_SIZE)
+            rows = self._pages.get(page)
+            if rows is not None and offset < len(rows):
+                rows[offset] = tuple(new_row)
+            # 수정 전에 요청해 둔 페이지 결과는 옛 값이므로 버린다 (다시 그릴 때 새로 요청)
+            self._pending.pop(page, None)
+            self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(COLUMNS) - 1))
+            return pos
+        self.remove_product(old_row)
+        return self.insert_product(new_row)
+
+    def row_data(self, row):
+        """
+        화면 행 번호의 (id, name, price, qty). 범위를 벗어나면 None,
+        그 페이지를 아직 읽는 중이어도 None (읽기를 예약하고 기다리지 않음)
+        """
+        if not 0 <= row < self._loaded:
+            return None
+        page, offset = divmod(row, self.PAGE_SIZE)
+        rows = self._pages.get(page)
+        if rows is None:
+            self._request_page(page)
+            return None
+        self._pages.move_to_end(page)
+        return rows[offset] if offset < len(rows) else None
+
+    # ---- QAbstractTableModel ----
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._loaded < self._total
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        n = min(self.PAGE_SIZE, self._total - self._loaded)
+        if n <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + n - 1)
+        self._loaded += n
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            row = self.row_data(index.row())
+            return None if row is None else str(row[index.column()])
+        if role == QtCore.Qt.TextAlignmentRole and index.column() != 1:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+
+class PageSignals(QtCore.QObject):
+    loaded = QtCore.pyqtSignal(int, int, list)          # request, page, rows
+    failed = QtCore.pyqtSignal(int, int, str)           # request, page, message
+    finished = QtCore.pyqtSignal(object)                # task (참조 해제용)
+
+
+class PageTask(QtCore.QRunnable):
+    """ProductTableModel의 한 페이지를 스레드 풀에서 읽는다 (repo의 읽기 연결 사용)"""
+
+    def __init__(self, request, page, repo, sql, params):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = PageSignals()
+        self.request = request
+        self.page = page
+        self.repo = repo
+        self.sql = sql
+        self.params = params
+
+    def run(self):
+        try:
+            rows = self.repo.query(self.sql, self.params)
+        except (sqlite3.Error, TimeoutError, RuntimeError) as e:
+            self.signals.failed.emit(self.request, self.page, str(e))
+        else:
+            self.signals.loaded.emit(self.request, self.page, rows)
+        finally:
+            self.signals.finished.emit(self)
+
+
+class SearchSignals(QtCore.QObject):
+    first_page = QtCore.pyqtSignal(int, object, list)   # generation, product_filter, rows
+    total = QtCore.pyqtSignal(int, int)                 # generation, total
+    failed = QtCore.pyqtSignal(int, str)
+    finished = QtCore.pyqtSignal(object)                # task (참조 해제용)
+
+
+class SearchTask(QtCore.QRunnable):
+    """
+    검색 한 번을 스레드 풀에서 실행한다 (자체 SQLite 연결 사용).
+    첫 페이지를 먼저 보내고 전체 개수를 나중에 보낸다. cancel()이 불리면
+    진행 중인 쿼리를 sqlite3 interrupt()로 끊고 결과를 보내지 않는다.
+    """
+
+    def __init__(self, generation, repo, product_filter, fts_enabled, sort_column, descending, page_size):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = SearchSignals()
+        self.generation = generation
+        self.repo = repo
+        self.product_filter = product_filter
+        self.fts_enabled = fts_enabled
+        self.sort_column = sort_column
+        self.descending = descending
+        self.page_size = page_size
+        self._cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def run(self):
+        try:
+            if self._cancelled:
+                return
+            with self.repo.reader() as conn:
+                with self._lock:
+                    self._conn = conn
+                try:
+                    self._search(conn)
+                finally:
+                    # 연결을 풀에 돌려주기 전에 놓아 다른 작업의 쿼리를 끊지 않게 한다
+                    with self._lock:
+                        self._conn = None
+        except (sqlite3.Error, TimeoutError) as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.generation, str(e))
+        finally:
+            self.signals.finished.emit(self)
+
+    def _search(self, conn):
+        sql, params = product_page_query(self.product_filter, self.fts_enabled, self.sort_column,
+                                         self.descending, self.page_size)
+        rows = conn.execute(sql, params).fetchall()
+        if self._cancelled:
+            return
+        self.signals.first_page.emit(self.generation, self.product_filter, rows)
+        if len(rows) < self.page_size:
+            total = len(rows)
+        else:
+            where, params = product_where(self.product_filter, self.fts_enabled)
+            (total,) = conn.execute(f"SELECT COUNT(*) FROM MyProd{where}", params).fetchone()
+        if not self._cancelled:
+            self.signals.total.emit(self.generation, total)
+
+
+class StartupWorker(QtCore.QThread):
+    """스키마 확인과 샘플 데이터 채우기를 창을 띄운 뒤 백그라운드에서 실행"""
+    ready = QtCore.pyqtSignal(bool)     # FTS 사용 가능 여부
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, repo, sample_rows, parent=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.sample_rows = sample_rows
+
+    def run(self):
+        try:
+            self.repo.ensure_schema()
+            # 새 DB라면 색인 트리거가 생기기 전에 채우고 색인은 한 번에 만든다
+            ensure_sample_data(self.repo, self.sample_rows)
+            fts_enabled = self.repo.submit(create_search_index).result()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.ready.emit(fts_enabled)
+
+
+class ImportWorker(QtCore.QThread):
+    """import_rows를 백그라운드 스레드에서 실행 (읽기/검사는 이 스레드, TEMP 테이블 적재는 repo의 쓰기 스레드)"""
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(int, int, object, object)   # 넣은 행, 거부된 행, 보고서 경로, 보고서 저장 오류
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, repo, path, parent=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.path = path
+
+    def run(self):
+        try:
+            result = import_rows(self.repo, self.path, progress=self.progress.emit,
+                                 cancelled=self.isInterruptionRequested)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if result is None:
+            self.cancelled.emit()
+        else:
+            self.done.emit(*result)
+
+
+class ExportWorker(QtCore.QThread):
+    """export_rows를 백그라운드 스레드에서 실행 (repo의 읽기 연결 하나를 빌려 씀)"""
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(int)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, repo, path, fmt, sql, params, parent=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.path = path
+        self.fmt = fmt
+        self.sql = sql
+        self.params = params
+
+    def run(self):
+        try:
+            count = export_rows(self.repo, self.path, self.fmt, self.sql, self.params,
+                                progress=self.progress.emit,
+                                cancelled=self.isInterruptionRequested)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if count is None:
+            self.cancelled.emit()
+        else:
+            self.done.emit(count)
 
 
 class MyProdApp(QtWidgets.QWidget):
-    def __init__(self):
+    def __init__(self, sample_rows=SAMPLE_ROWS):
         super().__init__()
         self.setWindowTitle("MyProd 헬스케어 제품 관리")
         self.resize(800, 600)
 
-        self.conn = sqlite3.connect(DB_PATH)
-        self.create_table()
-        self.ensure_sample_data(100)
+        # 읽기 연결 풀 + 쓰기 스레드 + 캐시 (ProductRepository 공용 계층)
+        self.repo = ProductRepository(DB_PATH, MYPROD)
+        self.fts_enabled = False
+        self.current_filter = None
+        self.export_worker = None
+        self.import_worker = None
+        self.search_pool = QtCore.QThreadPool(self)
+        self.search_pool.setMaxThreadCount(2)
+        self.search_generation = 0
+        self.search_task = None
+        self.running_searches = set()
 
+        # 창은 바로 띄우고, DB 준비가 끝나면 첫 페이지를 불러온다
         self.create_ui()
-        self.load_data()
-
-    def create_table(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS MyProd (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                price INTEGER,
-                qty INTEGER
-            )
-            """
-        )
-        self.conn.commit()
-
-    def ensure_sample_data(self, n):
-        cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM MyProd")
-        (count,) = cur.fetchone()
-        if count >= n:
-            return
+        self.set_ready(False)
+        self.startup_worker = StartupWorker(self.repo, sample_rows, self)
+        self.startup_worker.ready.connect(self.on_startup_ready)
+        self.startup_worker.failed.connect(self.on_startup_failed)
+        self.startup_worker.start()
 
-        # Insert up to n sample rows
-        to_add = n - count
-        for i in range(1, to_add + 1):
-            idx = count + i
-            name = f"Product {idx:03d}"
-            price = random.randint(1000, 200000)
-            qty = random.randint(1, 200)
-            cur.execute("INSERT INTO MyProd (name, price, qty) VALUES (?, ?, ?)", (name, price, qty))
-        self.conn.commit()
+    def set_ready(self, ready):
+        for w in [self.add_btn, self.update_btn, self.delete_btn, self.import_btn, self.export_btn,
+                  self.search_btn, self.search_edit, self.reset_filter_btn] + self.range_edits:
+            w.setEnabled(ready)
+        self.status_label.setText("" if ready else "데이터베이스 준비 중...")
+        self.status_label.setVisible(not ready)
+
+    def on_startup_ready(self, fts_enabled):
+        self.fts_enabled = fts_enabled
+        self.model.fts_enabled = fts_enabled
+        self.set_ready(True)
+        self.search_products()
+
+    def on_startup_failed(self, message):
+        self.status_label.setText("데이터베이스 준비 실패")
+        QtWidgets.QMessageBox.critical(self, "오류", f"데이터베이스를 준비하지 못했습니다:\n{message}")
 
     def create_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -89,6 +927,8 @@ class MyProdApp(QtWidgets.QWidget):
         self.update_btn.setObjectName("updateBtn")
         self.delete_btn = QtWidgets.QPushButton("삭제")
         self.delete_btn.setObjectName("deleteBtn")
+        self.import_btn = QtWidgets.QPushButton("가져오기")
+        self.import_btn.setObjectName("importBtn")
         self.export_btn = QtWidgets.QPushButton("엑셀 내보내기")
         self.export_btn.setObjectName("exportBtn")
         self.search_edit = QtWidgets.QLineEdit()
@@ -98,6 +938,7 @@ class MyProdApp(QtWidgets.QWidget):
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.update_btn)
         btn_layout.addWidget(self.delete_btn)
+        btn_layout.addWidget(self.import_btn)
         btn_layout.addWidget(self.export_btn)
         btn_layout.addStretch()
         btn_layout.addWidget(self.search_edit)
@@ -105,18 +946,54 @@ class MyProdApp(QtWidgets.QWidget):
 
         layout.addLayout(btn_layout)
 
+        # 범위 필터 (SQL WHERE로 처리)
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.range_edits = []
+        for label, attr in (("가격", "price"), ("수량", "qty")):
+            min_edit = QtWidgets.QLineEdit()
+            max_edit = QtWidgets.QLineEdit()
+            for edit, hint in ((min_edit, "최소"), (max_edit, "최대")):
+                edit.setPlaceholderText(hint)
+                edit.setValidator(QtGui.QIntValidator(edit))
+                edit.setMaximumWidth(110)
+                self.range_edits.append(edit)
+            setattr(self, f"{attr}_min_edit", min_edit)
+            setattr(self, f"{attr}_max_edit", max_edit)
+            filter_layout.addWidget(QtWidgets.QLabel(f"{label}:"))
+            filter_layout.addWidget(min_edit)
+            filter_layout.addWidget(QtWidgets.QLabel("~"))
+            filter_layout.addWidget(max_edit)
+        self.reset_filter_btn = QtWidgets.QPushButton("필터 초기화")
+        self.reset_filter_btn.setObjectName("resetFilterBtn")
+        filter_layout.addWidget(self.reset_filter_btn)
+        filter_layout.addStretch()
+
+        layout.addLayout(filter_layout)
+
         # Table
-        self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["id", "name", "price", "qty"])
+        self.model = ProductTableModel(self.repo, self.fts_enabled, self, thread_pool=self.search_pool)
+        self.model.page_failed.connect(self.on_page_failed)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
+        # 헤더 클릭 정렬: 뷰가 model.sort()를 부르고, 모델이 ORDER BY로 다시 읽는다
+        self.table.horizontalHeader().setSortIndicator(0, QtCore.Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        # 행 높이를 고정해 두면 뷰가 행마다 크기를 계산하지 않는다
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
 
         layout.addWidget(self.table)
 
+        self.status_label = QtWidgets.QLabel()
+        self.status_label.setObjectName("statusLabel")
+        layout.addWidget(self.status_label)
+
         # Styling (QSS)
         qss = """
         QWidget { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #f7f9fc, stop:1 #e8f0f8); font-family: 'Segoe UI', Arial; }
@@ -126,10 +1003,12 @@ class MyProdApp(QtWidgets.QWidget):
         QPushButton#updateBtn { background-color: #f39c12; }
         QPushButton#deleteBtn { background-color: #c0392b; }
         QPushButton#searchBtn { background-color: #2980b9; }
+        QPushButton#importBtn { background-color: #16a085; }
         QPushButton#exportBtn { background-color: #8e44ad; }
-        QTableWidget { background: white; gridline-color: #ecf0f1; border: 1px solid #dfe6ee; }
+        QPushButton#resetFilterBtn { background-color: #7f8c8d; }
+        QTableView { background: white; gridline-color: #ecf0f1; border: 1px solid #dfe6ee; }
         QHeaderView::section { background-color: #34495e; color: white; padding: 4px; }
-        QTableWidget::item:selected { background-color: #3498db; color: white; }
+        QTableView::item:selected { background-color: #3498db; color: white; }
         """
         self.setStyleSheet(qss)
 
@@ -137,27 +1016,32 @@ class MyProdApp(QtWidgets.QWidget):
         self.add_btn.clicked.connect(self.add_product)
         self.update_btn.clicked.connect(self.update_product)
         self.delete_btn.clicked.connect(self.delete_product)
+        self.import_btn.clicked.connect(self.import_products)
         self.export_btn.clicked.connect(self.export_to_excel)
         self.search_btn.clicked.connect(self.search_products)
-        self.table.itemSelectionChanged.connect(self.on_table_select)
+        # 입력이 멈춘 뒤 SEARCH_DEBOUNCE_MS 지나면 검색 (타이핑 중에는 DB를 건드리지 않음)
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_products)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        for edit in self.range_edits:
+            edit.textChanged.connect(self.search_timer.start)
+        self.reset_filter_btn.clicked.connect(self.reset_filters)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_changed)
+        self.table.selectionModel().currentRowChanged.connect(self.on_table_select)
 
     def load_data(self, filter_text=None):
-        cur = self.conn.cursor()
-        if filter_text:
-            like = f"%{filter_text}%"
-            cur.execute("SELECT id, name, price, qty FROM MyProd WHERE name LIKE ? ORDER BY id", (like,))
-        else:
-            cur.execute("SELECT id, name, price, qty FROM MyProd ORDER BY id")
-        rows = cur.fetchall()
-
-        self.table.setRowCount(len(rows))
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row):
-                item = QtWidgets.QTableWidgetItem(str(val))
-                if c == 0:
-                    # id column, make it uneditable-looking
-                    item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
-                self.table.setItem(r, c, item)
+        product_filter = as_product_filter(filter_text)
+        self.current_filter = product_filter
+        self.model.set_filter(product_filter)
+
+    def selected_row(self):
+        """현재 선택된 행의 (id, name, price, qty), 선택이 없으면 None"""
+        index = self.table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.model.row_data(index.row())
 
     def validate_inputs(self):
         name = self.name_edit.text().strip()
@@ -177,91 +1061,224 @@ class MyProdApp(QtWidgets.QWidget):
         if not v:
             return
         name, price, qty = v
-        cur = self.conn.cursor()
-        cur.execute("INSERT INTO MyProd (name, price, qty) VALUES (?, ?, ?)", (name, price, qty))
-        self.conn.commit()
-        self.load_data()
+        prod_id = self.repo.insert(name, price, qty)
+        self.model.insert_product((prod_id, name, price, qty))
         self.clear_inputs()
 
     def update_product(self):
-        sel = self.table.currentRow()
-        if sel < 0:
+        row = self.selected_row()
+        if row is None:
             QtWidgets.QMessageBox.information(self, "선택 필요", "수정하려는 항목을 선택하세요.")
             return
-        id_item = self.table.item(sel, 0)
-        if id_item is None:
-            return
-        prod_id = int(id_item.text())
+        prod_id = row[0]
         v = self.validate_inputs()
         if not v:
             return
         name, price, qty = v
-        cur = self.conn.cursor()
-        cur.execute("UPDATE MyProd SET name=?, price=?, qty=? WHERE id=?", (name, price, qty, prod_id))
-        self.conn.commit()
-        self.load_data()
+        self.repo.update(prod_id, name, price, qty)
+        pos = self.model.update_product(row, (prod_id, name, price, qty))
+        if pos is not None:
+            self.select_row_keep_scroll(pos)
+        else:
+            # 필터에서 빠졌거나 아직 불러오지 않은 위치로 옮겨진 경우
+            self.table.clearSelection()
         self.clear_inputs()
 
     def delete_product(self):
-        sel = self.table.currentRow()
-        if sel < 0:
+        row = self.selected_row()
+        if row is None:
             QtWidgets.QMessageBox.information(self, "선택 필요", "삭제하려는 항목을 선택하세요.")
             return
-        id_item = self.table.item(sel, 0)
-        if id_item is None:
-            return
-        prod_id = int(id_item.text())
+        prod_id = row[0]
         reply = QtWidgets.QMessageBox.question(self, '삭제 확인', f'ID {prod_id} 항목을 삭제하시겠습니까?',
                                                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
         if reply == QtWidgets.QMessageBox.Yes:
-            cur = self.conn.cursor()
-            cur.execute("DELETE FROM MyProd WHERE id=?", (prod_id,))
-            self.conn.commit()
-            self.load_data()
+            self.repo.delete(prod_id)
+            self.model.remove_product(row)
             self.clear_inputs()
 
+    def select_row_keep_scroll(self, row):
+        # 선택만 옮기고 현재 스크롤 위치는 그대로 둔다
+        bar = self.table.verticalScrollBar()
+        value = bar.value()
+        self.table.selectRow(row)
+        bar.setValue(value)
+
+    def current_filter_inputs(self):
+        """검색어와 범위 입력칸으로 ProductFilter 생성 (빈 칸은 조건 없음)"""
+        def value(edit):
+            text = edit.text().strip()
+            try:
+                return int(text) if text else None
+            except ValueError:
+                return None
+        return ProductFilter(self.search_edit.text().strip() or None,
+                             value(self.price_min_edit), value(self.price_max_edit),
+                             value(self.qty_min_edit), value(self.qty_max_edit))
+
+    def reset_filters(self):
+        for edit in [self.search_edit] + self.range_edits:
+            edit.blockSignals(True)
+            edit.clear()
+            edit.blockSignals(False)
+        self.search_products()
+
+    def on_sort_changed(self, *args):
+        # 정렬 전 조건으로 돌던 검색이 있으면 새 정렬로 다시 시작한다
+        if self.search_task is not None:
+            self.search_products()
+
     def search_products(self):
-        txt = self.search_edit.text().strip()
-        self.load_data(filter_text=txt if txt else None)
+        self.search_timer.stop()
+        product_filter = self.current_filter_inputs()
+        # 이전 검색이 아직 돌고 있으면 끊고, 늦게 도착한 결과는 세대 번호로 버린다
+        if self.search_task is not None:
+            self.search_task.cancel()
+        self.search_generation += 1
+        task = SearchTask(self.search_generation, self.repo, product_filter, self.fts_enabled,
+                          self.model.sort_column, self.model.sort_order == QtCore.Qt.DescendingOrder,
+                          ProductTableModel.PAGE_SIZE)
+        task.signals.first_page.connect(self.on_search_first_page)
+        task.signals.total.connect(self.on_search_total)
+        task.signals.failed.connect(self.on_search_failed)
+        # 풀에서 도는 동안 파이썬 객체가 사라지지 않게 끝날 때까지 참조를 잡아 둔다
+        task.signals.finished.connect(self.running_searches.discard)
+        self.running_searches.add(task)
+        self.search_task = task
+        self.search_pool.start(task)
+
+    def on_search_first_page(self, generation, product_filter, rows):
+        if generation != self.search_generation:
+            return
+        self.current_filter = product_filter
+        self.model.show_first_page(product_filter, rows)
+
+    def on_search_total(self, generation, total):
+        if generation != self.search_generation:
+            return
+        self.model.set_total(total)
+        self.search_task = None
+
+    def on_search_failed(self, generation, message):
+        if generation != self.search_generation:
+            return
+        self.search_task = None
+        QtWidgets.QMessageBox.warning(self, "검색 오류", f"검색 중 오류가 발생했습니다:\n{message}")
+
+    def on_page_failed(self, message):
+        # 스크롤할 때마다 뜨는 대화상자 대신 상태 줄에 알린다 (다시 그리면 그 페이지를 다시 요청)
+        self.status_label.setText(f"목록을 불러오지 못했습니다: {message}")
+        self.status_label.setVisible(True)
 
     def export_to_excel(self):
+        if self.export_worker is not None:
+            QtWidgets.QMessageBox.information(self, "진행 중", "내보내기가 이미 진행 중입니다.")
+            return
         # Build default filename with timestamp
         ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         default_name = os.path.join(os.getcwd(), f"myprod_export_{ts}.xlsx")
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "엑셀로 저장", default_name, "Excel Files (*.xlsx)")
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "내보내기", default_name,
+            "Excel Files (*.xlsx);;CSV Files (*.csv);;Parquet Files (*.parquet)")
         if not path:
             return
-        try:
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            # headers
-            headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-            ws.append(headers)
-            # rows
-            for r in range(self.table.rowCount()):
-                row_vals = []
-                for c in range(self.table.columnCount()):
-                    item = self.table.item(r, c)
-                    row_vals.append(item.text() if item is not None else "")
-                ws.append(row_vals)
-            wb.save(path)
-            QtWidgets.QMessageBox.information(self, "완료", f"엑셀 파일로 저장했습니다:\n{path}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "오류", f"엑셀 저장 중 오류가 발생했습니다:\n{e}")
+        ext = os.path.splitext(path)[1].lower().lstrip(".")
+        fmt = ext if ext in ("xlsx", "csv", "parquet") else "xlsx"
+
+        # 현재 검색 조건 그대로 DB에서 직접 읽어 백그라운드로 기록한다
+        sql, params = product_query(self.current_filter, self.fts_enabled, self.model.sort_column,
+                                    self.model.sort_order == QtCore.Qt.DescendingOrder)
+        self.export_progress = QtWidgets.QProgressDialog("내보내는 중...", "취소", 0, 100, self)
+        self.export_progress.setWindowTitle("내보내기")
+        self.export_progress.setWindowModality(QtCore.Qt.WindowModal)
+        self.export_progress.setAutoClose(False)
+        self.export_progress.setAutoReset(False)
+        self.export_progress.setMinimumDuration(0)
+
+        worker = ExportWorker(self.repo, path, fmt, sql, params, self)
+        worker.progress.connect(self.on_export_progress)
+        worker.done.connect(lambda n: self.on_export_finished(
+            "완료", f"{n:,}행을 저장했습니다:\n{path}"))
+        worker.failed.connect(lambda msg: self.on_export_finished(
+            "오류", f"내보내기 중 오류가 발생했습니다:\n{msg}", error=True))
+        worker.cancelled.connect(lambda: self.on_export_finished("취소", "내보내기를 취소했습니다."))
+        worker.finished.connect(worker.deleteLater)
+        self.export_progress.canceled.connect(worker.requestInterruption)
+        self.export_worker = worker
+        worker.start()
+
+    def on_export_progress(self, done, total):
+        self.export_progress.setMaximum(max(total, 1))
+        self.export_progress.setValue(done)
+        self.export_progress.setLabelText(f"내보내는 중... {done:,} / {total:,}")
+
+    def on_export_finished(self, title, message, error=False):
+        self.export_worker = None
+        self.export_progress.close()
+        if error:
+            QtWidgets.QMessageBox.critical(self, title, message)
+        else:
+            QtWidgets.QMessageBox.information(self, title, message)
+
+    def import_products(self):
+        if self.import_worker is not None:
+            QtWidgets.QMessageBox.information(self, "진행 중", "가져오기가 이미 진행 중입니다.")
+            return
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "제품 목록 가져오기", os.getcwd(), "Product Lists (*.csv *.xlsx);;All Files (*)")
+        if not path:
+            return
+
+        self.import_progress = QtWidgets.QProgressDialog("가져오는 중...", "취소", 0, 100, self)
+        self.import_progress.setWindowTitle("가져오기")
+        self.import_progress.setWindowModality(QtCore.Qt.WindowModal)
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setAutoReset(False)
+        self.import_progress.setMinimumDuration(0)
+
+        worker = ImportWorker(self.repo, path, self)
+        worker.progress.connect(self.on_import_progress)
+        worker.done.connect(self.on_import_done)
+        worker.failed.connect(lambda msg: self.on_import_finished(
+            "오류", f"가져오기 중 오류가 발생했습니다 (변경 내용은 취소됨):\n{msg}", error=True))
+        worker.cancelled.connect(lambda: self.on_import_finished(
+            "취소", "가져오기를 취소했습니다. 변경 내용은 저장되지 않았습니다."))
+        worker.finished.connect(worker.deleteLater)
+        self.import_progress.canceled.connect(worker.requestInterruption)
+        self.import_worker = worker
+        worker.start()
+
+    def on_import_progress(self, done, total):
+        self.import_progress.setMaximum(max(total, 1))
+        self.import_progress.setValue(done)
+        self.import_progress.setLabelText(f"가져오는 중... {done:,} / {total:,}")
+
+    def on_import_done(self, inserted, rejected, report, report_error):
+        message = f"{inserted:,}행을 가져왔습니다."
+        if report_error:
+            message += f"\n거부된 행 {rejected:,}개의 보고서를 저장하지 못했습니다:\n{report_error}"
+        elif rejected:
+            message += f"\n거부된 행 {rejected:,}개는 다음 파일에 기록했습니다:\n{report}"
+        self.on_import_finished("완료", message, error=bool(report_error))
+        # 새 행이 들어왔으니 현재 검색 조건으로 다시 불러온다
+        self.search_products()
+
+    def on_import_finished(self, title, message, error=False):
+        self.import_worker = None
+        self.import_progress.close()
+        if error:
+            QtWidgets.QMessageBox.critical(self, title, message)
+        else:
+            QtWidgets.QMessageBox.information(self, title, message)
 
-    def on_table_select(self):
-        sel = self.table.currentRow()
-        if sel < 0:
+    def on_table_select(self, *args):
+        row = self.selected_row()
+        if row is None:
             return
-        name_item = self.table.item(sel, 1)
-        price_item = self.table.item(sel, 2)
-        qty_item = self.table.item(sel, 3)
-        if name_item:
-            self.name_edit.setText(name_item.text())
-        if price_item:
-            self.price_edit.setText(price_item.text())
-        if qty_item:
-            self.qty_edit.setText(qty_item.text())
+        _, name, price, qty = row
+        self.name_edit.setText(str(name))
+        self.price_edit.setText(str(price))
+        self.qty_edit.setText(str(qty))
 
     def clear_inputs(self):
         self.name_edit.clear()
@@ -269,8 +1286,18 @@ class MyProdApp(QtWidgets.QWidget):
         self.qty_edit.clear()
 
     def closeEvent(self, event):
+        self.startup_worker.wait()
+        if self.import_worker is not None:
+            self.import_worker.requestInterruption()
+            self.import_worker.wait()
+        if self.search_task is not None:
+            self.search_task.cancel()
+        self.search_pool.waitForDone()
+        if self.export_worker is not None:
+            self.export_worker.requestInterruption()
+            self.export_worker.wait()
         try:
-            self.conn.close()
+            self.repo.close()
         except Exception:
             pass
         event.accept()
@@ -0,0 +1,216 @@
+"""
+kimpga_top20.BrowserPool 테스트
+
+kimpga_fixtures/ 폴더를 로컬 HTTP 서버로 띄우고, 실제 Chrome 대신 그 서버에서
+페이지를 받아 오는 가짜 드라이버를 풀에 넣어 재사용/교체/동시 사용 제한/종료를 확인합니다.
+(selenium 모듈은 필요하지만 Chrome과 chromedriver는 필요 없습니다)
+
+실행:
+    python -m unittest test_kimpga_browser_pool -v
+"""
+
+import functools
+import os
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+import kimpga_top20 as kimpga
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kimpga_fixtures")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class FakeDriver:
+    """WebDriver 흉내: get()은 실제로 HTTP로 받아 오고, find_element는 CSS 선택자로 찾음"""
+
+    def __init__(self, delay: float = 0.0, routes=None):
+        self.delay = delay
+        self.routes = routes or {}
+        self.source = ""
+        self.dead = False
+        self.quitted = False
+        self.pages = 0
+
+    def get(self, url):
+        if self.dead:
+            raise WebDriverException("브라우저가 응답하지 않습니다")
+        time.sleep(self.delay)
+        with urllib.request.urlopen(self.routes.get(url, url)) as resp:
+            self.source = resp.read().decode("utf-8")
+        self.pages += 1
+
+    def find_element(self, by, selector):
+        if BeautifulSoup(self.source, "html.parser").select_one(selector) is None:
+            raise NoSuchElementException(selector)
+        return object()
+
+    @property
+    def page_source(self):
+        return self.source
+
+    def execute_script(self, script):
+        if self.dead:
+            raise WebDriverException("브라우저가 응답하지 않습니다")
+        return 1
+
+    def quit(self):
+        self.quitted = True
+
+
+class BrowserPoolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        handler = functools.partial(QuietHandler, directory=FIXTURES_DIR)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def make_pool(self, delay: float = 0.0, routes=None, **kwargs) -> kimpga.BrowserPool:
+        pool = kimpga.BrowserPool(wait_timeout=kwargs.pop("wait_timeout", 2), **kwargs)
+        self.drivers = []
+
+        def create():
+            driver = FakeDriver(delay, routes)
+            self.drivers.append(driver)
+            return driver
+
+        pool._create = create
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_render_reuses_driver(self):
+        pool = self.make_pool(max_pages=10)
+        for _ in range(3):
+            html = pool.render(f"{self.base}/kimpga_main.html")
+            self.assertIn("<table", html)
+        self.assertEqual(len(self.drivers), 1)
+        self.assertEqual(self.drivers[0].pages, 3)
+
+    def test_parse_rendered_page(self):
+        # 정적 요청은 404이고, 브라우저로 열면 시세 테이블이 보이는 페이지
+        url = f"{self.base}/rendered.html"
+        pool = self.make_pool(routes={url: f"{self.base}/kimpga_main.html"})
+        items = kimpga.get_top_coins(url, 3, use_selenium=True,
+                                     fetcher=kimpga.Fetcher(retries=0), browser_pool=pool)
+        self.assertEqual(len(self.drivers), 1)
+        self.assertEqual(len(items), 3)
+
+    def test_recycle_after_max_pages(self):
+        pool = self.make_pool(max_pages=2)
+        for _ in range(5):
+            pool.render(f"{self.base}/kimpga_main.html")
+        self.assertEqual(len(self.drivers), 3)
+        self.assertTrue(all(d.quitted for d in self.drivers[:2]))
+        self.assertFalse(self.drivers[2].quitted)
+
+    def test_unhealthy_driver_replaced(self):
+        pool = self.make_pool()
+        pool.render(f"{self.base}/kimpga_main.html")
+        self.drivers[0].dead = True
+        html = pool.render(f"{self.base}/kimpga_main.html")
+        self.assertIn("<table", html)
+        self.assertEqual(len(self.drivers), 2)
+        self.assertTrue(self.drivers[0].quitted)
+
+    def test_failed_load_discards_driver(self):
+        pool = self.make_pool()
+        pool.render(f"{self.base}/kimpga_main.html")
+        self.drivers[0].get = lambda url: (_ for _ in ()).throw(WebDriverException("크래시"))
+        self.assertIsNone(pool.render(f"{self.base}/kimpga_main.html"))
+        self.assertTrue(self.drivers[0].quitted)
+        self.assertEqual(pool._created, 0)
+
+    def test_wait_timeout_returns_source(self):
+        pool = self.make_pool(wait_timeout=0.3)
+        # 심볼 이미지 테이블이 없는 페이지도 기다린 뒤 지금까지의 소스를 돌려준다
+        html = pool.render(f"{self.base}/kimpga_no_header.html")
+        self.assertIsNotNone(html)
+        self.assertEqual(len(self.drivers), 1)
+        self.assertFalse(self.drivers[0].quitted)
+
+    def test_concurrency_limited_to_size(self):
+        pool = self.make_pool(delay=0.05, size=2, max_pages=100)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.render(f"{self.base}/kimpga_main.html")))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r and "<table" in r for r in results))
+        self.assertLessEqual(len(self.drivers), 2)
+        self.assertEqual(pool._created, len(pool._idle))
+
+    def test_close_wakes_waiter(self):
+        pool = self.make_pool(size=1)
+        entry = pool._acquire()
+        errors = []
+
+        def waiter():
+            try:
+                pool._acquire()
+            except RuntimeError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.1)
+        self.assertTrue(t.is_alive())
+        pool.close()
+        t.join(2)
+        self.assertFalse(t.is_alive())
+        self.assertEqual(len(errors), 1)
+        # 닫힌 뒤 돌려받은 드라이버는 종료된다
+        pool._release(entry)
+        self.assertTrue(entry[0].quitted)
+        self.assertEqual(pool._created, 0)
+
+    def test_get_browser_pool_shared_per_driver_path(self):
+        old = dict(kimpga._browser_pools)
+        kimpga._browser_pools.clear()
+        try:
+            found = []
+            threads = [threading.Thread(target=lambda: found.append(kimpga.get_browser_pool("/opt/chromedriver")))
+                       for _ in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len({id(p) for p in found}), 1)
+            self.assertEqual(found[0].driver_path, "/opt/chromedriver")
+            # 다른 드라이버 경로를 주면 그 경로로 만든 풀을 돌려준다 (첫 호출의 경로를 그대로 쓰지 않음)
+            other = kimpga.get_browser_pool("/usr/bin/chromedriver")
+            self.assertIsNot(other, found[0])
+            self.assertEqual(other.driver_path, "/usr/bin/chromedriver")
+        finally:
+            kimpga._browser_pools.clear()
+            kimpga._browser_pools.update(old)
+
+    def test_acquire_after_close_raises(self):
+        pool = self.make_pool()
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool._acquire()
+        self.assertIsNone(pool.render(f"{self.base}/kimpga_main.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
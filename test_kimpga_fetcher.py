@@ -0,0 +1,208 @@
+"""
+kimpga_top20.Fetcher 테스트
+
+로컬 HTTP 서버를 띄워 응답(상태 코드, ETag/Last-Modified, Retry-After)을 경로별로 정해 두고
+재시도/백오프, Retry-After 상한, 조건부 GET(304), 호스트별 간격 제한을 확인합니다.
+
+실행:
+    python -m unittest test_kimpga_fetcher -v
+"""
+
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import kimpga_top20 as kimpga
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """server.routes[path](handler, n)이 (상태, 헤더 dict, 본문 bytes)를 돌려줌 (n: 그 경로의 요청 순번)"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), time.monotonic()))
+            n = sum(1 for path, _, _ in server.requests if path == self.path)
+        route = server.routes.get(self.path)
+        status, headers, body = route(self, n) if route else (404, {}, b"not found")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+def html(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+class FetcherTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.requests = []
+        cls.server.routes = {}
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.routes.clear()
+        with self.server.lock:
+            self.server.requests.clear()
+
+    def route(self, path, fn):
+        self.server.routes[path] = fn
+        return self.base + path
+
+    def requests_to(self, path):
+        with self.server.lock:
+            return [(headers, ts) for p, headers, ts in self.server.requests if p == path]
+
+    def make_fetcher(self, **kwargs):
+        kwargs.setdefault("backoff", 0.01)
+        fetcher = kimpga.Fetcher(**kwargs)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_utf8_without_charset(self):
+        url = self.route("/plain", lambda h, n: (200, {"Content-Type": "text/html"}, html("비트코인")))
+        result = self.make_fetcher().fetch(url)
+        self.assertEqual(result.text, "비트코인")
+        self.assertEqual(result.status, 200)
+        self.assertFalse(result.not_modified)
+
+    def test_etag_conditional_get(self):
+        def etag(h, n):
+            if h.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}, html("첫 본문")
+        url = self.route("/etag", etag)
+        fetcher = self.make_fetcher()
+        first = fetcher.fetch(url)
+        second = fetcher.fetch(url)
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.status, 304)
+        self.assertEqual(second.text, "첫 본문")
+        self.assertEqual(self.requests_to("/etag")[1][0].get("If-None-Match"), '"v1"')
+
+    def test_last_modified_conditional_get(self):
+        stamp = formatdate(usegmt=True)
+
+        def modified(h, n):
+            if h.headers.get("If-Modified-Since") == stamp:
+                return 304, {}, b""
+            return 200, {"Last-Modified": stamp}, html("본문")
+        url = self.route("/lm", modified)
+        fetcher = self.make_fetcher()
+        fetcher.fetch(url)
+        self.assertTrue(fetcher.fetch(url).not_modified)
+
+    def test_304_without_cached_body_refetches(self):
+        url = self.route("/quirk", lambda h, n: (304, {}, b"") if n == 1 else (200, {}, html("다시 받은 본문")))
+        result = self.make_fetcher(retries=0, min_interval=0.2).fetch(url)
+        self.assertEqual(result.text, "다시 받은 본문")
+        reqs = self.requests_to("/quirk")
+        self.assertEqual(len(reqs), 2)
+        # 다시 받을 때도 같은 호스트 간격 제한을 지킨다
+        self.assertGreaterEqual(reqs[1][1] - reqs[0][1], 0.15)
+
+    def test_repeated_304_without_cached_body_fails(self):
+        url = self.route("/always304", lambda h, n: (304, {}, b""))
+        result = self.make_fetcher(retries=2).fetch(url)
+        self.assertIsNone(result.text)
+        self.assertEqual(result.status, 304)
+        self.assertTrue(result.error)
+        self.assertEqual(len(self.requests_to("/always304")), 2)
+
+    def test_retry_on_5xx_then_success(self):
+        url = self.route("/flaky", lambda h, n: (503, {}, b"busy") if n < 3 else (200, {}, html("ok")))
+        result = self.make_fetcher(retries=3).fetch(url)
+        self.assertEqual(result.text, "ok")
+        self.assertEqual(len(self.requests_to("/flaky")), 3)
+
+    def test_retries_exhausted(self):
+        url = self.route("/down", lambda h, n: (502, {}, b"bad gateway"))
+        result = self.make_fetcher(retries=2).fetch(url)
+        self.assertIsNone(result.text)
+        self.assertEqual(result.error, "HTTP 502")
+        self.assertEqual(len(self.requests_to("/down")), 3)
+
+    def test_client_error_not_retried(self):
+        url = self.route("/missing", lambda h, n: (404, {}, b"nope"))
+        result = self.make_fetcher(retries=3).fetch(url)
+        self.assertIsNone(result.text)
+        self.assertEqual(result.status, 404)
+        self.assertEqual(len(self.requests_to("/missing")), 1)
+
+    def test_retry_after_capped_by_max_backoff(self):
+        url = self.route("/limited", lambda h, n: (429, {"Retry-After": "3600"}, b"") if n == 1
+                         else (200, {}, html("ok")))
+        started = time.monotonic()
+        result = self.make_fetcher(retries=1, max_backoff=0.2).fetch(url)
+        elapsed = time.monotonic() - started
+        self.assertEqual(result.text, "ok")
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 2.0)
+
+    def test_retry_delay(self):
+        fetcher = self.make_fetcher(backoff=1.0, max_backoff=5.0)
+
+        class Resp:
+            def __init__(self, value):
+                self.headers = {"Retry-After": value}
+
+        self.assertEqual(fetcher._retry_delay(0, Resp("2")), 2.0)
+        self.assertEqual(fetcher._retry_delay(0, Resp("3600")), 5.0)
+        self.assertEqual(fetcher._retry_delay(0, Resp(formatdate(time.time() - 60, usegmt=True))), 0.0)
+        self.assertLessEqual(fetcher._retry_delay(0, Resp(formatdate(time.time() + 3600, usegmt=True))), 5.0)
+        # 지수 백오프도 max_backoff를 넘지 않는다
+        self.assertEqual(fetcher._retry_delay(10, None), 5.0)
+        self.assertGreaterEqual(fetcher._retry_delay(0, None), 1.0)
+
+    def test_min_interval_per_host(self):
+        url = self.route("/paced", lambda h, n: (200, {}, html("ok")))
+        fetcher = self.make_fetcher(min_interval=0.1)
+        for _ in range(3):
+            fetcher.fetch(url)
+        times = [ts for _, ts in self.requests_to("/paced")]
+        self.assertGreaterEqual(times[-1] - times[0], 0.18)
+
+    def test_fetch_many_keeps_order(self):
+        urls = [self.route(f"/page{i}", lambda h, n, i=i: (200, {}, html(f"페이지 {i}"))) for i in range(6)]
+        results = self.make_fetcher(max_workers=3).fetch_many(urls)
+        self.assertEqual([r.text for r in results], [f"페이지 {i}" for i in range(6)])
+
+    def test_get_fetcher_shared_across_threads(self):
+        old = kimpga._default_fetcher
+        kimpga._default_fetcher = None
+        try:
+            found = []
+            threads = [threading.Thread(target=lambda: found.append(kimpga.get_fetcher())) for _ in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len({id(f) for f in found}), 1)
+            found[0].close()
+        finally:
+            kimpga._default_fetcher = old
+
+
+if __name__ == "__main__":
+    unittest.main()
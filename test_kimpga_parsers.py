@@ -0,0 +1,103 @@
+"""
+kimpga_top20 파서 백엔드(lxml/selectolax/html.parser) 비교 테스트
+
+같은 HTML을 설치된 백엔드마다 파싱해 결과가 같은지 확인합니다.
+(설치되지 않은 백엔드는 건너뜁니다)
+
+실행:
+    python -m unittest test_kimpga_parsers -v
+"""
+
+import contextlib
+import glob
+import io
+import os
+import unittest
+
+import kimpga_top20 as kimpga
+
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "kimpga_fixtures", "*.html")))
+
+NO_TBODY = """
+<table>
+  <tr><th>순위</th><th>코인</th><th>가격</th><th>변동</th></tr>
+  <tr><td>1</td><td>비트코인</td><td>100</td><td>+1%</td></tr>
+  <tr><td>2</td><td>이더리움</td><td>50</td><td>-2%</td></tr>
+</table>
+"""
+
+WITH_TBODY = """
+<table>
+  <thead><tr><th>순위</th><th>코인</th><th>가격</th><th>변동</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td>비트코인</td><td>100</td><td>+1%</td></tr>
+    <tr><td>2</td><td>이더리움</td><td>50</td><td>-2%</td></tr>
+  </tbody>
+</table>
+"""
+
+# tbody가 없는 바깥 테이블 안에 tbody가 있는 테이블
+NESTED = """
+<table><tr><th>코인</th></tr><tr><td>
+  <table><thead><tr><th>코인</th><th>가격</th></tr></thead>
+    <tbody><tr><td>1</td><td>리플</td><td>3</td></tr></tbody></table>
+</td></tr></table>
+"""
+
+
+def available_backends():
+    return [b for b in kimpga.PARSER_BACKENDS if kimpga.backend_available(b)]
+
+
+class ParserBackendTest(unittest.TestCase):
+
+    def parse_all(self, fn, html):
+        results = {}
+        for backend in available_backends():
+            # 파서가 못 찾으면 안내 메시지를 출력하므로 숨긴다
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[backend] = fn(html, backend)
+        return results
+
+    def assertSameAcrossBackends(self, results):
+        backends = list(results)
+        for backend in backends[1:]:
+            with self.subTest(backend=backend):
+                self.assertEqual(results[backend], results[backends[0]],
+                                 f"{backend} 결과가 {backends[0]}와 다릅니다")
+
+    def test_table_without_tbody(self):
+        # 원본에 tbody가 없으면 어느 백엔드든 본문 행이 없다 (머리글 행을 데이터로 내보내지 않음)
+        results = self.parse_all(lambda html, b: kimpga.try_parse_table(kimpga.extract_tables(html, b), 20),
+                                 NO_TBODY)
+        self.assertSameAcrossBackends(results)
+        for backend, items in results.items():
+            with self.subTest(backend=backend):
+                self.assertEqual(items, [])
+
+    def test_table_with_tbody(self):
+        results = self.parse_all(lambda html, b: kimpga.try_parse_table(kimpga.extract_tables(html, b), 20),
+                                 WITH_TBODY)
+        self.assertSameAcrossBackends(results)
+        for backend, items in results.items():
+            with self.subTest(backend=backend):
+                self.assertEqual([it["name"] for it in items], ["비트코인", "이더리움"])
+
+    def test_nested_tables(self):
+        results = self.parse_all(lambda html, b: [[r.in_body for r in t.rows] for t in kimpga.extract_tables(html, b)],
+                                 NESTED)
+        self.assertSameAcrossBackends(results)
+
+    def test_fixtures_same_across_backends(self):
+        for path in FIXTURES:
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            with self.subTest(fixture=os.path.basename(path)):
+                results = self.parse_all(lambda h, b: kimpga.parse_top_coins(h, 20, b), html)
+                self.assertSameAcrossBackends(results)
+                self.assertTrue(next(iter(results.values())))
+
+
+if __name__ == "__main__":
+    unittest.main()